@@ -0,0 +1,66 @@
+"""
+Compara os formatos de save do Repositorio (JSON e binário): tamanho do
+arquivo, tempo de codificação/decodificação e tempo de salvar e carregar
+pelo Repositorio (incluindo a gravação atômica em disco).
+
+Uso:
+    python benchmarks/bench_save.py [repeticoes]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.classes import Mago
+from utils.repositorio import Repositorio
+
+
+def personagem_exemplo():
+    """Personagem de nível médio com inventário variado."""
+    personagem = Mago("Gandalf, o Cinzento")
+    personagem.ganhar_xp(5000)
+    for item in ("poção", "poção", "poção de mana", "elixir", "cristal"):
+        personagem.adicionar_item(item)
+    return personagem
+
+
+def melhor_tempo(funcao, numero, repeticoes=5):
+    """Melhor tempo por chamada, em microssegundos."""
+    return min(timeit.repeat(funcao, number=numero, repeat=repeticoes)) / numero * 1e6
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    personagem = personagem_exemplo()
+    dados = personagem.to_dict()
+
+    print(f"{'Formato':<8} {'Bytes':>6} {'Codificar':>11} {'Decodificar':>12} {'Salvar':>10} {'Carregar':>10}")
+    with tempfile.TemporaryDirectory(prefix="bench-save-") as diretorio:
+        for formato in Repositorio.FORMATOS:
+            repositorio = Repositorio(os.path.join(diretorio, f"save.{formato}"), formato=formato)
+            conteudo = repositorio.codificar(dados)
+
+            codificar = melhor_tempo(lambda: repositorio.codificar(dados), repeticoes)
+            decodificar = melhor_tempo(lambda: repositorio.decodificar(conteudo), repeticoes)
+
+            def salvar():
+                # Sem alterações o salvamento seria dispensado: alterna o HP
+                if personagem.hp == personagem.hp_maximo:
+                    personagem.receber_dano(1)
+                else:
+                    personagem.curar(1)
+                repositorio.salvar(personagem)
+
+            # Salvar inclui o fsync da gravação atômica: bem menos repetições
+            salvo = melhor_tempo(salvar, max(1, repeticoes // 20))
+            carregado = melhor_tempo(repositorio.carregar, repeticoes // 4)
+
+            print(f"{formato:<8} {len(conteudo):>6} {codificar:>9.2f}µs {decodificar:>10.2f}µs "
+                  f"{salvo:>8.1f}µs {carregado:>8.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
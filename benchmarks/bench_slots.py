@@ -0,0 +1,95 @@
+"""
+Compara a memória por instância e o custo de acesso a atributos das classes
+com __slots__ (Atributos, Personagem, Inimigo, Item), criadas pelos seus
+construtores, contra objetos equivalentes que guardam os mesmos atributos em um __dict__.
+
+Uso:
+    python benchmarks/bench_slots.py [quantidade]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.classes import Guerreiro
+from models.inimigo import Chefao, Goblin
+from models.inventario import Item
+
+
+class ComDict:
+    """Objeto comum (com __dict__), usado como referência de comparação."""
+
+
+def copia_com_dict(obj, classe=ComDict):
+    """Cria um objeto com __dict__ contendo os mesmos atributos de `obj`."""
+    copia = classe()
+    for cls in type(obj).__mro__:
+        for nome in getattr(cls, "__slots__", ()):
+            if hasattr(obj, nome):
+                setattr(copia, nome, getattr(obj, nome))
+    return copia
+
+
+def memoria_por_instancia(fabrica, quantidade):
+    """Mede, com tracemalloc, os bytes alocados por instância criada."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [fabrica() for _ in range(quantidade)]
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (depois - antes) / quantidade
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    # Instâncias criadas pelos construtores reais: a medida inclui tudo o
+    # que eles alocam (inventário, conjuntos auxiliares etc.)
+    fabricas = {
+        "Guerreiro": lambda: Guerreiro("Conan"),
+        "Goblin": Goblin,
+        "Chefao": Chefao,
+        "Item": lambda: Item("poção", ""),
+    }
+
+    print(f"Memória por instância ({quantidade} instâncias):")
+    print(f"{'Classe':<10} {'__slots__':>10} {'__dict__':>10} {'Economia':>9}")
+    for nome, fabrica in fabricas.items():
+        # Uma classe por modelo, para que o CPython compartilhe as chaves dos
+        # dicionários entre instâncias exatamente como faria com a classe original
+        classe_dict = type(f"{nome}ComDict", (ComDict,), {})
+
+        # A cópia com __dict__ mantém os valores criados pelo construtor real;
+        # a instância original é descartada e não entra na medida
+        def com_dict(fabrica=fabrica, classe_dict=classe_dict):
+            return copia_com_dict(fabrica(), classe_dict)
+
+        slots = memoria_por_instancia(fabrica, quantidade)
+        dicionario = memoria_por_instancia(com_dict, quantidade)
+        print(f"{nome:<10} {slots:>9.0f}B {dicionario:>9.0f}B {1 - slots / dicionario:>9.0%}")
+
+    print(f"\nConstrução ({quantidade} instâncias, µs por instância):")
+    for nome, fabrica in fabricas.items():
+        tempo = min(timeit.repeat(fabrica, number=quantidade // 10, repeat=5))
+        print(f"{nome:<10} {tempo / (quantidade // 10) * 1e6:8.2f}")
+
+    goblin = Goblin()
+    casos = (
+        ("Goblin __slots__", goblin, "dano"),
+        ("Goblin __dict__", copia_com_dict(goblin, type("GoblinComDict", (ComDict,), {})), "dano"),
+        ("Guerreiro __slots__", Guerreiro("Conan"), "dano_base"),
+    )
+    repeticoes = 1_000_000
+    print(f"\nAcesso a atributos ({repeticoes} leituras/escritas, ns por operação):")
+    for rotulo, obj, campo in casos:
+        leitura = timeit.timeit(f"obj.{campo}", globals={"obj": obj}, number=repeticoes)
+        escrita = timeit.timeit(f"obj.{campo} = 7", globals={"obj": obj}, number=repeticoes)
+        print(f"{rotulo:<20} leitura {leitura / repeticoes * 1e9:6.1f}   escrita {escrita / repeticoes * 1e9:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Gerador de carga para o servidor do jogo (servidor.py): abre milhares de
+conexões simultâneas, cada uma com um cliente roteirizado que cria um
+personagem, encara missões automáticas, salva e sai.
+
+Sem --porta, o servidor é iniciado no mesmo processo (com saves e log em um
+diretório temporário) e o relatório dele também é exibido.
+
+Uso:
+    python benchmarks/carga_servidor.py [--clientes 2000] [--missoes 5]
+    python benchmarks/carga_servidor.py --host 127.0.0.1 --porta 8765
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from servidor import ServidorJogo, exibir_relatorio, percentil
+
+# Um prompt é o texto enviado pelo servidor que termina em ": " ou "> "
+FINS_DE_PROMPT = (b": ", b"> ")
+
+
+def roteiro(indice, missoes):
+    """
+    Linhas enviadas por um cliente: identificar-se, criar personagem,
+    `missoes` missões automáticas, salvar e sair.
+    """
+    classe = str(indice % 3 + 1)
+    return [f"Jogador{indice}", "1", f"Jogador{indice}", classe] + ["6"] * missoes + ["4", "0"]
+
+
+async def _esperar_prompt(reader):
+    """Lê a saída do servidor até o próximo prompt."""
+    cauda = b""
+    while True:
+        dados = await reader.read(65536)
+        if not dados:
+            raise ConnectionError("servidor encerrou a conexão antes do prompt")
+        cauda = (cauda + dados)[-2:]
+        if cauda in FINS_DE_PROMPT:
+            return
+
+
+async def cliente(host, porta, linhas, latencias):
+    """
+    Executa um cliente roteirizado, registrando o tempo entre enviar cada
+    linha e receber o prompt seguinte.
+    """
+    reader, writer = await asyncio.open_connection(host, porta)
+    try:
+        await _esperar_prompt(reader)
+        for i, linha in enumerate(linhas):
+            enviado_em = time.perf_counter()
+            writer.write(f"{linha}\n".encode("utf-8"))
+            if i < len(linhas) - 1:
+                await _esperar_prompt(reader)
+                latencias.append(time.perf_counter() - enviado_em)
+        # Depois de "0" o servidor se despede e fecha a conexão
+        while await reader.read(65536):
+            pass
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def gerar_carga(host, porta, clientes, missoes):
+    """
+    Dispara todos os clientes ao mesmo tempo.
+
+    Returns:
+        tuple: (tempo total em segundos, latências em segundos, falhas)
+    """
+    latencias = []
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(cliente(host, porta, roteiro(i, missoes), latencias) for i in range(clientes)),
+        return_exceptions=True
+    )
+    falhas = sum(1 for r in resultados if isinstance(r, BaseException))
+    return time.perf_counter() - inicio, latencias, falhas
+
+
+async def executar(args):
+    servidor = None
+    if args.porta is None:
+        diretorio = tempfile.mkdtemp(prefix="carga-")
+        servidor = ServidorJogo(args.host, 0, os.path.join(diretorio, "saves"), os.path.join(diretorio, "servidor.log"))
+        args.porta = await servidor.iniciar()
+
+    tempo, latencias, falhas = await gerar_carga(args.host, args.porta, args.clientes, args.missoes)
+
+    latencias.sort()
+    print(f"{args.clientes} clientes simultâneos, {args.missoes} missões cada: {tempo:.2f}s "
+          f"({(args.clientes - falhas) / tempo:.1f} sessões/s, {falhas} falhas)")
+    print("Latência vista pelo cliente: " + ", ".join(
+        f"p{p} {percentil(latencias, p) * 1000:.2f}ms" for p in (50, 90, 99)))
+
+    if servidor:
+        relatorio = servidor.relatorio()
+        await servidor.encerrar()
+        print("\nServidor:")
+        exibir_relatorio(relatorio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor do RPG OO.")
+    parser.add_argument("--clientes", type=int, default=2000)
+    parser.add_argument("--missoes", type=int, default=5, help="missões automáticas por cliente")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=None, help="servidor externo (padrão: iniciar um local)")
+    args = parser.parse_args()
+
+    try:
+        # Cada cliente usa um descritor de arquivo (dois com o servidor local)
+        import resource
+        _, limite = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limite, limite))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
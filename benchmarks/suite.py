@@ -0,0 +1,493 @@
+"""
+Suíte de benchmarks dos caminhos críticos do jogo, com linha de base e
+limite de regressão.
+
+Cada caso mede o tempo por operação (em microssegundos) de um caminho:
+críticos, ataques e habilidades de cada classe, um combate headless
+completo, ganho de XP, salvar/carregar no Repositorio e o registro no
+Logger. O melhor tempo entre as repetições é comparado com o da linha de
+base (benchmarks/baseline.json); um caso mais lento que a base além do
+limite (30% por padrão) é uma regressão e faz a execução falhar.
+
+Para que a comparação não dependa da carga da máquina no momento, os
+tempos são divididos pela variação de um caso de referência (um laço fixo
+de Python puro, que não usa o código do jogo).
+
+Uso:
+    python benchmarks/suite.py                  # mede e compara com a linha de base
+    python benchmarks/suite.py --salvar         # mede e grava uma nova linha de base
+    python benchmarks/suite.py -k missao --limite 0.10
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.classes import Guerreiro, Mago, Arqueiro
+from models.combate import politica_atacar
+from models.missão import Missao
+from utils import calcular_critico, is_critico
+from utils.analise_log import AnaliseLog
+from utils.eventos import ATAQUE, INIMIGO, TAMANHO_REGISTRO, RegistroEventos, analisar_eventos
+from utils.logger import Logger, LoggerBufferizado
+from utils.metricas import MetricasCombate
+from utils.repositorio import Repositorio
+from utils.repositorio_journal import RepositorioJournal
+from utils.roster import escrever_roster, ler_roster
+
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+VERSAO_BASELINE = 1
+# Aumento relativo tolerado por padrão (0.30 = 30% mais lento que a base)
+LIMITE_PADRAO = 0.30
+# Caso de referência usado para descontar a variação de velocidade da máquina
+REFERENCIA = "referencia.interpretador"
+
+# Casos registrados: nome -> fábrica(contexto) que devolve (função, operações
+# por chamada). O contexto (ExitStack) recebe arquivos temporários e loggers
+# a fechar ao fim do caso.
+CASOS = {}
+
+
+def caso(nome):
+    """Decorador que registra a fábrica de um caso da suíte."""
+    def registrar(fabrica):
+        CASOS[nome] = fabrica
+        return fabrica
+    return registrar
+
+
+def _diretorio_temporario(contexto):
+    return contexto.enter_context(tempfile.TemporaryDirectory(prefix="bench-"))
+
+
+@caso(REFERENCIA)
+def _caso_referencia(contexto):
+    # Trabalho fixo, que não depende do código do jogo: mede a velocidade da
+    # máquina/interpretador no momento da execução (ver fator_maquina)
+    def referencia():
+        contagem = {}
+        for i in range(200):
+            chave = i & 15
+            contagem[chave] = contagem.get(chave, 0) + i * 3 // 7
+        return sorted(contagem.items())
+
+    return referencia, 1
+
+
+@caso("critico.is_critico")
+def _caso_is_critico(contexto):
+    rng = random.Random(1)
+    return (lambda: is_critico(0.2, rng)), 1
+
+
+@caso("critico.calcular_critico")
+def _caso_calcular_critico(contexto):
+    rng = random.Random(1)
+    return (lambda: calcular_critico(20, chance=0.2, multiplicador=1.8, rng=rng,
+                                     animacao=False, verbose=False)), 1
+
+
+def _registrar_casos_de_classe(classe):
+    # Cada caso usa o seu próprio gerador: o módulo random global fica intacto
+    @caso(f"{classe.__name__}.atacar")
+    def _atacar(contexto):
+        personagem = classe("Bench")
+        personagem.rng = random.Random(1)
+        return personagem.atacar, 1
+
+    @caso(f"{classe.__name__}.habilidade_especial")
+    def _habilidade(contexto):
+        personagem = classe("Bench")
+        personagem.rng = random.Random(1)
+        # Mana suficiente para nunca cair no caminho "sem mana"
+        personagem.mana = 10 ** 12
+        return personagem.habilidade_especial, 1
+
+
+for _classe in (Guerreiro, Mago, Arqueiro):
+    _registrar_casos_de_classe(_classe)
+
+
+def _combates(metricas=None):
+    # Sementes e classes em ciclo: a mesma sequência de lutas a cada execução
+    combinacoes = itertools.cycle([
+        (semente, classe, dificuldade)
+        for semente in range(64)
+        for classe in (Guerreiro, Mago, Arqueiro)
+        for dificuldade in Missao.TIPOS_INIMIGOS
+    ])
+
+    def lutar():
+        semente, classe, dificuldade = next(combinacoes)
+        Missao("Bench", dificuldade, semente=semente).resolver(classe("Bench"), politica_atacar, metricas=metricas)
+
+    return lutar, 1
+
+
+@caso("missao.combate_headless")
+def _caso_combate(contexto):
+    return _combates()
+
+
+@caso("missao.combate_headless_metricas")
+def _caso_combate_metricas(contexto):
+    return _combates(MetricasCombate())
+
+
+@caso("personagem.ganhar_xp")
+def _caso_ganhar_xp(contexto):
+    personagem = Guerreiro("Bench")
+
+    def ganhar_xp():
+        # Volta ao nível 1 e sobe cerca de 10 níveis de uma vez
+        personagem.nivel = 1
+        personagem.xp = 0
+        personagem.xp_proximo_nivel = 100
+        personagem.ganhar_xp(15000)
+
+    return ganhar_xp, 1
+
+
+@caso("repositorio.salvar")
+def _caso_salvar(contexto):
+    repositorio = Repositorio(os.path.join(_diretorio_temporario(contexto), "save.json"))
+    personagem = Guerreiro("Bench")
+    for item in ("poção", "poção", "poção de mana", "elixir"):
+        personagem.adicionar_item(item)
+
+    def salvar():
+        # Sem alterações o salvamento seria dispensado: alterna o HP
+        if personagem.hp == personagem.hp_maximo:
+            personagem.receber_dano(1)
+        else:
+            personagem.curar(1)
+        repositorio.salvar(personagem)
+
+    return salvar, 1
+
+
+@caso("repositorio.carregar")
+def _caso_carregar(contexto):
+    repositorio = Repositorio(os.path.join(_diretorio_temporario(contexto), "save.json"))
+    personagem = Guerreiro("Bench")
+    for item in ("poção", "poção", "poção de mana", "elixir"):
+        personagem.adicionar_item(item)
+    repositorio.salvar(personagem)
+    return repositorio.carregar, 1
+
+
+@caso("repositorio_journal.salvar")
+def _caso_salvar_journal(contexto):
+    # "flush": mede o caminho do código, sem a variação do fsync do disco
+    repositorio = RepositorioJournal(os.path.join(_diretorio_temporario(contexto), "save.journal"),
+                                     durabilidade="flush")
+    contexto.callback(repositorio.fechar)
+    personagem = Guerreiro("Bench")
+    for item in ("poção", "poção", "poção de mana", "elixir"):
+        personagem.adicionar_item(item)
+    repositorio.salvar(personagem)
+
+    def salvar():
+        # Um turno: muda o HP e acrescenta o delta (com compactações periódicas)
+        personagem.hp = personagem.hp - 1 if personagem.hp > 1 else personagem.hp_maximo
+        repositorio.salvar(personagem)
+
+    return salvar, 1
+
+
+@caso("roster.escrever")
+def _caso_roster_escrever(contexto):
+    caminho = os.path.join(_diretorio_temporario(contexto), "roster.jsonl")
+    personagens = [cls(f"{cls.__name__} {i}") for i in range(100) for cls in (Guerreiro, Mago, Arqueiro)]
+    return (lambda: escrever_roster(caminho, personagens)), len(personagens)
+
+
+@caso("roster.ler")
+def _caso_roster_ler(contexto):
+    caminho = os.path.join(_diretorio_temporario(contexto), "roster.jsonl")
+    total = escrever_roster(caminho, (cls(f"{cls.__name__} {i}") for i in range(100)
+                                      for cls in (Guerreiro, Mago, Arqueiro)))
+    return (lambda: sum(1 for _ in ler_roster(caminho))), total
+
+
+@caso("analise_log.alimentar")
+def _caso_analise_log(contexto):
+    # Log de 60 missões reais, analisado de uma vez; tempo por linha
+    caminho = os.path.join(_diretorio_temporario(contexto), "jogo.log")
+    logger = Logger(caminho)
+    dificuldades = list(Missao.TIPOS_INIMIGOS)
+    for semente in range(60):
+        Missao("Bench", dificuldades[semente % len(dificuldades)],
+               semente=semente).resolver(Guerreiro("Bench"), politica_atacar, logger=logger)
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    return (lambda: AnaliseLog().alimentar(conteudo)), conteudo.count(b"\n")
+
+
+@caso("logger.registrar")
+def _caso_logger(contexto):
+    logger = Logger(os.path.join(_diretorio_temporario(contexto), "jogo.log"))
+    return (lambda: logger.registrar("Turno 3: Goblin causou 7 de dano")), 1
+
+
+@caso("logger_bufferizado.registrar")
+def _caso_logger_bufferizado(contexto):
+    lote = 1000
+    logger = LoggerBufferizado(os.path.join(_diretorio_temporario(contexto), "jogo.log"), tamanho_lote=lote)
+    contexto.callback(logger.fechar)
+
+    def registrar_lote():
+        # Inclui a gravação: mede a vazão até o disco, não só o enfileiramento
+        for _ in range(lote):
+            logger.registrar("Turno 3: Goblin causou 7 de dano")
+        logger.descarregar()
+
+    return registrar_lote, lote
+
+
+@caso("eventos.evento")
+def _caso_eventos(contexto):
+    lote = 1000
+    registro = RegistroEventos(os.path.join(_diretorio_temporario(contexto), "eventos.bin"))
+    contexto.callback(registro.fechar)
+
+    def registrar_lote():
+        # Mesmo evento e mesma vazão até o arquivo que logger_bufferizado.registrar
+        for turno in range(lote):
+            registro.evento(ATAQUE, turno, "Goblin", 7, "", INIMIGO)
+        registro.descarregar()
+
+    return registrar_lote, lote
+
+
+@caso("eventos.analisar")
+def _caso_analisar_eventos(contexto):
+    # Eventos de 60 missões reais; tempo por registro
+    caminho = os.path.join(_diretorio_temporario(contexto), "eventos.bin")
+    registro = RegistroEventos(caminho)
+    dificuldades = list(Missao.TIPOS_INIMIGOS)
+    for semente in range(60):
+        Missao("Bench", dificuldades[semente % len(dificuldades)],
+               semente=semente).resolver(Guerreiro("Bench"), politica_atacar, logger=registro)
+    registro.fechar()
+    return (lambda: analisar_eventos(caminho)), os.path.getsize(caminho) // TAMANHO_REGISTRO
+
+
+def calibrar(funcao, tempo=0.1):
+    """
+    Calcula quantas chamadas de `funcao` levam cerca de `tempo` segundos.
+
+    Returns:
+        int: Número de chamadas por repetição
+    """
+    cronometro = timeit.Timer(funcao)
+    chamadas = 1
+    while True:
+        gasto = cronometro.timeit(chamadas)
+        if gasto >= tempo:
+            return chamadas
+        chamadas = max(chamadas * 2, int(chamadas * tempo / gasto * 1.1) if gasto > 0 else chamadas * 10)
+
+
+def executar(filtro=None, repeticoes=5, tempo=0.1, processos=1):
+    """
+    Executa os casos da suíte.
+
+    As repetições são intercaladas: cada rodada executa uma repetição de
+    todos os casos, de modo que uma oscilação passageira da máquina afeta
+    uma rodada de todos os casos, e não todas as repetições de um só. Com
+    `processos` > 1, a suíte é executada essa quantidade de vezes, cada uma
+    em um processo novo (em sequência): o mesmo código pode ficar
+    consistentemente mais lento em um processo do que em outro, conforme a
+    disposição dos objetos na memória. O resultado de cada caso é o melhor
+    tempo entre todas as rodadas.
+
+    O caso de referência sempre é executado, mesmo fora do filtro.
+
+    Args:
+        filtro (str, optional): Executa só os casos cujo nome contém o texto
+        repeticoes (int): Número de rodadas por processo
+        tempo (float): Duração aproximada de cada repetição, em segundos
+        processos (int): Número de processos novos em que a suíte é executada
+
+    Returns:
+        dict: {nome do caso: {"us_por_op", "mediana_us", "chamadas"}}, com
+        os tempos em microssegundos por operação
+    """
+    if processos > 1:
+        contexto_mp = multiprocessing.get_context("spawn")
+        execucoes = []
+        for _ in range(processos):
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto_mp) as executor:
+                execucoes.append(executor.submit(executar, filtro, repeticoes, tempo).result())
+        return {
+            nome: {
+                "us_por_op": min(e[nome]["us_por_op"] for e in execucoes),
+                "mediana_us": statistics.median(e[nome]["mediana_us"] for e in execucoes),
+                "chamadas": execucoes[0][nome]["chamadas"]
+            }
+            for nome in execucoes[0]
+        }
+
+    with ExitStack() as contexto:
+        medidos = []
+        for nome, fabrica in CASOS.items():
+            if filtro and filtro not in nome and nome != REFERENCIA:
+                continue
+            funcao, operacoes = fabrica(contexto)
+            medidos.append((nome, timeit.Timer(funcao), calibrar(funcao, tempo), operacoes, []))
+
+        for _ in range(repeticoes):
+            for nome, cronometro, chamadas, operacoes, tempos in medidos:
+                tempos.append(cronometro.timeit(chamadas) / (chamadas * operacoes) * 1e6)
+
+    return {
+        nome: {"us_por_op": min(tempos), "mediana_us": statistics.median(tempos), "chamadas": chamadas}
+        for nome, _, chamadas, _, tempos in medidos
+    }
+
+
+def fator_maquina(resultados, baseline):
+    """
+    Quanto a máquina está mais lenta (> 1) ou mais rápida (< 1) que quando a
+    linha de base foi gravada, pelo tempo do caso de referência.
+
+    Returns:
+        float: Razão entre o tempo atual e o da base (1.0 se não houver referência)
+    """
+    atual = resultados.get(REFERENCIA, {}).get("us_por_op")
+    base = baseline.get(REFERENCIA, {}).get("us_por_op")
+    if not atual or not base:
+        return 1.0
+    return atual / base
+
+
+def comparar(resultados, baseline, limite=LIMITE_PADRAO, fator=1.0):
+    """
+    Compara os resultados com a linha de base.
+
+    Args:
+        resultados (dict): Resultados de executar()
+        baseline (dict): Resultados da linha de base (mesmo formato)
+        limite (float): Aumento relativo tolerado (0.30 = 30% mais lento)
+        fator (float): Fator de velocidade da máquina (ver fator_maquina);
+            os tempos atuais são divididos por ele antes da comparação
+
+    Returns:
+        list: (nome, base, atual, variação relativa, regrediu) por caso;
+        a base e a variação são None para casos que não estão na linha de base
+    """
+    comparacao = []
+    for nome, resultado in resultados.items():
+        atual = resultado["us_por_op"]
+        base = baseline.get(nome, {}).get("us_por_op")
+        if base is None:
+            comparacao.append((nome, None, atual, None, False))
+            continue
+        variacao = atual / fator / base - 1
+        comparacao.append((nome, base, atual, variacao, nome != REFERENCIA and variacao > limite))
+    return comparacao
+
+
+def carregar_baseline(caminho):
+    """Lê os resultados de uma linha de base (vazio se o arquivo não existir)."""
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    if dados.get("versao") != VERSAO_BASELINE:
+        raise ValueError(f"linha de base com versão incompatível: {dados.get('versao')}")
+    return dados["resultados"]
+
+
+def salvar_baseline(caminho, resultados):
+    """Grava os resultados como linha de base, com a identificação do ambiente."""
+    dados = {
+        "versao": VERSAO_BASELINE,
+        "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def exibir_comparacao(comparacao, limite):
+    """Exibe a tabela de resultados e a variação (normalizada) em relação à base."""
+    print(f"{'Caso':<34} {'Base (µs)':>11} {'Atual (µs)':>11} {'Variação':>9}")
+    for nome, base, atual, variacao, regrediu in comparacao:
+        if base is None:
+            print(f"{nome:<34} {'-':>11} {atual:>11.3f} {'novo':>9}")
+            continue
+        marca = f"  REGRESSÃO (> {limite:.0%})" if regrediu else ""
+        print(f"{nome:<34} {base:>11.3f} {atual:>11.3f} {variacao:>+9.1%}{marca}")
+
+
+def main(argv=None):
+    """
+    Ponto de entrada da linha de comando.
+
+    Returns:
+        int: 0 se nenhum caso regrediu, 1 caso contrário
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do RPG OO.")
+    parser.add_argument("-k", dest="filtro", default=None, help="executa só os casos cujo nome contém o texto")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO, help="arquivo JSON da linha de base")
+    parser.add_argument("--salvar", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help=f"aumento relativo tolerado (padrão: {LIMITE_PADRAO:.2f})")
+    parser.add_argument("--sem-normalizar", action="store_true",
+                        help="compara os tempos brutos, sem descontar a velocidade da máquina")
+    parser.add_argument("--repeticoes", type=int, default=5, help="rodadas de medição por processo (padrão: 5)")
+    parser.add_argument("--tempo", type=float, default=0.1, help="segundos por repetição de cada caso")
+    parser.add_argument("--processos", type=int, default=3,
+                        help="processos novos, em sequência, em que a suíte é executada (padrão: 3)")
+    args = parser.parse_args(argv)
+
+    filtro = args.filtro
+    resultados = executar(filtro, args.repeticoes, args.tempo, args.processos)
+    baseline = carregar_baseline(args.baseline)
+    fator = 1.0 if args.sem_normalizar else fator_maquina(resultados, baseline)
+    comparacao = comparar(resultados, baseline, args.limite, fator)
+    exibir_comparacao(comparacao, args.limite)
+    if fator != 1.0:
+        print(f"\nVariações descontando a velocidade da máquina: referência {fator:.2f}x o tempo da base")
+
+    if args.salvar:
+        if filtro and baseline:
+            # Casos não executados (por causa do filtro) mantêm o valor
+            # anterior; os novos são convertidos para a velocidade da máquina
+            # da base, que mantém a sua referência
+            resultados = {
+                nome: {**r, "us_por_op": r["us_por_op"] / fator, "mediana_us": r["mediana_us"] / fator}
+                for nome, r in resultados.items() if nome != REFERENCIA or nome not in baseline
+            }
+            resultados = {**baseline, **resultados}
+        salvar_baseline(args.baseline, resultados)
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return 0
+
+    regressoes = [nome for nome, *_, regrediu in comparacao if regrediu]
+    if regressoes:
+        print(f"\n{len(regressoes)} caso(s) regrediram: {', '.join(regressoes)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
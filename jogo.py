@@ -3,15 +3,23 @@ Módulo principal que orquestra o fluxo do jogo.
 Gerencia o menu, combate, salvamento e carregamento.
 """
 
+import asyncio
 import random
 from models.personagem import Personagem
 from models.classes import Guerreiro, Mago, Arqueiro
 from models.missão import Missao
 from utils.repositorio import Repositorio
-from utils.logger import Logger
+from utils.logger import LoggerBufferizado
 from models.inventario import Item, Inventario
 
 
+async def ler_console(prompt=""):
+    """
+    Lê uma linha do console sem bloquear o loop de eventos
+    (o input() roda em uma thread auxiliar).
+    """
+    return await asyncio.to_thread(input, prompt)
+
 
 class Jogo:
     """
@@ -30,44 +38,87 @@ class Jogo:
         "Montanha Gélida"
     ]
     
-    def __init__(self):
-        """Inicializa o jogo."""
+    def __init__(self, saida=print, escrever=None, repositorio=None, logger=None, replays=None, metricas=None):
+        """
+        Inicializa o jogo.
+        
+        Args:
+            saida (callable): Função que exibe uma linha de texto (padrão: print)
+            escrever (callable, optional): Função que escreve texto sem quebra de
+                linha, usada pela animação de crítico (padrão: stdout)
+            repositorio (optional): Repositório de saves (padrão: Repositorio())
+            logger (optional): Logger ou canal de log (padrão: LoggerBufferizado())
+            replays (ArquivoReplay, optional): Se informado, cada missão é
+                gravada como replay (ver utils.replay)
+            metricas (MetricasCombate, optional): Se informado, os combates
+                alimentam as métricas (ver utils.metricas)
+        """
         self.personagem = None
-        self.repositorio = Repositorio()
-        self.logger = Logger()
+        self.saida = saida
+        self.escrever = escrever
+        self.repositorio = repositorio if repositorio is not None else Repositorio()
+        self.logger = logger if logger is not None else LoggerBufferizado()
+        self.replays = replays
+        self.metricas = metricas
         self.logger.registrar("Jogo iniciado")
     
     def exibir_menu(self):
         """Exibe o menu principal do jogo."""
-        print("\n" + "=" * 30)
-        print("=== RPG OO ===")
-        print("=" * 30)
-        print("[1] Criar personagem")
-        print("[2] Encarar missão")
-        print("[3] Ver status")
-        print("[4] Salvar")
-        print("[5] Carregar")
-        print("[0] Sair")
-        print("=" * 30)
+        self.saida("\n" + "=" * 30)
+        self.saida("=== RPG OO ===")
+        self.saida("=" * 30)
+        self.saida("[1] Criar personagem")
+        self.saida("[2] Encarar missão")
+        self.saida("[3] Ver status")
+        self.saida("[4] Salvar")
+        self.saida("[5] Carregar")
+        self.saida("[6] Missão automática (sempre atacar)")
+        self.saida("[0] Sair")
+        self.saida("=" * 30)
     
     def criar_personagem(self):
         """
         Cria um novo personagem com nome e classe escolhidos pelo jogador.
         """
-        print("\n=== Criar Personagem ===")
+        self.saida("\n=== Criar Personagem ===")
         nome = input("Nome do personagem: ").strip()
         
         if not nome:
-            print("Nome inválido!")
+            self.saida("Nome inválido!")
             return
         
-        print("\nEscolha a classe:")
-        print("[1] Guerreiro (Alto HP, Alta Defesa, Baixa Mana)")
-        print("[2] Mago (Baixo HP, Baixa Defesa, Alta Mana)")
-        print("[3] Arqueiro (HP Médio, Equilibrado)")
-        
+        self._exibir_classes()
         escolha = input("> ").strip()
+        self._criar_personagem(nome, escolha)
+    
+    async def criar_personagem_async(self, ler=ler_console):
+        """Versão assíncrona de criar_personagem (entrada lida com `ler`)."""
+        self.saida("\n=== Criar Personagem ===")
+        nome = (await ler("Nome do personagem: ")).strip()
+        
+        if not nome:
+            self.saida("Nome inválido!")
+            return
         
+        self._exibir_classes()
+        escolha = (await ler("> ")).strip()
+        self._criar_personagem(nome, escolha)
+    
+    def _exibir_classes(self):
+        """Exibe as classes disponíveis."""
+        self.saida("\nEscolha a classe:")
+        self.saida("[1] Guerreiro (Alto HP, Alta Defesa, Baixa Mana)")
+        self.saida("[2] Mago (Baixo HP, Baixa Defesa, Alta Mana)")
+        self.saida("[3] Arqueiro (HP Médio, Equilibrado)")
+    
+    def _criar_personagem(self, nome, escolha):
+        """
+        Cria o personagem a partir do nome e da opção de classe escolhida.
+        
+        Args:
+            nome (str): Nome do personagem
+            escolha (str): Opção de classe digitada ("1", "2" ou "3")
+        """
         if escolha == "1":
             self.personagem = Guerreiro(nome)
         elif escolha == "2":
@@ -75,28 +126,80 @@ class Jogo:
         elif escolha == "3":
             self.personagem = Arqueiro(nome)
         else:
-            print("Opção inválida! Criando Guerreiro por padrão.")
+            self.saida("Opção inválida! Criando Guerreiro por padrão.")
             self.personagem = Guerreiro(nome)
         
-        print(f"\nPersonagem criado: {self.personagem.nome} ({self.personagem.classe})")
-        print(f"HP: {self.personagem.hp}/{self.personagem.hp_maximo}")
-        print(f"Mana: {self.personagem.mana}/{self.personagem.mana_maxima}")
-        print(f"Nível: {self.personagem.nivel}")
+        self.saida(f"\nPersonagem criado: {self.personagem.nome} ({self.personagem.classe})")
+        self.saida(f"HP: {self.personagem.hp}/{self.personagem.hp_maximo}")
+        self.saida(f"Mana: {self.personagem.mana}/{self.personagem.mana_maxima}")
+        self.saida(f"Nível: {self.personagem.nivel}")
         
         self.logger.registrar(f"Personagem criado: {self.personagem.nome} ({self.personagem.classe})")
     
-    def encarar_missao(self):
+    def encarar_missao(self, automatico=False):
         """
         Inicia uma missão aleatória para o personagem.
+        
+        Args:
+            automatico (bool): Se True, resolve a missão instantaneamente
+                (como se o jogador escolhesse "Atacar" em todos os turnos)
         """
-        if not self.personagem:
-            print("\nVocê precisa criar um personagem primeiro!")
+        missao = self._sortear_missao()
+        if not missao:
             return
         
-        if not self.personagem.esta_vivo():
-            print("\nSeu personagem está sem HP! Use itens para curar ou recrie o personagem.")
+        inicial = self.personagem.to_dict() if self.replays is not None else None
+        if automatico:
+            resultado = missao.resolver_automaticamente(self.personagem, self.logger, saida=self.saida,
+                                                       metricas=self.metricas)
+        else:
+            resultado = missao.executar_combate(self.personagem, self.logger, saida=self.saida, metricas=self.metricas)
+        if self.replays is not None:
+            self._informar_replay(self._gravar_replay(missao, inicial, resultado,
+                                                      "atacar" if automatico else "turnos"))
+        self._exibir_progresso(resultado)
+    
+    async def encarar_missao_async(self, ler=ler_console, automatico=False):
+        """
+        Versão assíncrona de encarar_missao: a animação de crítico roda em
+        segundo plano enquanto o jogador escolhe a próxima ação, e no modo
+        automático a distribuição de desfechos é calculada fora do loop.
+        
+        Args:
+            ler (callable): Corrotina ler(prompt) que retorna a linha digitada
+            automatico (bool): Se True, resolve a missão instantaneamente
+        """
+        missao = self._sortear_missao()
+        if not missao:
             return
         
+        inicial = self.personagem.to_dict() if self.replays is not None else None
+        if automatico:
+            resultado = await missao.resolver_automaticamente_async(self.personagem, self.logger, saida=self.saida,
+                                                                   metricas=self.metricas)
+        else:
+            resultado = await missao.executar_combate_async(
+                self.personagem, ler, self.logger, saida=self.saida, escrever=self.escrever, metricas=self.metricas)
+        if self.replays is not None:
+            self._informar_replay(await asyncio.to_thread(self._gravar_replay, missao, inicial, resultado,
+                                                          "atacar" if automatico else "turnos"))
+        self._exibir_progresso(resultado)
+    
+    def _sortear_missao(self):
+        """
+        Sorteia uma missão de acordo com o nível do personagem.
+        
+        Returns:
+            Missao | None: Missão sorteada, ou None se o personagem não puder lutar
+        """
+        if not self.personagem:
+            self.saida("\nVocê precisa criar um personagem primeiro!")
+            return None
+        
+        if not self.personagem.esta_vivo():
+            self.saida("\nSeu personagem está sem HP! Use itens para curar ou recrie o personagem.")
+            return None
+        
         # Escolhe dificuldade baseada no nível
         if self.personagem.nivel <= 2:
             dificuldade = "fácil"
@@ -106,79 +209,134 @@ class Jogo:
             dificuldade = random.choice(["médio", "difícil"])
         
         nome_missao = random.choice(self.NOMES_MISSOES)
-        missao = Missao(nome_missao, dificuldade)
-        
-        resultado = missao.executar_combate(self.personagem, self.logger)
+        # Com replays, a missão recebe uma semente para poder ser reproduzida
+        semente = random.getrandbits(64) if self.replays is not None else None
+        return Missao(nome_missao, dificuldade, semente=semente)
+    
+    def _gravar_replay(self, missao, inicial, resultado, modo):
+        """
+        Grava o replay da missão que acabou de ser jogada. As recompensas já
+        foram aplicadas: uma falha aqui só deixa a missão sem replay.
         
+        Returns:
+            bool: True se gravou com sucesso, False caso contrário
+        """
+        from utils.replay import Replay
+        try:
+            self.replays.gravar(Replay.da_missao(missao, inicial, self.personagem, resultado, modo))
+            return True
+        except Exception as e:
+            self.logger.registrar(f"Erro ao gravar o replay: {e}")
+            return False
+    
+    def _informar_replay(self, gravado):
+        """Avisa o jogador se o replay da missão não pôde ser gravado."""
+        if not gravado:
+            self.saida("\nErro ao gravar o replay da missão!")
+    
+    def _exibir_progresso(self, resultado):
+        """Exibe o progresso de XP após uma vitória."""
         if resultado["vitoria"]:
-            print(f"\nXP atual: {self.personagem.xp}/{self.personagem.xp_proximo_nivel}")
-            print(f"Próximo nível em: {self.personagem.xp_proximo_nivel - self.personagem.xp} XP")
+            self.saida(f"\nXP atual: {self.personagem.xp}/{self.personagem.xp_proximo_nivel}")
+            self.saida(f"Próximo nível em: {self.personagem.xp_proximo_nivel - self.personagem.xp} XP")
     
     def ver_status(self):
         """
         Exibe o status completo do personagem.
         """
         if not self.personagem:
-            print("\nVocê precisa criar um personagem primeiro!")
+            self.saida("\nVocê precisa criar um personagem primeiro!")
             return
         
-        print("\n" + "=" * 40)
-        print(f"=== Status de {self.personagem.nome} ===")
-        print("=" * 40)
-        print(f"Classe: {self.personagem.classe}")
-        print(f"Nível: {self.personagem.nivel}")
-        print(f"XP: {self.personagem.xp}/{self.personagem.xp_proximo_nivel}")
-        print(f"HP: {self.personagem.hp}/{self.personagem.hp_maximo}")
-        print(f"Barra de Vida: [{self.personagem.get_barra_vida()}]")
-        print(f"Mana: {self.personagem.mana}/{self.personagem.mana_maxima}")
-        print(f"Dano Base: {self.personagem.dano_base}")
-        print(f"Defesa: {self.personagem.defesa}")
-        print(f"\nInventário ({len(self.personagem.inventario)} itens):")
+        self.saida("\n" + "=" * 40)
+        self.saida(f"=== Status de {self.personagem.nome} ===")
+        self.saida("=" * 40)
+        self.saida(f"Classe: {self.personagem.classe}")
+        self.saida(f"Nível: {self.personagem.nivel}")
+        self.saida(f"XP: {self.personagem.xp}/{self.personagem.xp_proximo_nivel}")
+        self.saida(f"HP: {self.personagem.hp}/{self.personagem.hp_maximo}")
+        self.saida(f"Barra de Vida: [{self.personagem.get_barra_vida()}]")
+        self.saida(f"Mana: {self.personagem.mana}/{self.personagem.mana_maxima}")
+        self.saida(f"Dano Base: {self.personagem.dano_base}")
+        self.saida(f"Defesa: {self.personagem.defesa}")
+        self.saida(f"\nInventário ({self.personagem.inventario.total()} itens):")
         if self.personagem.inventario:
-            for item in self.personagem.inventario:
-                print(f"  - {item}")
+            for item, quantidade in self.personagem.inventario.pilhas():
+                self.saida(f"  - {item} x{quantidade}")
         else:
-            print("  (vazio)")
-        print("=" * 40)
+            self.saida("  (vazio)")
+        self.saida("=" * 40)
     
     def salvar(self):
         """
         Salva o progresso do jogo.
         """
         if not self.personagem:
-            print("\nVocê precisa criar um personagem primeiro!")
+            self.saida("\nVocê precisa criar um personagem primeiro!")
+            return
+        
+        self._informar_salvamento(self.repositorio.salvar(self.personagem))
+    
+    async def salvar_async(self):
+        """
+        Versão assíncrona de salvar: a escrita em disco roda em uma thread
+        auxiliar, sem bloquear as outras sessões do loop de eventos.
+        """
+        if not self.personagem:
+            self.saida("\nVocê precisa criar um personagem primeiro!")
             return
         
-        if self.repositorio.salvar(self.personagem):
-            print("\nJogo salvo com sucesso!")
+        self._informar_salvamento(await asyncio.to_thread(self.repositorio.salvar, self.personagem))
+    
+    def _informar_salvamento(self, sucesso):
+        """Exibe e registra o resultado do salvamento."""
+        if sucesso:
+            self.saida("\nJogo salvo com sucesso!")
             self.logger.registrar(f"Jogo salvo: {self.personagem.nome}")
         else:
-            print("\nErro ao salvar o jogo!")
+            self.saida("\nErro ao salvar o jogo!")
     
     def carregar(self):
         """
         Carrega o progresso do jogo salvo.
         """
+        self._informar_carregamento(*self._ler_save())
+    
+    async def carregar_async(self):
+        """Versão assíncrona de carregar (leitura do save em uma thread auxiliar)."""
+        self._informar_carregamento(*await asyncio.to_thread(self._ler_save))
+    
+    def _ler_save(self):
+        """
+        Lê o save do repositório.
+        
+        Returns:
+            tuple: (existe_save, personagem carregado ou None)
+        """
         if not self.repositorio.existe_save():
-            print("\nNenhum save encontrado!")
+            return False, None
+        return True, self.repositorio.carregar()
+    
+    def _informar_carregamento(self, existe_save, personagem_carregado):
+        """Adota o personagem carregado e exibe o resultado."""
+        if not existe_save:
+            self.saida("\nNenhum save encontrado!")
             return
         
-        personagem_carregado = self.repositorio.carregar()
-        
         if personagem_carregado:
             self.personagem = personagem_carregado
-            print(f"\nJogo carregado com sucesso!")
-            print(f"Personagem: {self.personagem.nome} ({self.personagem.classe})")
-            print(f"Nível: {self.personagem.nivel}")
+            self.saida(f"\nJogo carregado com sucesso!")
+            self.saida(f"Personagem: {self.personagem.nome} ({self.personagem.classe})")
+            self.saida(f"Nível: {self.personagem.nivel}")
             self.logger.registrar(f"Jogo carregado: {self.personagem.nome}")
         else:
-            print("\nErro ao carregar o jogo!")
+            self.saida("\nErro ao carregar o jogo!")
     
     def executar(self):
         """
         Loop principal do jogo.
         """
-        print("\nBem-vindo ao RPG OO!")
+        self.saida("\nBem-vindo ao RPG OO!")
         
         while True:
             self.exibir_menu()
@@ -188,16 +346,58 @@ class Jogo:
                 self.criar_personagem()
             elif escolha == "2":
                 self.encarar_missao()
-            elif escolha == "3":
-                self.ver_status()
+            elif not self._executar_opcao(escolha):
+                break
+    
+    async def executar_async(self, ler=None):
+        """
+        Loop principal do jogo em asyncio. A entrada é lida sem bloquear o
+        loop de eventos, as animações de crítico rodam em segundo plano e o
+        salvamento/carregamento e o modo automático não bloqueiam outras sessões.
+        
+        Args:
+            ler (callable, optional): Corrotina ler(prompt) que retorna a linha
+                digitada (padrão: console, via thread auxiliar)
+        """
+        ler = ler or ler_console
+        self.saida("\nBem-vindo ao RPG OO!")
+        
+        while True:
+            self.exibir_menu()
+            escolha = (await ler("\n> ")).strip()
+            
+            if escolha == "1":
+                await self.criar_personagem_async(ler)
+            elif escolha == "2":
+                await self.encarar_missao_async(ler)
             elif escolha == "4":
-                self.salvar()
+                await self.salvar_async()
             elif escolha == "5":
-                self.carregar()
-            elif escolha == "0":
-                print("\nObrigado por jogar! Até logo!")
-                self.logger.registrar("Jogo encerrado")
+                await self.carregar_async()
+            elif escolha == "6":
+                await self.encarar_missao_async(ler, automatico=True)
+            elif not self._executar_opcao(escolha):
                 break
-            else:
-                print("\nOpção inválida! Tente novamente.")
-
+    
+    def _executar_opcao(self, escolha):
+        """
+        Executa as opções do menu que não leem entrada do jogador.
+        
+        Returns:
+            bool: False se o jogador escolheu sair
+        """
+        if escolha == "3":
+            self.ver_status()
+        elif escolha == "4":
+            self.salvar()
+        elif escolha == "5":
+            self.carregar()
+        elif escolha == "6":
+            self.encarar_missao(automatico=True)
+        elif escolha == "0":
+            self.saida("\nObrigado por jogar! Até logo!")
+            self.logger.registrar("Jogo encerrado")
+            return False
+        else:
+            self.saida("\nOpção inválida! Tente novamente.")
+        return True
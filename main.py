@@ -1,17 +1,82 @@
 """
 Arquivo principal que inicia o jogo RPG.
 Execute este arquivo para começar a jogar.
+
+Opções:
+    --async             loop em asyncio; a animação de crítico roda em segundo plano
+    --replays ARQUIVO   grava cada missão como replay (ver utils/replay.py)
+    --metricas ARQUIVO  coleta métricas dos combates e as grava ao sair
+                        (Prometheus para .prom/.txt, JSON para os demais)
+    --journal ARQUIVO   salva em um journal (só as mudanças a cada salvamento,
+                        ver utils/repositorio_journal.py)
+    --log-maximo MB     rotaciona o jogo.log ao passar de MB megabytes,
+                        comprimindo os segmentos antigos em segundo plano
+    --eventos ARQUIVO   grava os eventos em binário, com o jogo.log como visão
+                        em texto dos mesmos eventos (ver utils/eventos.py)
+    --sem-log           com --eventos, não grava o jogo.log (o texto pode ser
+                        gerado depois: python -m utils.eventos ARQUIVO --texto)
 """
 
+import argparse
+import asyncio
+
 from jogo import Jogo
 
 
 def main():
     """Função principal que inicia o jogo."""
-    jogo = Jogo()
-    jogo.executar()
+    parser = argparse.ArgumentParser(description="RPG OO")
+    parser.add_argument("--async", dest="assincrono", action="store_true",
+                        help="loop em asyncio, com a animação de crítico em segundo plano")
+    parser.add_argument("--replays", metavar="ARQUIVO", help="grava cada missão como replay")
+    parser.add_argument("--metricas", metavar="ARQUIVO", help="grava as métricas dos combates ao sair")
+    parser.add_argument("--journal", metavar="ARQUIVO", help="salva em um journal de deltas em vez de save.json")
+    parser.add_argument("--log-maximo", metavar="MB", type=float,
+                        help="rotaciona o jogo.log ao passar deste tamanho (mantém 5 segmentos .gz)")
+    parser.add_argument("--eventos", metavar="ARQUIVO", help="grava os eventos do jogo em binário")
+    parser.add_argument("--sem-log", action="store_true", help="com --eventos, não grava o jogo.log")
+    args = parser.parse_args()
+    if args.sem_log and not args.eventos:
+        parser.error("--sem-log requer --eventos")
+
+    replays = None
+    if args.replays:
+        from utils.replay import ArquivoReplay
+        replays = ArquivoReplay(args.replays)
+
+    metricas = None
+    if args.metricas:
+        from utils.metricas import MetricasCombate
+        metricas = MetricasCombate()
+
+    repositorio = None
+    if args.journal:
+        from utils.repositorio_journal import RepositorioJournal
+        repositorio = RepositorioJournal(args.journal)
+
+    logger = None
+    if args.log_maximo:
+        from utils.logger import LoggerBufferizado, RotacaoLog
+        logger = LoggerBufferizado(rotacao=RotacaoLog(tamanho_maximo=int(args.log_maximo * 1024 * 1024)))
+
+    if args.eventos:
+        from utils.eventos import RegistroEventos
+        from utils.logger import LoggerBufferizado
+        texto = None
+        if not args.sem_log:
+            texto = logger if logger is not None else LoggerBufferizado()
+        logger = RegistroEventos(args.eventos, texto=texto)
+
+    jogo = Jogo(repositorio=repositorio, logger=logger, replays=replays, metricas=metricas)
+    try:
+        if args.assincrono:
+            asyncio.run(jogo.executar_async())
+        else:
+            jogo.executar()
+    finally:
+        if metricas is not None:
+            metricas.exportar(args.metricas)
 
 
 if __name__ == "__main__":
     main()
-
@@ -4,9 +4,21 @@ Implementa atributos comuns como nome e HP.
 """
 
 
+# Sentinela de um campo marcado como alterado (nunca é igual a um valor)
+_ALTERADO = object()
+
+
 class Atributos:
     """Classe base com atributos comuns para personagens e inimigos."""
     
+    # __slots__ dispensa o __dict__ por instância, reduzindo a memória usada
+    # quando muitos personagens/inimigos são mantidos ao mesmo tempo
+    # rng: gerador aleatório usado nas rolagens (None = módulo random global)
+    __slots__ = ("nome", "hp", "hp_maximo", "_salvo", "rng")
+    
+    # Campos salvos em disco, comparados com o último estado salvo
+    CAMPOS_PERSISTENTES = frozenset(("nome", "hp", "hp_maximo"))
+    
     def __init__(self, nome, hp, hp_maximo=None):
         """
         Inicializa um objeto com atributos básicos.
@@ -16,9 +28,50 @@ class Atributos:
             hp (int): Pontos de vida atuais
             hp_maximo (int, optional): Pontos de vida máximos. Se None, usa hp como máximo.
         """
+        # Valores dos campos persistentes no último salvamento (None: nunca
+        # salvo). As atribuições não são interceptadas: as alterações são
+        # descobertas comparando com este retrato quando alguém pergunta.
+        self._salvo = None
         self.nome = nome
         self.hp = hp
         self.hp_maximo = hp_maximo if hp_maximo is not None else hp
+        self.rng = None
+    
+    def _valores_persistentes(self):
+        """Valores atuais dos campos persistentes (cópias dos mutáveis)."""
+        return {campo: getattr(self, campo) for campo in self.CAMPOS_PERSISTENTES}
+    
+    def marcar_sujo(self, campo):
+        """
+        Marca um campo como alterado mesmo que o valor seja o do último
+        salvamento.
+        
+        Args:
+            campo (str): Nome do campo alterado
+        """
+        if self._salvo is not None:
+            self._salvo[campo] = _ALTERADO
+    
+    def campos_sujos(self):
+        """
+        Retorna os campos persistentes alterados desde o último salvamento.
+        
+        Returns:
+            frozenset: Nomes dos campos alterados
+        """
+        if self._salvo is None:
+            return frozenset(self.CAMPOS_PERSISTENTES)
+        salvo = self._salvo
+        return frozenset(campo for campo, valor in self._valores_persistentes().items()
+                         if salvo.get(campo, _ALTERADO) != valor)
+    
+    def esta_sujo(self):
+        """Verifica se há alterações ainda não salvas."""
+        return self._salvo is None or self._salvo != self._valores_persistentes()
+    
+    def marcar_limpo(self):
+        """Marca o estado atual como salvo."""
+        self._salvo = self._valores_persistentes()
     
     def esta_vivo(self):
         """Verifica se o personagem/inimigo está vivo."""
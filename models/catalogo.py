@@ -0,0 +1,106 @@
+"""
+Módulo que define o catálogo de itens do jogo.
+Os itens são descritos em uma tabela carregada uma única vez; o catálogo
+entrega instâncias compartilhadas de Item (mil poções apontam para o mesmo
+objeto) e aplica o efeito de cada item por consulta na tabela.
+"""
+
+from models.inventario import Item
+
+
+# Tabela de itens: nome -> definição
+# - efeito: chave em EFEITOS (None = item sem uso em combate)
+# - valor: intensidade do efeito
+# - recompensa: se o item pode ser obtido em missões
+ITENS = {
+    "poção": {"descricao": "Restaura 30 de HP", "efeito": "curar", "valor": 30, "recompensa": True},
+    "poção de mana": {"descricao": "Restaura 25 de mana", "efeito": "restaurar_mana", "valor": 25, "recompensa": True},
+    "elixir": {"descricao": "Líquido raro, ainda sem uso", "efeito": None, "valor": 0, "recompensa": True},
+    "cristal": {"descricao": "Cristal brilhante, ainda sem uso", "efeito": None, "valor": 0, "recompensa": True},
+}
+
+
+def _curar(personagem, valor):
+    """Efeito de cura: restaura HP até o máximo."""
+    personagem.curar(valor)
+
+
+def _restaurar_mana(personagem, valor):
+    """Efeito de mana: restaura mana até o máximo."""
+    personagem.mana = min(personagem.mana + valor, personagem.mana_maxima)
+
+
+# Tabela de despacho dos efeitos
+EFEITOS = {
+    "curar": _curar,
+    "restaurar_mana": _restaurar_mana,
+}
+
+
+class CatalogoItens:
+    """
+    Catálogo de itens: guarda as definições, entrega instâncias únicas
+    de Item por nome e aplica os efeitos.
+    """
+
+    def __init__(self, tabela=ITENS):
+        """
+        Carrega a tabela de itens.
+
+        Args:
+            tabela (dict): Definições no formato de ITENS
+        """
+        self._itens = {}
+        self._efeitos = {}
+        self._recompensas = []
+        for nome, definicao in tabela.items():
+            self._itens[nome] = Item(nome, definicao["descricao"])
+            if definicao["efeito"] is not None:
+                self._efeitos[nome] = (EFEITOS[definicao["efeito"]], definicao["valor"])
+            if definicao.get("recompensa", False):
+                self._recompensas.append(nome)
+
+    def obter(self, nome):
+        """
+        Retorna a instância compartilhada do item com esse nome.
+        Nomes desconhecidos (ex.: de saves antigos) são registrados sem efeito.
+
+        Args:
+            nome (str): Nome do item
+
+        Returns:
+            Item: Instância única do item
+        """
+        item = self._itens.get(nome)
+        if item is None:
+            item = self._itens[nome] = Item(nome, "")
+        return item
+
+    def aplicar(self, personagem, nome):
+        """
+        Aplica o efeito do item no personagem.
+
+        Args:
+            personagem: Personagem que usa o item
+            nome (str): Nome do item
+
+        Returns:
+            bool: True se o item tem efeito e foi aplicado
+        """
+        efeito = self._efeitos.get(nome)
+        if efeito is None:
+            return False
+        funcao, valor = efeito
+        funcao(personagem, valor)
+        return True
+
+    def nomes_recompensa(self):
+        """Retorna os nomes dos itens que podem ser obtidos em missões."""
+        return list(self._recompensas)
+
+    def __contains__(self, nome):
+        return nome in self._itens
+
+
+# Catálogo carregado uma única vez na importação
+CATALOGO = CatalogoItens()
@@ -1,6 +1,11 @@
 """
 Módulo que define as classes de personagem (Guerreiro, Mago, etc.)
 com habilidades especiais únicas.
+
+Cada classe define seus perfis de dano (ATAQUE e HABILIDADE, ver
+Personagem); os métodos atacar() e habilidade_especial() de Personagem
+aplicam esses perfis, de modo que simulações e cálculos exatos de
+probabilidade usam exatamente as mesmas regras.
 """
 
 from models.personagem import Personagem
@@ -12,6 +17,14 @@ class Guerreiro(Personagem):
     Possui mais HP e defesa, mas menos mana.
     """
     
+    __slots__ = ()
+    
+    # Guerreiros causam mais dano físico, com chance de crítico ligeiramente reduzida
+    ATAQUE = (0.9, 1.3, 0.18, 1.9)
+    # Ataque devastador: 150% a 200% do dano base por 15 de mana,
+    # com chance de crítico um pouco menor para ataques pesados
+    HABILIDADE = (15, 1.5, 2.0, 0.15, 1.8)
+    
     def __init__(self, nome):
         """
         Inicializa um Guerreiro.
@@ -24,43 +37,6 @@ class Guerreiro(Personagem):
         self.mana_maxima = 30
         self.dano_base = 12
         self.defesa = 8
-    
-    def habilidade_especial(self):
-        """
-        Ataque devastador: causa muito dano, mas consome mana.
-        
-        Returns:
-            int: Dano causado pela habilidade especial
-        """
-        if self.mana >= 15:
-            import random
-            from utils import calcular_critico
-
-            self.mana -= 15
-            # Ataque devastador causa 150% a 200% do dano base
-            dano = int(self.dano_base * random.uniform(1.5, 2.0))
-
-            # Aplicar crítico com chance um pouco menor para ataques pesados
-            dano_final, _ = calcular_critico(dano, chance=0.15, multiplicador=1.8, animacao=False, verbose=False)
-            return max(1, dano_final)
-        return 0
-    
-    def atacar(self):
-        """
-        Sobrescreve o método atacar para causar mais dano.
-        
-        Returns:
-            int: Dano causado pelo ataque
-        """
-        import random
-        from utils import calcular_critico
-
-        # Guerreiros causam mais dano físico
-        dano = int(self.dano_base * random.uniform(0.9, 1.3))
-
-        # Chance de crítico ligeiramente reduzida para ataques físicos
-        dano_final, _ = calcular_critico(dano, chance=0.18, multiplicador=1.9, animacao=False, verbose=False)
-        return max(1, dano_final)
 
 
 class Mago(Personagem):
@@ -69,6 +45,13 @@ class Mago(Personagem):
     Possui menos HP, mas mais mana e dano mágico.
     """
     
+    __slots__ = ()
+    
+    # Magos causam dano mágico consistente
+    ATAQUE = (0.85, 1.15, 0.22, 1.75)
+    # Bola de fogo: 200% a 250% do dano base por 20 de mana
+    HABILIDADE = (20, 2.0, 2.5, 0.20, 2.0)
+    
     def __init__(self, nome):
         """
         Inicializa um Mago.
@@ -81,42 +64,6 @@ class Mago(Personagem):
         self.mana_maxima = 100
         self.dano_base = 8
         self.defesa = 3
-    
-    def habilidade_especial(self):
-        """
-        Bola de fogo: causa dano mágico significativo.
-        
-        Returns:
-            int: Dano causado pela habilidade especial
-        """
-        if self.mana >= 20:
-            import random
-            from utils import calcular_critico
-
-            self.mana -= 20
-            # Bola de fogo causa 200% a 250% do dano base
-            dano = int(self.dano_base * random.uniform(2.0, 2.5))
-
-            # Magia tem a mesma chance padrão de crítico
-            dano_final, _ = calcular_critico(dano, chance=0.20, multiplicador=2.0, animacao=False, verbose=False)
-            return max(1, dano_final)
-        return 0
-    
-    def atacar(self):
-        """
-        Sobrescreve o método atacar para usar magia básica.
-        
-        Returns:
-            int: Dano causado pelo ataque
-        """
-        import random
-        from utils import calcular_critico
-
-        # Magos causam dano mágico consistente
-        dano = int(self.dano_base * random.uniform(0.85, 1.15))
-
-        dano_final, _ = calcular_critico(dano, chance=0.22, multiplicador=1.75, animacao=False, verbose=False)
-        return max(1, dano_final)
 
 
 class Arqueiro(Personagem):
@@ -125,6 +72,12 @@ class Arqueiro(Personagem):
     Possui equilíbrio entre HP, mana e dano.
     """
     
+    __slots__ = ()
+    
+    # Chuva de flechas: 140% a 180% do dano base por 18 de mana,
+    # com chance de crítico de 30% e multiplicador 1.5
+    HABILIDADE = (18, 1.4, 1.8, 0.30, 1.5)
+    
     def __init__(self, nome):
         """
         Inicializa um Arqueiro.
@@ -137,24 +90,3 @@ class Arqueiro(Personagem):
         self.mana_maxima = 60
         self.dano_base = 11
         self.defesa = 5
-    
-    def habilidade_especial(self):
-        """
-        Chuva de flechas: ataque múltiplo com chance de crítico.
-        
-        Returns:
-            int: Dano causado pela habilidade especial
-        """
-        if self.mana >= 18:
-            import random
-            from utils import calcular_critico
-
-            self.mana -= 18
-            # Chuva de flechas causa 140% a 180% do dano base
-            dano = int(self.dano_base * random.uniform(1.4, 1.8))
-
-            # Usa calcular_critico com chance 30% e multiplicador 1.5
-            dano_final, _ = calcular_critico(dano, chance=0.30, multiplicador=1.5, animacao=False, verbose=False)
-            return max(1, dano_final)
-        return 0
-
@@ -0,0 +1,465 @@
+"""
+Módulo que implementa o motor de combate por turnos.
+
+O motor aplica as regras do combate sem depender do console: quem o
+utiliza escolhe as ações através de uma política e decide se as
+mensagens devem ser exibidas (modo interativo) ou descartadas (modo
+headless, usado em simulações).
+"""
+
+from time import perf_counter
+
+from utils.tipos_evento import (ATAQUE, CRITICO, DERROTA, HABILIDADE, INICIO, INIMIGO, RECOMPENSA, VITORIA,
+                                formatar_evento)
+
+
+class Combate:
+    """
+    Motor de combate entre um personagem e o inimigo de uma missão.
+
+    Uma política é uma função ``politica(personagem, inimigo)`` que retorna
+    ``"atacar"``, ``"habilidade"`` ou ``("item", item)``. Quando ``saida`` é
+    None nenhuma mensagem é montada nem exibida.
+
+    Os eventos do combate vão para o logger como linhas de texto ou, se ele
+    aceita eventos estruturados (como utils.eventos.RegistroEventos), como
+    registros binários, sem montar o texto.
+    """
+
+    def __init__(self, missao, personagem, logger=None, saida=None):
+        """
+        Inicializa o combate.
+
+        Args:
+            missao: Missão que fornece o inimigo e as recompensas
+            personagem: Instância do personagem do jogador
+            logger: Instância do logger para registrar eventos (opcional)
+            saida (callable, optional): Função que exibe mensagens (ex.: print)
+        """
+        self.missao = missao
+        self.personagem = personagem
+        self.inimigo = missao.inimigo
+        self.logger = logger
+        self._evento = getattr(logger, "evento", None)
+        self.saida = saida
+        self.turno = 0
+        self.hp_inicial_personagem = personagem.hp
+        self.dano_causado = 0
+        self.dano_recebido = 0
+        self.criticos = 0
+        self.itens_usados = []
+        self.acoes = []
+        self.resultado = None
+        # Gerador do personagem enquanto ele usa o da missão (ver iniciar)
+        self._rng_personagem = None
+        self._rng_trocado = False
+
+    @property
+    def finalizado(self):
+        """Indica se o combate já terminou."""
+        return self.resultado is not None
+
+    def executar(self, politica):
+        """
+        Executa o combate completo usando uma política para escolher as ações.
+
+        Args:
+            politica (callable): Função que escolhe a ação de cada turno
+
+        Returns:
+            dict: Resultado do combate (ver ``_finalizar``)
+        """
+        self.iniciar()
+        try:
+            while not self.finalizado:
+                self.iniciar_turno()
+                self.executar_turno(politica(self.personagem, self.inimigo))
+        finally:
+            # Uma política que falha (fim da entrada, conexão encerrada) não
+            # deixa o personagem preso ao gerador da missão
+            self.restaurar_rng()
+        return self.resultado
+
+    def iniciar(self):
+        """
+        Anuncia o início da missão. Se a missão tem um gerador aleatório
+        próprio, ele passa a ser usado também pelo personagem até o fim do
+        combate, para que toda a luta saia de um único fluxo reproduzível.
+        """
+        if self.missao.rng is not None:
+            self._rng_personagem = self.personagem.rng
+            self.personagem.rng = self.missao.rng
+            self._rng_trocado = True
+
+        if self.saida:
+            self.saida(f"\n=== Missão: {self.missao.nome} ===")
+            self.saida(f"Você encontrou um {self.inimigo.nome}!")
+            self.saida(f"HP do inimigo: {self.inimigo.hp}")
+
+        if self.logger:
+            self._registrar(INICIO, self.missao.nome, alvo=self.inimigo.nome)
+
+    def restaurar_rng(self):
+        """
+        Devolve ao personagem o gerador que ele tinha antes de iniciar().
+        Pode ser chamado mais de uma vez; quem conduz os turnos deve
+        chamá-lo também quando o combate é interrompido.
+        """
+        if self._rng_trocado:
+            self.personagem.rng = self._rng_personagem
+            self._rng_trocado = False
+
+    def iniciar_turno(self):
+        """Avança o contador de turnos e anuncia o novo turno."""
+        self.turno += 1
+        if self.saida:
+            self.saida(f"\n--- Turno {self.turno} ---")
+
+    def executar_turno(self, acao):
+        """
+        Executa a ação do jogador e, se o inimigo sobreviver, a resposta dele.
+
+        Args:
+            acao: "atacar", "habilidade", "item" ou a tupla ("item", item)
+        """
+        self.acoes.append(acao)
+        item = None
+        if isinstance(acao, tuple):
+            acao, item = acao
+
+        if acao == "atacar":
+            dano_aplicado = self._atacar()
+            if self.logger:
+                self._registrar(ATAQUE, self.personagem.nome, dano_aplicado, flags=self._flags_golpe())
+        elif acao == "habilidade":
+            self._usar_habilidade()
+        elif acao == "item":
+            self._usar_item(item)
+        else:
+            raise ValueError(f"Ação inválida: {acao}")
+
+        # Verifica se o inimigo foi derrotado
+        if not self.inimigo.esta_vivo():
+            self._finalizar()
+            return
+
+        # Regeneração do chefão (se aplicável)
+        if hasattr(self.inimigo, 'regenerar'):
+            self.inimigo.regenerar()
+
+        self._turno_inimigo()
+
+        if not self.personagem.esta_vivo():
+            self._finalizar()
+
+    def encerrar_com_desfecho(self, vitoria, hp, mana):
+        """
+        Encerra o combate diretamente com um desfecho já sorteado (modo
+        automático), aplicando as mesmas recompensas e registros do combate
+        turno a turno. As estatísticas por turno ficam como None.
+
+        Args:
+            vitoria (bool): Se o personagem venceu
+            hp (int): HP do personagem ao fim do combate (ignorado na derrota)
+            mana (int): Mana do personagem ao fim do combate
+        """
+        self.personagem.hp = hp if vitoria else 0
+        self.personagem.mana = mana
+        if vitoria:
+            self.inimigo.hp = 0
+        self.turno = self.dano_causado = self.dano_recebido = self.criticos = None
+        self._finalizar()
+        return self.resultado
+
+    def _aplicar_dano_no_inimigo(self, dano):
+        """Aplica o dano do jogador no inimigo e contabiliza críticos."""
+        dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
+        self.dano_causado += dano_aplicado
+        if self.personagem.ultimo_critico:
+            self.criticos += 1
+        if self.saida:
+            self.saida(f"{self.personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
+            self.saida(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
+        return dano_aplicado
+
+    def _registrar(self, tipo, ator, quantidade=0, alvo="", flags=0):
+        """Envia um evento ao logger (ver utils.tipos_evento.formatar_evento)."""
+        if self._evento is not None:
+            self._evento(tipo, self.turno, ator, quantidade, alvo, flags)
+        else:
+            self.logger.registrar(formatar_evento(tipo, self.turno, ator, quantidade, alvo, flags))
+
+    def _flags_golpe(self):
+        """Flags do evento de um golpe do jogador (crítico ou não)."""
+        return CRITICO if self.personagem.ultimo_critico else 0
+
+    def _atacar(self):
+        """Realiza um ataque básico do jogador."""
+        return self._aplicar_dano_no_inimigo(self.personagem.atacar())
+
+    def _usar_habilidade(self):
+        """Usa a habilidade especial, atacando normalmente se faltar mana."""
+        dano = self.personagem.habilidade_especial()
+        if dano > 0:
+            if self.saida:
+                self.saida(f"{self.personagem.nome} usa habilidade especial!")
+            dano_aplicado = self._aplicar_dano_no_inimigo(dano)
+            if self.logger:
+                self._registrar(HABILIDADE, self.personagem.nome, dano_aplicado, flags=self._flags_golpe())
+        else:
+            if self.saida:
+                self.saida(f"{self.personagem.nome} não tem mana suficiente para usar habilidade especial!")
+            # Se não tem mana, ataca normalmente
+            self._atacar()
+
+    def _usar_item(self, item):
+        """Usa um item do inventário, atacando normalmente se não houver itens."""
+        inventario = self.personagem.inventario
+        if not inventario:
+            if self.saida:
+                self.saida(f"{self.personagem.nome} não tem itens no inventário!")
+            # Se não tem itens, ataca normalmente
+            self._atacar()
+            return
+
+        if item is None:
+            item = next(iter(inventario))
+
+        if self.personagem.usar_item(item):
+            self.itens_usados.append(item.nome if hasattr(item, "nome") else str(item))
+            if self.saida:
+                self.saida(f"{self.personagem.nome} usou {item}!")
+                self.saida(f"{self.personagem.nome} agora tem {self.personagem.hp} HP.")
+        elif self.saida:
+            self.saida(f"Não foi possível usar {item}.")
+
+    def _turno_inimigo(self):
+        """Executa o ataque do inimigo contra o jogador."""
+        dano_inimigo = self.inimigo.atacar()
+        dano_aplicado = self.personagem.receber_dano(max(1, dano_inimigo - self.personagem.defesa))
+        self.dano_recebido += dano_aplicado
+        if self.saida:
+            self.saida(f"{self.inimigo.nome} causa {dano_aplicado} de dano em {self.personagem.nome}!")
+            self.saida(f"{self.personagem.nome} agora tem {self.personagem.hp} HP.")
+
+        if self.logger:
+            self._registrar(ATAQUE, self.inimigo.nome, dano_aplicado, flags=INIMIGO)
+
+    def _finalizar(self):
+        """
+        Aplica as recompensas (ou a penalidade) e monta o resultado.
+
+        O resultado contém as chaves ``vitoria``, ``xp``, ``itens``,
+        ``subiu_nivel``, ``turnos``, ``dano_causado``, ``dano_recebido``,
+        ``criticos``, ``itens_usados``, ``acoes`` (ações de cada turno, na
+        ordem em que foram executadas) e ``inimigo``.
+        """
+        personagem = self.personagem
+        missao = self.missao
+        self.restaurar_rng()
+
+        if self.saida:
+            self.saida(f"\n=== Resultado da Missão ===")
+
+        if personagem.esta_vivo():
+            if self.saida:
+                self.saida(f"{personagem.nome} venceu o combate!")
+                self.saida(f"XP ganho: {missao.xp_recompensa}")
+
+            subiu_nivel = personagem.ganhar_xp(missao.xp_recompensa)
+            if subiu_nivel and self.saida:
+                self.saida(f"\n🎉 {personagem.nome} subiu para o nível {personagem.nivel}!")
+                self.saida(f"HP máximo aumentou para {personagem.hp_maximo}!")
+
+            if missao.itens_recompensa:
+                if self.saida:
+                    self.saida(f"Itens obtidos: {', '.join(missao.itens_recompensa)}")
+                for item in missao.itens_recompensa:
+                    personagem.adicionar_item(item)
+
+            if self.logger:
+                self._registrar(VITORIA, personagem.nome, alvo=self.inimigo.nome)
+                self._registrar(RECOMPENSA, personagem.nome, missao.xp_recompensa,
+                                alvo=", ".join(missao.itens_recompensa))
+
+            vitoria, xp, itens = True, missao.xp_recompensa, missao.itens_recompensa
+        else:
+            if self.saida:
+                self.saida(f"{personagem.nome} foi derrotado!")
+                self.saida(f"Você perdeu a missão.")
+
+            # Restaura HP inicial em caso de derrota (opcional - pode remover)
+            personagem.hp = self.hp_inicial_personagem
+
+            if self.logger:
+                self._registrar(DERROTA, personagem.nome, alvo=self.inimigo.nome)
+
+            vitoria, xp, itens, subiu_nivel = False, 0, [], False
+
+        self.resultado = {
+            "vitoria": vitoria,
+            "xp": xp,
+            "itens": itens,
+            "subiu_nivel": subiu_nivel,
+            "turnos": self.turno,
+            "dano_causado": self.dano_causado,
+            "dano_recebido": self.dano_recebido,
+            "criticos": self.criticos,
+            "itens_usados": self.itens_usados,
+            "acoes": self.acoes,
+            "inimigo": self.inimigo.nome
+        }
+
+
+class _LoggerCronometrado:
+    """Repassa os registros a um logger, medindo o tempo de cada um."""
+
+    __slots__ = ("logger", "fases")
+
+    def __init__(self, logger, fases):
+        self.logger = logger
+        self.fases = fases
+
+    def registrar(self, mensagem):
+        inicio = perf_counter()
+        self.logger.registrar(mensagem)
+        self.fases.observar(perf_counter() - inicio, ("log",))
+
+
+class _EventosCronometrados(_LoggerCronometrado):
+    """Repassa os eventos estruturados a um registro de eventos, medindo o tempo de cada um."""
+
+    __slots__ = ()
+
+    def evento(self, *campos):
+        inicio = perf_counter()
+        self.logger.evento(*campos)
+        self.fases.observar(perf_counter() - inicio, ("log",))
+
+
+class CombateInstrumentado(Combate):
+    """
+    Combate que alimenta um MetricasCombate (ver utils.metricas): turnos,
+    golpes e críticos por classe e ação, histogramas de dano, falta de
+    mana, itens usados, regenerações do inimigo e o tempo de cada fase.
+
+    As regras e os sorteios são os do Combate: as métricas são tiradas dos
+    valores que o combate já calcula, sem alterar as entidades. Só é usado
+    quando as métricas estão ativas (ver Missao.resolver); sem elas o
+    combate não executa nenhum código de medição.
+    """
+
+    def __init__(self, missao, personagem, metricas, logger=None, saida=None):
+        """
+        Inicializa o combate.
+
+        Args:
+            missao: Missão que fornece o inimigo e as recompensas
+            personagem: Instância do personagem do jogador
+            metricas (MetricasCombate): Métricas alimentadas pelo combate
+            logger: Instância do logger para registrar eventos (opcional)
+            saida (callable, optional): Função que exibe mensagens (ex.: print)
+        """
+        if logger is not None:
+            cronometrado = _EventosCronometrados if hasattr(logger, "evento") else _LoggerCronometrado
+            logger = cronometrado(logger, metricas.fases)
+        if saida is not None:
+            saida = self._cronometrar_saida(saida, metricas.fases)
+        super().__init__(missao, personagem, logger=logger, saida=saida)
+        self.metricas = metricas
+        # Ação em andamento ("ataque" ou "habilidade"), início do turno e HP
+        # do inimigo depois da ação do jogador (para detectar a regeneração)
+        self._acao = None
+        self._inicio_turno = None
+        self._hp_inimigo = None
+
+    @staticmethod
+    def _cronometrar_saida(saida, fases):
+        def saida_cronometrada(*args, **kwargs):
+            inicio = perf_counter()
+            saida(*args, **kwargs)
+            fases.observar(perf_counter() - inicio, ("saida",))
+        return saida_cronometrada
+
+    def executar_turno(self, acao):
+        self._acao = None
+        self._hp_inimigo = self.inimigo.hp
+        self._inicio_turno = perf_counter()
+        super().executar_turno(acao)
+
+    def _encerrar_acao_jogador(self):
+        """Registra o tempo da ação do jogador (uma vez por turno)."""
+        if self._inicio_turno is not None:
+            self.metricas.fases.observar(perf_counter() - self._inicio_turno, ("acao_jogador",))
+            self._inicio_turno = None
+
+    def _atacar(self):
+        if self._acao == "habilidade":
+            # A habilidade foi trocada pelo ataque básico por falta de mana
+            self.metricas.mana_insuficiente.incrementar((self.personagem.classe,))
+        self._acao = "ataque"
+        return super()._atacar()
+
+    def _usar_habilidade(self):
+        self._acao = "habilidade"
+        super()._usar_habilidade()
+
+    def _aplicar_dano_no_inimigo(self, dano):
+        dano_aplicado = super()._aplicar_dano_no_inimigo(dano)
+        metricas = self.metricas
+        rotulos = (self.personagem.classe, self._acao)
+        metricas.golpes.incrementar(rotulos)
+        if self.personagem.ultimo_critico:
+            metricas.criticos.incrementar(rotulos)
+        metricas.dano_causado.observar(dano_aplicado, rotulos)
+        self._hp_inimigo = self.inimigo.hp
+        return dano_aplicado
+
+    def _usar_item(self, item):
+        usados = len(self.itens_usados)
+        super()._usar_item(item)
+        if len(self.itens_usados) > usados:
+            self.metricas.itens_usados.incrementar((self.itens_usados[-1],))
+
+    def _turno_inimigo(self):
+        self._encerrar_acao_jogador()
+        metricas = self.metricas
+        if self._hp_inimigo is not None and self.inimigo.hp > self._hp_inimigo:
+            metricas.regeneracoes.incrementar((self.inimigo.nome,))
+
+        inicio = perf_counter()
+        recebido = self.dano_recebido
+        super()._turno_inimigo()
+        metricas.dano_recebido.observar(self.dano_recebido - recebido, (self.inimigo.nome,))
+        metricas.fases.observar(perf_counter() - inicio, ("acao_inimigo",))
+
+    def _finalizar(self):
+        self._encerrar_acao_jogador()
+        super()._finalizar()
+        metricas = self.metricas
+        classe, inimigo = self.personagem.classe, self.inimigo.nome
+        desfecho = "vitoria" if self.resultado["vitoria"] else "derrota"
+        metricas.combates.incrementar((classe, inimigo, desfecho))
+        # No modo automático os turnos não são conhecidos
+        if self.turno is not None:
+            metricas.turnos.observar(self.turno, (classe, inimigo))
+
+
+def politica_atacar(personagem, inimigo):
+    """Política que sempre usa o ataque básico."""
+    return "atacar"
+
+
+def politica_habilidade(personagem, inimigo):
+    """Política que usa a habilidade especial sempre que possível."""
+    return "habilidade"
+
+
+def politica_cautelosa(personagem, inimigo):
+    """
+    Política que bebe uma poção quando o HP cai abaixo de 30% e,
+    fora isso, usa a habilidade especial sempre que possível.
+    """
+    if personagem.hp < personagem.hp_maximo * 0.3 and "poção" in personagem.inventario:
+        return ("item", "poção")
+    return "habilidade"
@@ -11,6 +11,11 @@ class Inimigo(Atributos):
     Classe base para inimigos do jogo.
     """
     
+    __slots__ = ("dano", "xp_recompensa", "defesa")
+    
+    # Dano varia entre 80% e 120% do dano base
+    FATOR_ATAQUE = (0.8, 1.2)
+    
     def __init__(self, nome, hp, dano, xp_recompensa=50):
         """
         Inicializa um inimigo.
@@ -34,7 +39,7 @@ class Inimigo(Atributos):
             int: Dano causado pelo ataque
         """
         # Dano varia entre 80% e 120% do dano base
-        dano = int(self.dano * random.uniform(0.8, 1.2))
+        dano = int(self.dano * (self.rng or random).uniform(*self.FATOR_ATAQUE))
         return max(1, dano)
     
     def receber_dano_com_defesa(self, dano):
@@ -56,6 +61,8 @@ class Goblin(Inimigo):
     Inimigo fraco, comum no início do jogo.
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         """Inicializa um Goblin."""
         super().__init__("Goblin", 14, 3, xp_recompensa=30)
@@ -67,6 +74,10 @@ class Lobo(Inimigo):
     Inimigo de nível médio, mais rápido e agressivo.
     """
     
+    __slots__ = ()
+    
+    CHANCE_ATAQUE_DUPLO = 0.2
+    
     def __init__(self):
         """Inicializa um Lobo."""
         super().__init__("Lobo", 25, 5, xp_recompensa=50)
@@ -81,7 +92,7 @@ class Lobo(Inimigo):
         """
         dano_base = super().atacar()
         # 20% de chance de ataque duplo
-        if random.random() < 0.2:
+        if (self.rng or random).random() < self.CHANCE_ATAQUE_DUPLO:
             return dano_base + super().atacar()
         return dano_base
 
@@ -91,6 +102,8 @@ class Orc(Inimigo):
     Inimigo forte, com muita vida e defesa.
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         """Inicializa um Orc."""
         super().__init__("Orc", 40, 7, xp_recompensa=80)
@@ -102,6 +115,16 @@ class Chefao(Inimigo):
     Inimigo poderoso, com habilidades especiais.
     """
     
+    __slots__ = ("mana", "mana_maxima")
+    
+    # Ataque especial: 30% de chance, custa 20 de mana e causa 200% a 250% do dano base
+    CHANCE_ESPECIAL = 0.3
+    CUSTO_ESPECIAL = 20
+    FATOR_ESPECIAL = (2.0, 2.5)
+    # Regeneração: 20% de chance de curar 5 de HP a cada turno
+    CHANCE_REGENERACAO = 0.2
+    CURA_REGENERACAO = 5
+    
     def __init__(self):
         """Inicializa um Chefão."""
         super().__init__("Chefão", 80, 10, xp_recompensa=200)
@@ -117,8 +140,8 @@ class Chefao(Inimigo):
             int: Dano causado pelo ataque
         """
         # 30% de chance de usar habilidade especial
-        if random.random() < 0.3 and self.mana >= 20:
-            self.mana -= 20
+        if (self.rng or random).random() < self.CHANCE_ESPECIAL and self.mana >= self.CUSTO_ESPECIAL:
+            self.mana -= self.CUSTO_ESPECIAL
             return self.ataque_especial()
         return super().atacar()
     
@@ -130,13 +153,13 @@ class Chefao(Inimigo):
             int: Dano causado pelo ataque especial
         """
         # Ataque especial causa 200% a 250% do dano base
-        dano = int(self.dano * random.uniform(2.0, 2.5))
+        dano = int(self.dano * (self.rng or random).uniform(*self.FATOR_ESPECIAL))
         return max(1, dano)
     
     def regenerar(self):
         """
         Regenera um pouco de HP a cada turno (apenas chefões).
         """
-        if random.random() < 0.2:  # 20% de chance
-            self.curar(5)
+        if (self.rng or random).random() < self.CHANCE_REGENERACAO:  # 20% de chance
+            self.curar(self.CURA_REGENERACAO)
 
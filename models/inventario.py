@@ -1,4 +1,6 @@
 class Item:
+    __slots__ = ("nome", "descricao")
+
     def __init__(self, nome, descricao):
         self.nome = nome
         self.descricao = descricao
@@ -7,34 +9,112 @@ class Item:
         return self.nome
 
 class Inventario:
-    def __init__(self):
-        self.itens = []
+    """
+    Inventário que empilha os itens pelo nome, guardando a quantidade de cada
+    um. Adicionar, usar e consultar um item custam O(1) independentemente de
+    quantos itens existem, e a ordem de inserção é mantida para exibição.
+
+    Segue a convenção de collections.Counter: len() e a iteração percorrem
+    os tipos de item (pilhas); total() retorna o número de unidades.
+    """
+    __slots__ = ("_pilhas", "_total")
+
+    def __init__(self, itens=()):
+        # nome -> [item, quantidade]
+        self._pilhas = {}
+        self._total = 0
+        for item in itens:
+            self.adicionar_item(item)
+
+    @staticmethod
+    def _nome(item):
+        return item.nome if hasattr(item, "nome") else str(item)
+
+    def adicionar_item(self, item, quantidade=1):
+        nome = self._nome(item)
+        pilha = self._pilhas.get(nome)
+        if pilha is None:
+            self._pilhas[nome] = [item, quantidade]
+        else:
+            pilha[1] += quantidade
+        self._total += quantidade
+
+    def remover_item(self, item, quantidade=1):
+        """Remove unidades de um item. Retorna False se não houver o suficiente."""
+        nome = self._nome(item)
+        pilha = self._pilhas.get(nome)
+        if pilha is None or pilha[1] < quantidade:
+            return False
+        pilha[1] -= quantidade
+        if not pilha[1]:
+            del self._pilhas[nome]
+        self._total -= quantidade
+        return True
+
+    def quantidade(self, item):
+        pilha = self._pilhas.get(self._nome(item))
+        return pilha[1] if pilha else 0
+
+    def total(self):
+        return self._total
 
-    def adicionar_item(self, item):
-        self.itens.append(item)
+    def pilhas(self):
+        """Retorna pares (item, quantidade) na ordem de inserção."""
+        return [(item, quantidade) for item, quantidade in self._pilhas.values()]
+
+    def descrever(self):
+        """Texto curto com todas as pilhas, ex.: 'poção x3, elixir'."""
+        return ", ".join(f"{nome} x{quantidade}" if quantidade > 1 else nome
+                         for nome, (_, quantidade) in self._pilhas.items())
+
+    def __contains__(self, item):
+        return self._nome(item) in self._pilhas
+
+    def __len__(self):
+        return len(self._pilhas)
+
+    def __iter__(self):
+        return (item for item, _ in self._pilhas.values())
+
+    def __getitem__(self, indice):
+        return self.pilhas()[indice][0]
+
+    def to_dict(self):
+        """Serializa de forma compacta como {nome: quantidade}."""
+        return {nome: quantidade for nome, (_, quantidade) in self._pilhas.items()}
+
+    @classmethod
+    def from_dict(cls, dados):
+        """Cria o inventário a partir de {nome: quantidade} ou de uma lista de nomes (saves antigos)."""
+        from models.catalogo import CATALOGO
+
+        inventario = cls()
+        if isinstance(dados, dict):
+            for nome, quantidade in dados.items():
+                if quantidade > 0:
+                    inventario.adicionar_item(CATALOGO.obter(nome), quantidade)
+        else:
+            for nome in dados:
+                inventario.adicionar_item(CATALOGO.obter(nome))
+        return inventario
 
     def listar_itens(self):
-        if not self.itens:
+        if not self._pilhas:
             print("(vazio)")
             return
-        for i, item in enumerate(self.itens, start=1):
+        for i, (item, quantidade) in enumerate(self.pilhas(), start=1):
             # Suporta tanto objetos Item quanto strings simples
-            if hasattr(item, "nome"):
-                nome = item.nome
-                descricao = getattr(item, "descricao", "")
-            else:
-                nome = str(item)
-                descricao = ""
-            print(f"{i}. {nome} - {descricao}")
+            descricao = getattr(item, "descricao", "")
+            print(f"{i}. {self._nome(item)} x{quantidade} - {descricao}")
 
     def usar_item(self, indice):
-        if indice < 1 or indice > len(self.itens):
+        if indice < 1 or indice > len(self._pilhas):
             print("Índice inválido!")
             return
-        item = self.itens.pop(indice - 1)
+        item = self[indice - 1]
+        self.remover_item(item)
         # Imprime nome adequadamente
-        nome = item.nome if hasattr(item, "nome") else str(item)
-        print(f"Você usou o item {nome}!")
+        print(f"Você usou o item {self._nome(item)}!")
 
 def main():
     inventario = Inventario()
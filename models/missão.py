@@ -3,7 +3,13 @@ Módulo que define a classe Missao e o sistema de combate detalhado.
 """
 
 import random
+from bisect import bisect_right
 from models.inimigo import Inimigo, Goblin, Lobo, Orc, Chefao
+from models.combate import Combate, CombateInstrumentado
+from models.catalogo import CATALOGO
+from models.probabilidades import calcular_probabilidades
+from utils.aleatorio import GeradorAleatorio
+from utils.cache import CacheLRU
 
 
 class Missao:
@@ -19,20 +25,34 @@ class Missao:
         "difícil": [Orc, Chefao]
     }
     
-    # Dicionário de itens possíveis como recompensa
-    ITENS_POSSIVEIS = ["poção", "poção de mana", "elixir", "cristal"]
+    # Itens possíveis como recompensa (definidos no catálogo de itens)
+    ITENS_POSSIVEIS = CATALOGO.nomes_recompensa()
     
-    def __init__(self, nome, dificuldade="médio"):
+    # Distribuições de desfechos já calculadas para o modo automático,
+    # por (classe, atributos do personagem, inimigo, política)
+    CACHE_AUTOMATICO = CacheLRU(capacidade=512)
+    
+    def __init__(self, nome, dificuldade="médio", semente=None, rng=None):
         """
         Inicializa uma missão.
         
         Args:
             nome (str): Nome da missão
             dificuldade (str): Nível de dificuldade ("fácil", "médio", "difícil")
+            semente (int, optional): Semente de um GeradorAleatorio próprio da
+                missão: o inimigo, as recompensas e o combate ficam reproduzíveis
+                (ver utils.replay)
+            rng (random.Random, optional): Gerador da missão (tem precedência
+                sobre a semente). Sem nenhum dos dois, usa o módulo random global
         """
         self.nome = nome
         self.dificuldade = dificuldade
+        self.semente = semente
+        if rng is None and semente is not None:
+            rng = GeradorAleatorio(semente)
+        self.rng = rng
         self.inimigo = self._gerar_inimigo()
+        self.inimigo.rng = rng
         self.xp_recompensa = self.inimigo.xp_recompensa
         self.itens_recompensa = self._gerar_recompensas()
     
@@ -44,7 +64,7 @@ class Missao:
             Inimigo: Instância de um inimigo
         """
         tipos = self.TIPOS_INIMIGOS.get(self.dificuldade, self.TIPOS_INIMIGOS["médio"])
-        classe_inimigo = random.choice(tipos)
+        classe_inimigo = (self.rng or random).choice(tipos)
         return classe_inimigo()
     
     def _gerar_recompensas(self):
@@ -54,194 +74,285 @@ class Missao:
         Returns:
             list: Lista de itens obtidos
         """
+        rng = self.rng or random
         itens = []
         # Chance de obter 1-2 itens
-        num_itens = random.randint(1, 2)
+        num_itens = rng.randint(1, 2)
         for _ in range(num_itens):
-            item = random.choice(self.ITENS_POSSIVEIS)
+            item = rng.choice(self.ITENS_POSSIVEIS)
             itens.append(item)
         return itens
     
-    def executar_combate(self, personagem, logger=None):
+    def executar_combate(self, personagem, logger=None, saida=print, metricas=None):
         """
         Executa o combate detalhado entre o personagem e o inimigo.
+        As ações são escolhidas pelo jogador no console.
         
         Args:
             personagem: Instância do personagem do jogador
             logger: Instância do logger para registrar eventos (opcional)
+            saida (callable): Função usada para exibir mensagens
+            metricas (MetricasCombate, optional): Métricas alimentadas pelo combate
             
         Returns:
             dict: Resultado do combate com informações sobre vitória/derrota
         """
-        print(f"\n=== Missão: {self.nome} ===")
-        print(f"Você encontrou um {self.inimigo.nome}!")
-        print(f"HP do inimigo: {self.inimigo.hp}")
-        
-        if logger:
-            logger.registrar(f"Iniciou missão: {self.nome} contra {self.inimigo.nome}")
-        
-        turno = 1
-        hp_inicial_personagem = personagem.hp
+        politica = lambda personagem, inimigo: self._escolher_acao(personagem, inimigo, saida)
+        return self.resolver(personagem, politica, logger, saida=saida, metricas=metricas)
+    
+    def resolver(self, personagem, politica, logger=None, saida=None, metricas=None):
+        """
+        Executa o combate com as ações escolhidas por uma política.
+        Sem `saida`, nada é exibido no console (modo headless).
         
-        while personagem.esta_vivo() and self.inimigo.esta_vivo():
-            print(f"\n--- Turno {turno} ---")
-            
-            # Turno do jogador
-            acao = self._escolher_acao(personagem)
-            
-            if acao == "atacar":
-                dano = personagem.atacar()
-                dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
-                print(f"{personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
-                print(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
-                
-                if logger:
-                    logger.registrar(f"Turno {turno}: {personagem.nome} causou {dano_aplicado} de dano")
-            
-            elif acao == "habilidade":
-                dano = personagem.habilidade_especial()
-                if dano > 0:
-                    print(f"{personagem.nome} usa habilidade especial!")
-                    dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
-                    print(f"{personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
-                    print(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
-                    
-                    if logger:
-                        logger.registrar(f"Turno {turno}: {personagem.nome} usou habilidade especial causando {dano_aplicado} de dano")
-                else:
-                    print(f"{personagem.nome} não tem mana suficiente para usar habilidade especial!")
-                    # Se não tem mana, ataca normalmente
-                    dano = personagem.atacar()
-                    dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
-                    print(f"{personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
-                    print(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
-            
-            elif acao == "item":
-                if personagem.inventario:
-                    # Lista itens e permite escolher qual usar
-                    while True:
-                        print("\nItens disponíveis:")
-                        for i, it in enumerate(personagem.inventario, start=1):
-                            print(f"[{i}] {it}")
-                        escolha_item = input("Digite o número do item que deseja usar (0 para cancelar): ").strip()
-                        if not escolha_item.isdigit():
-                            print("Entrada inválida! Digite um número.")
-                            continue
-                        escolha_num = int(escolha_item)
-                        if escolha_num == 0:
-                            print("Ação de item cancelada. Realizando ataque normal.")
-                            dano = personagem.atacar()
-                            dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
-                            print(f"{personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
-                            print(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
-                            break
-                        if escolha_num < 1 or escolha_num > len(personagem.inventario):
-                            print("Índice inválido! Tente novamente.")
-                            continue
-                        item = personagem.inventario[escolha_num - 1]
-                        if personagem.usar_item(item):
-                            print(f"{personagem.nome} usou {item}!")
-                            print(f"{personagem.nome} agora tem {personagem.hp} HP.")
-                        else:
-                            print(f"Não foi possível usar {item}.")
-                        break
-                else:
-                    print(f"{personagem.nome} não tem itens no inventário!")
-                    # Se não tem itens, ataca normalmente
-                    dano = personagem.atacar()
-                    dano_aplicado = self.inimigo.receber_dano_com_defesa(dano)
-                    print(f"{personagem.nome} causa {dano_aplicado} de dano em {self.inimigo.nome}!")
-                    print(f"{self.inimigo.nome} agora tem {self.inimigo.hp} HP.")
-            
-            # Verifica se o inimigo foi derrotado
-            if not self.inimigo.esta_vivo():
-                break
-            
-            # Regeneração do chefão (se aplicável)
-            if hasattr(self.inimigo, 'regenerar'):
-                self.inimigo.regenerar()
-            
-            # Turno do inimigo
-            dano_inimigo = self.inimigo.atacar()
-            dano_aplicado = personagem.receber_dano(max(1, dano_inimigo - personagem.defesa))
-            print(f"{self.inimigo.nome} causa {dano_aplicado} de dano em {personagem.nome}!")
-            print(f"{personagem.nome} agora tem {personagem.hp} HP.")
+        Args:
+            personagem: Instância do personagem do jogador
+            politica (callable): Função politica(personagem, inimigo) que escolhe a ação
+            logger: Instância do logger para registrar eventos (opcional)
+            saida (callable, optional): Função usada para exibir mensagens
+            metricas (MetricasCombate, optional): Métricas alimentadas pelo combate
             
-            if logger:
-                logger.registrar(f"Turno {turno}: {self.inimigo.nome} causou {dano_aplicado} de dano")
+        Returns:
+            dict: Resultado do combate (vitória, turnos, dano, críticos, itens usados...)
+        """
+        return self._novo_combate(personagem, logger, saida, metricas).executar(politica)
+    
+    def _novo_combate(self, personagem, logger=None, saida=None, metricas=None):
+        """
+        Cria o motor de combate da missão: o instrumentado só quando há
+        métricas, para que sem elas o combate não pague nenhuma medição.
+        """
+        if metricas is None:
+            return Combate(self, personagem, logger=logger, saida=saida)
+        return CombateInstrumentado(self, personagem, metricas, logger=logger, saida=saida)
+    
+    def resolver_automaticamente(self, personagem, logger=None, politica="atacar", saida=None, cache=None, metricas=None):
+        """
+        Resolve a missão instantaneamente, sorteando o desfecho a partir da
+        distribuição exata de resultados do combate (ver models.probabilidades).
+        O resultado tem a mesma distribuição que jogar todos os turnos com a
+        mesma política, mas custa uma consulta ao cache e um único sorteio.
+        
+        Args:
+            personagem: Instância do personagem do jogador
+            logger: Instância do logger para registrar eventos (opcional)
+            politica (str): "atacar" ou "habilidade"
+            saida (callable, optional): Função usada para exibir mensagens
+            cache (CacheLRU, optional): Cache de distribuições (padrão: CACHE_AUTOMATICO)
+            metricas (MetricasCombate, optional): Métricas alimentadas pelo combate
             
-            turno += 1
+        Returns:
+            dict: Resultado no formato de resolver(); turnos, dano e críticos ficam None
+        """
+        cache = cache if cache is not None else self.CACHE_AUTOMATICO
+        tabela = cache.obter(self._chave_automatica(personagem, politica),
+                             lambda: self._tabela_desfechos(personagem, politica))
+        return self._sortear_desfecho(personagem, tabela, logger, saida, metricas)
+    
+    async def resolver_automaticamente_async(self, personagem, logger=None, politica="atacar", saida=None,
+                                             cache=None, metricas=None):
+        """
+        Versão assíncrona de resolver_automaticamente: se a distribuição de
+        desfechos não está no cache, ela é calculada em uma thread auxiliar
+        (pode levar centenas de milissegundos), sem bloquear o loop de
+        eventos. O cache e o sorteio são usados só no loop.
+        
+        Args e retorno: os de resolver_automaticamente
+        """
+        import asyncio
         
-        # Resultado final
-        print(f"\n=== Resultado da Missão ===")
+        cache = cache if cache is not None else self.CACHE_AUTOMATICO
+        chave = self._chave_automatica(personagem, politica)
+        tabela = None
+        if chave not in cache:
+            tabela = await asyncio.to_thread(self._tabela_desfechos, personagem, politica)
+        # Se outra sessão guardou a mesma chave enquanto isso, usa a do cache
+        tabela = cache.obter(chave, lambda: tabela)
+        return self._sortear_desfecho(personagem, tabela, logger, saida, metricas)
+    
+    def _chave_automatica(self, personagem, politica):
+        """Chave do cache de distribuições do modo automático."""
+        return (
+            personagem.classe,
+            (personagem.nivel, personagem.hp, personagem.hp_maximo, personagem.mana,
+             personagem.mana_maxima, personagem.dano_base, personagem.defesa),
+            type(self.inimigo).__name__,
+            politica
+        )
+    
+    def _sortear_desfecho(self, personagem, tabela, logger, saida, metricas):
+        """Sorteia um desfecho da tabela e encerra o combate com ele."""
+        desfechos, acumuladas = tabela
+        sorteio = (self.rng or random).random() * acumuladas[-1]
+        vitoria, hp, mana = desfechos[min(bisect_right(acumuladas, sorteio), len(desfechos) - 1)]
         
-        if personagem.esta_vivo():
-            print(f"{personagem.nome} venceu o combate!")
-            print(f"XP ganho: {self.xp_recompensa}")
-            
-            subiu_nivel = personagem.ganhar_xp(self.xp_recompensa)
-            if subiu_nivel:
-                print(f"\n🎉 {personagem.nome} subiu para o nível {personagem.nivel}!")
-                print(f"HP máximo aumentou para {personagem.hp_maximo}!")
-            
-            if self.itens_recompensa:
-                print(f"Itens obtidos: {', '.join(self.itens_recompensa)}")
-                for item in self.itens_recompensa:
-                    personagem.adicionar_item(item)
-            
-            if logger:
-                logger.registrar(f"Missão concluída: {personagem.nome} venceu {self.inimigo.nome}")
-                logger.registrar(f"XP ganho: {self.xp_recompensa}, Itens: {', '.join(self.itens_recompensa)}")
-            
-            return {
-                "vitoria": True,
-                "xp": self.xp_recompensa,
-                "itens": self.itens_recompensa,
-                "subiu_nivel": subiu_nivel
-            }
-        else:
-            print(f"{personagem.nome} foi derrotado!")
-            print(f"Você perdeu a missão.")
-            
-            # Restaura HP inicial em caso de derrota (opcional - pode remover)
-            personagem.hp = hp_inicial_personagem
-            
-            if logger:
-                logger.registrar(f"Missão falhou: {personagem.nome} foi derrotado por {self.inimigo.nome}")
+        combate = self._novo_combate(personagem, logger, saida, metricas)
+        combate.iniciar()
+        return combate.encerrar_com_desfecho(vitoria, hp, mana)
+    
+    def _tabela_desfechos(self, personagem, politica):
+        """
+        Monta a tabela de sorteio dos desfechos: a lista de desfechos e suas
+        probabilidades acumuladas.
+        """
+        distribuicao = calcular_probabilidades(personagem, self.inimigo, politica)["desfechos"]
+        desfechos, acumuladas, total = [], [], 0.0
+        for desfecho, probabilidade in distribuicao.items():
+            total += probabilidade
+            desfechos.append(desfecho)
+            acumuladas.append(total)
+        return desfechos, acumuladas
+    
+    async def executar_combate_async(self, personagem, ler, logger=None, saida=print, animacao=True, escrever=None,
+                                     metricas=None):
+        """
+        Versão assíncrona de executar_combate: as ações são lidas com `ler`
+        (uma corrotina) e a animação de crítico roda como tarefa em segundo
+        plano, sem bloquear a entrada nem o combate.
+        
+        Args:
+            personagem: Instância do personagem do jogador
+            ler (callable): Corrotina ler(prompt) que retorna a linha digitada
+            logger: Instância do logger para registrar eventos (opcional)
+            saida (callable): Função usada para exibir mensagens
+            animacao (bool): Se True, exibe a animação nos acertos críticos
+            escrever (callable, optional): Destino dos frames da animação (padrão: stdout)
+            metricas (MetricasCombate, optional): Métricas alimentadas pelo combate
             
-            return {
-                "vitoria": False,
-                "xp": 0,
-                "itens": [],
-                "subiu_nivel": False
-            }
+        Returns:
+            dict: Resultado do combate com informações sobre vitória/derrota
+        """
+        import asyncio
+        from utils import animacao_critico_async
+        
+        combate = self._novo_combate(personagem, logger, saida, metricas)
+        animacoes = set()
+        
+        combate.iniciar()
+        try:
+            while not combate.finalizado:
+                combate.iniciar_turno()
+                acao = await self._escolher_acao_async(personagem, ler, saida)
+                criticos = combate.criticos
+                combate.executar_turno(acao)
+                if animacao and combate.criticos > criticos:
+                    # Guarda a referência para a tarefa não ser coletada antes de terminar
+                    tarefa = asyncio.create_task(animacao_critico_async(escrever=escrever))
+                    animacoes.add(tarefa)
+                    tarefa.add_done_callback(animacoes.discard)
+        finally:
+            # A leitura pode falhar (conexão encerrada) no meio do combate
+            combate.restaurar_rng()
+        
+        if animacoes:
+            await asyncio.gather(*animacoes)
+        return combate.resultado
     
-    def _escolher_acao(self, personagem):
+    def _escolher_acao(self, personagem, inimigo=None, saida=print):
         """
         Permite ao jogador escolher uma ação durante o combate.
         
         Args:
             personagem: Instância do personagem
+            inimigo: Inimigo enfrentado (não utilizado, presente para seguir a assinatura de política)
+            saida (callable): Função usada para exibir mensagens
             
         Returns:
-            str: Ação escolhida ("atacar", "habilidade", "item")
+            str | tuple: Ação escolhida ("atacar", "habilidade" ou ("item", item))
         """
         while True:
-            print(f"\nEscolha sua ação:")
-            print(f"[1] Atacar")
-            print(f"[2] Habilidade Especial (Mana: {personagem.mana}/{personagem.mana_maxima})")
-            if personagem.inventario:
-                inventario_str = ', '.join(it.nome if hasattr(it, 'nome') else str(it) for it in personagem.inventario)
-                print(f"[3] Usar Item (Inventário: {inventario_str})")
-            
-            escolha = input("> ").strip()
+            self._exibir_acoes(personagem, saida)
+            acao = self._interpretar_acao(input("> ").strip(), personagem)
+            if acao == "item":
+                return self._escolher_item(personagem, saida)
+            if acao:
+                return acao
+            saida("Opção inválida! Tente novamente.")
+    
+    async def _escolher_acao_async(self, personagem, ler, saida=print):
+        """Versão assíncrona de _escolher_acao (entrada lida com `ler`)."""
+        while True:
+            self._exibir_acoes(personagem, saida)
+            acao = self._interpretar_acao((await ler("> ")).strip(), personagem)
+            if acao == "item":
+                return await self._escolher_item_async(personagem, ler, saida)
+            if acao:
+                return acao
+            saida("Opção inválida! Tente novamente.")
+    
+    def _exibir_acoes(self, personagem, saida=print):
+        """Exibe as ações disponíveis no turno."""
+        saida(f"\nEscolha sua ação:")
+        saida(f"[1] Atacar")
+        saida(f"[2] Habilidade Especial (Mana: {personagem.mana}/{personagem.mana_maxima})")
+        if personagem.inventario:
+            saida(f"[3] Usar Item (Inventário: {personagem.inventario.descrever()})")
+    
+    def _interpretar_acao(self, escolha, personagem):
+        """
+        Converte a opção digitada em uma ação.
+        
+        Returns:
+            str | None: "atacar", "habilidade", "item" (escolher o item) ou None se inválida
+        """
+        if escolha == "1":
+            return "atacar"
+        elif escolha == "2":
+            return "habilidade"
+        elif escolha == "3" and personagem.inventario:
+            return "item"
+        return None
+    
+    def _escolher_item(self, personagem, saida=print):
+        """
+        Lista os itens do inventário e permite escolher qual usar.
+        
+        Args:
+            personagem: Instância do personagem
+            saida (callable): Função usada para exibir mensagens
             
-            if escolha == "1":
-                return "atacar"
-            elif escolha == "2":
-                return "habilidade"
-            elif escolha == "3" and personagem.inventario:
-                return "item"
-            else:
-                print("Opção inválida! Tente novamente.")
-
+        Returns:
+            str | tuple: ("item", item) ou "atacar" se a escolha for cancelada
+        """
+        pilhas = personagem.inventario.pilhas()
+        while True:
+            self._exibir_itens(pilhas, saida)
+            escolha_item = input("Digite o número do item que deseja usar (0 para cancelar): ").strip()
+            acao = self._interpretar_item(escolha_item, pilhas, saida)
+            if acao:
+                return acao
+    
+    async def _escolher_item_async(self, personagem, ler, saida=print):
+        """Versão assíncrona de _escolher_item (entrada lida com `ler`)."""
+        pilhas = personagem.inventario.pilhas()
+        while True:
+            self._exibir_itens(pilhas, saida)
+            escolha_item = (await ler("Digite o número do item que deseja usar (0 para cancelar): ")).strip()
+            acao = self._interpretar_item(escolha_item, pilhas, saida)
+            if acao:
+                return acao
+    
+    def _exibir_itens(self, pilhas, saida=print):
+        """Lista as pilhas de itens disponíveis."""
+        saida("\nItens disponíveis:")
+        for i, (it, quantidade) in enumerate(pilhas, start=1):
+            saida(f"[{i}] {it} (x{quantidade})")
+    
+    def _interpretar_item(self, escolha_item, pilhas, saida=print):
+        """
+        Converte o número digitado em uma ação de item.
+        
+        Returns:
+            str | tuple | None: ("item", item), "atacar" se cancelada ou None se inválida
+        """
+        if not escolha_item.isdigit():
+            saida("Entrada inválida! Digite um número.")
+            return None
+        escolha_num = int(escolha_item)
+        if escolha_num == 0:
+            saida("Ação de item cancelada. Realizando ataque normal.")
+            return "atacar"
+        if escolha_num < 1 or escolha_num > len(pilhas):
+            saida("Índice inválido! Tente novamente.")
+            return None
+        return ("item", pilhas[escolha_num - 1][0])
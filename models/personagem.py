@@ -3,7 +3,8 @@ Módulo que define a classe Personagem e suas funcionalidades.
 """
 
 from models.base import Atributos
-from models.inventario import Item
+from models.catalogo import CATALOGO
+from models.inventario import Item, Inventario
 
 
 class Personagem(Atributos):
@@ -12,6 +13,21 @@ class Personagem(Atributos):
     Herda de Atributos e adiciona funcionalidades específicas do jogador.
     """
     
+    __slots__ = ("classe", "nivel", "xp", "xp_proximo_nivel", "inventario",
+                 "mana", "mana_maxima", "dano_base", "defesa", "ultimo_critico")
+    
+    CAMPOS_PERSISTENTES = Atributos.CAMPOS_PERSISTENTES | {
+        "classe", "nivel", "xp", "xp_proximo_nivel", "inventario",
+        "mana", "mana_maxima", "dano_base", "defesa"
+    }
+    
+    # Perfis de dano, sobrescritos pelas subclasses. O dano é
+    # int(dano_base * uniforme(fator_min, fator_max)), com chance de crítico.
+    # ATAQUE: (fator_min, fator_max, chance_critico, multiplicador_critico)
+    ATAQUE = (0.8, 1.2, 0.20, 1.8)
+    # HABILIDADE: (custo_mana, fator_min, fator_max, chance_critico, multiplicador_critico)
+    HABILIDADE = (20, 1.3, 1.7, 0.20, 1.8)
+    
     def __init__(self, nome, classe, hp=100, nivel=1, xp=0):
         """
         Inicializa um personagem.
@@ -28,15 +44,16 @@ class Personagem(Atributos):
         self.nivel = nivel
         self.xp = xp
         self.xp_proximo_nivel = 100
-        self.inventario = []
+        self.inventario = Inventario()
         self.mana = 50
         self.mana_maxima = 50
         self.dano_base = 10
         self.defesa = 5
+        self.ultimo_critico = False  # Indica se o último golpe foi crítico
     
     def atacar(self):
         """
-        Realiza um ataque básico.
+        Realiza um ataque básico, conforme o perfil ATAQUE da classe.
         
         Returns:
             int: Dano causado pelo ataque
@@ -44,30 +61,30 @@ class Personagem(Atributos):
         import random
         from utils import calcular_critico
 
-        # Dano varia entre 80% e 120% do dano base
-        dano = int(self.dano_base * random.uniform(0.8, 1.2))
+        fator_min, fator_max, chance, multiplicador = self.ATAQUE
+        dano = int(self.dano_base * (self.rng or random).uniform(fator_min, fator_max))
 
-        # Aplica possibilidade de crítico (padrão 20%), sem animação
-        dano_final, _ = calcular_critico(dano, chance=0.20, multiplicador=1.8, animacao=False, verbose=False)
+        # Aplica possibilidade de crítico, sem animação
+        dano_final, self.ultimo_critico = calcular_critico(dano, chance=chance, multiplicador=multiplicador, rng=self.rng, animacao=False, verbose=False)
         return max(1, dano_final)
     
     def habilidade_especial(self):
         """
-        Habilidade especial genérica (deve ser sobrescrita nas subclasses).
+        Usa a habilidade especial da classe, conforme o perfil HABILIDADE.
         
         Returns:
             int: Dano causado pela habilidade especial (0 se não tiver mana)
         """
-        # Implementação básica para personagens genéricos
-        if self.mana >= 20:
+        custo, fator_min, fator_max, chance, multiplicador = self.HABILIDADE
+        if self.mana >= custo:
             import random
             from utils import calcular_critico
 
-            self.mana -= 20
-            dano = int(self.dano_base * random.uniform(1.3, 1.7))
+            self.mana -= custo
+            dano = int(self.dano_base * (self.rng or random).uniform(fator_min, fator_max))
 
-            # Aplica crítico com chance padrão, sem animação
-            dano_final, _ = calcular_critico(dano, chance=0.20, multiplicador=1.8, animacao=False, verbose=False)
+            # Aplica crítico conforme o perfil da habilidade, sem animação
+            dano_final, self.ultimo_critico = calcular_critico(dano, chance=chance, multiplicador=multiplicador, rng=self.rng, animacao=False, verbose=False)
             return max(1, dano_final)
         return 0
     
@@ -84,21 +101,11 @@ class Personagem(Atributos):
         # Suporta receber tanto um objeto Item quanto uma string com o nome
         nome_item = item.nome if hasattr(item, "nome") else str(item)
 
-        # Procura o item no inventário (padronizamos a lista para conter objetos Item)
-        for inv_item in list(self.inventario):
-            inv_nome = inv_item.nome if hasattr(inv_item, "nome") else str(inv_item)
-            if inv_nome == nome_item:
-                if nome_item == "poção":
-                    self.curar(30)
-                    self.inventario.remove(inv_item)
-                    return True
-                elif nome_item == "poção de mana":
-                    self.mana = min(self.mana + 25, self.mana_maxima)
-                    self.inventario.remove(inv_item)
-                    return True
-                else:
-                    return False
-        return False
+        # Consulta O(1) no inventário empilhado por nome; o efeito vem do catálogo
+        if nome_item not in self.inventario or not CATALOGO.aplicar(self, nome_item):
+            return False
+        self.inventario.remover_item(nome_item)
+        return True
     
     def adicionar_item(self, item):
         """
@@ -107,18 +114,20 @@ class Personagem(Atributos):
         Args:
             item (str): Nome do item a ser adicionado
         """
-        # Se receber uma string, cria um Item simples; se já for Item, adiciona diretamente
+        # Se receber uma string, usa o Item compartilhado do catálogo; se já for Item, adiciona diretamente
         if isinstance(item, str):
-            self.inventario.append(Item(item, ""))
+            self.inventario.adicionar_item(CATALOGO.obter(item))
         elif isinstance(item, Item):
-            self.inventario.append(item)
+            self.inventario.adicionar_item(item)
         else:
             # Tenta converter para string como fallback
-            self.inventario.append(Item(str(item), ""))
+            self.inventario.adicionar_item(CATALOGO.obter(str(item)))
     
     def ganhar_xp(self, quantidade):
         """
         Adiciona experiência ao personagem e verifica se subiu de nível.
+        Um ganho de qualquer tamanho é resolvido de uma vez pela tabela de
+        XP (ver models.progressao), sem subir um nível por vez.
         
         Args:
             quantidade (int): Quantidade de XP a ser adicionada
@@ -127,19 +136,37 @@ class Personagem(Atributos):
             bool: True se o personagem subiu de nível, False caso contrário
         """
         self.xp += quantidade
-        subiu_nivel = False
+        if self.xp < self.xp_proximo_nivel:
+            return False
+        
+        from models.progressao import avancar_niveis
+        return self._aplicar_niveis(*avancar_niveis(self.xp_proximo_nivel, self.xp))
+    
+    def _aplicar_niveis(self, niveis, xp, xp_proximo_nivel):
+        """
+        Aplica o resultado de um ganho de XP: nível, XP restante, próximo
+        limite e os ganhos de atributos de `niveis` níveis.
         
-        while self.xp >= self.xp_proximo_nivel:
-            self.xp -= self.xp_proximo_nivel
-            self.nivel += 1
-            self.xp_proximo_nivel = int(self.xp_proximo_nivel * 1.5)
-            self.hp_maximo += 20
-            self.hp = self.hp_maximo  # Restaura HP ao subir de nível
-            self.dano_base += 2
-            self.defesa += 1
-            subiu_nivel = True
+        Returns:
+            bool: True se o personagem subiu de nível
+        """
+        if not niveis:
+            return False
+        from models.progressao import HP_POR_NIVEL, DANO_POR_NIVEL, DEFESA_POR_NIVEL
         
-        return subiu_nivel
+        self.xp = xp
+        self.nivel += niveis
+        self.xp_proximo_nivel = xp_proximo_nivel
+        self.hp_maximo += HP_POR_NIVEL * niveis
+        self.hp = self.hp_maximo  # Restaura HP ao subir de nível
+        self.dano_base += DANO_POR_NIVEL * niveis
+        self.defesa += DEFESA_POR_NIVEL * niveis
+        return True
+    
+    def _valores_persistentes(self):
+        valores = super()._valores_persistentes()
+        valores["inventario"] = self.inventario.to_dict()
+        return valores
     
     def to_dict(self):
         """
@@ -156,7 +183,7 @@ class Personagem(Atributos):
             "nivel": self.nivel,
             "xp": self.xp,
             "xp_proximo_nivel": self.xp_proximo_nivel,
-            "inventario": [it.nome if hasattr(it, "nome") else str(it) for it in self.inventario],
+            "inventario": self.inventario.to_dict(),
             "mana": self.mana,
             "mana_maxima": self.mana_maxima,
             "dano_base": self.dano_base,
@@ -183,9 +210,8 @@ class Personagem(Atributos):
         )
         personagem.hp_maximo = dados.get("hp_maximo", personagem.hp)
         personagem.xp_proximo_nivel = dados.get("xp_proximo_nivel", 100)
-        # Converte inventário (lista de nomes) para objetos Item
-        inventario_dados = dados.get("inventario", [])
-        personagem.inventario = [Item(nome, "") for nome in inventario_dados]
+        # Converte inventário ({nome: quantidade} ou lista de nomes) para objetos Item
+        personagem.inventario = Inventario.from_dict(dados.get("inventario", {}))
         personagem.mana = dados.get("mana", 50)
         personagem.mana_maxima = dados.get("mana_maxima", 50)
         personagem.dano_base = dados.get("dano_base", 10)
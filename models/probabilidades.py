@@ -0,0 +1,282 @@
+"""
+Módulo que calcula, de forma exata, a distribuição de resultados de um
+combate entre um personagem e um inimigo.
+
+Todas as rolagens do combate são pequenas distribuições discretas
+(int(dano * uniforme), crítico, ataque duplo do Lobo, ataque especial e
+regeneração do Chefão). Em vez de simular milhares de lutas, a massa de
+probabilidade é propagada turno a turno sobre os estados
+(HP do jogador, mana do jogador, HP do inimigo, mana do inimigo).
+Como o jogador perde ao menos 1 de HP em cada turno que o inimigo
+sobrevive, o cálculo sempre termina.
+
+O uso de itens durante o combate não é modelado: as políticas podem
+escolher apenas "atacar" ou "habilidade".
+"""
+
+import math
+from collections import defaultdict
+
+from models.inimigo import Chefao, Lobo
+
+
+def distribuicao_fator(base, fator_min, fator_max):
+    """
+    Distribuição de int(base * uniforme(fator_min, fator_max)).
+
+    Args:
+        base (int): Dano base
+        fator_min (float): Fator mínimo da rolagem
+        fator_max (float): Fator máximo da rolagem
+
+    Returns:
+        dict: {valor: probabilidade}
+    """
+    inicio, fim = base * fator_min, base * fator_max
+    if fim <= inicio:
+        return {int(inicio): 1.0}
+
+    largura = fim - inicio
+    distribuicao = {}
+    for valor in range(math.floor(inicio), math.floor(fim) + 1):
+        sobreposicao = min(fim, valor + 1) - max(inicio, valor)
+        if sobreposicao > 0:
+            distribuicao[valor] = sobreposicao / largura
+    return distribuicao
+
+
+def _somar(distribuicao, valor, probabilidade):
+    distribuicao[valor] = distribuicao.get(valor, 0.0) + probabilidade
+
+
+def distribuicao_golpe(base, fator_min, fator_max, chance, multiplicador):
+    """
+    Distribuição do dano de um golpe do jogador (ver Personagem.ATAQUE).
+
+    Returns:
+        dict: {dano: probabilidade}, já com crítico e dano mínimo de 1
+    """
+    distribuicao = {}
+    for valor, p in distribuicao_fator(base, fator_min, fator_max).items():
+        _somar(distribuicao, max(1, valor), p * (1 - chance))
+        _somar(distribuicao, max(1, int(valor * multiplicador)), p * chance)
+    return distribuicao
+
+
+def _aplicar_defesa(distribuicao, defesa):
+    """Converte dano bruto em dano aplicado: max(1, dano - defesa)."""
+    resultado = {}
+    for dano, p in distribuicao.items():
+        _somar(resultado, max(1, dano - defesa), p)
+    return resultado
+
+
+def _convolucao(a, b):
+    """Distribuição da soma de duas variáveis independentes."""
+    resultado = {}
+    for x, p in a.items():
+        for y, q in b.items():
+            _somar(resultado, x + y, p * q)
+    return resultado
+
+
+def _dano_inimigo(inimigo, defesa_jogador):
+    """
+    Monta a função que dá a distribuição do ataque do inimigo.
+
+    Returns:
+        callable: mana_inimigo -> {(dano_aplicado, nova_mana): probabilidade}
+    """
+    def golpe(fatores):
+        return _agrupar(distribuicao_fator(inimigo.dano, *fatores))
+
+    normal = golpe(inimigo.FATOR_ATAQUE)
+
+    if isinstance(inimigo, Lobo):
+        chance = inimigo.CHANCE_ATAQUE_DUPLO
+        bruto = {d: p * (1 - chance) for d, p in normal.items()}
+        for d, p in _convolucao(normal, normal).items():
+            _somar(bruto, d, p * chance)
+        aplicado = _aplicar_defesa(bruto, defesa_jogador)
+        return lambda mana: {(d, mana): p for d, p in aplicado.items()}
+
+    aplicado_normal = _aplicar_defesa(normal, defesa_jogador)
+
+    if isinstance(inimigo, Chefao):
+        chance, custo = inimigo.CHANCE_ESPECIAL, inimigo.CUSTO_ESPECIAL
+        aplicado_especial = _aplicar_defesa(golpe(inimigo.FATOR_ESPECIAL), defesa_jogador)
+
+        def ataque_chefao(mana):
+            if mana < custo:
+                return {(d, mana): p for d, p in aplicado_normal.items()}
+            resultado = {}
+            for d, p in aplicado_normal.items():
+                _somar(resultado, (d, mana), p * (1 - chance))
+            for d, p in aplicado_especial.items():
+                _somar(resultado, (d, mana - custo), p * chance)
+            return resultado
+
+        return ataque_chefao
+
+    return lambda mana: {(d, mana): p for d, p in aplicado_normal.items()}
+
+
+def _agrupar(distribuicao):
+    """Junta valores repetidos após max(1, ...) (ex.: 0 e 1 viram 1)."""
+    resultado = {}
+    for valor, p in distribuicao.items():
+        _somar(resultado, max(1, valor), p)
+    return resultado
+
+
+def _regeneracao(inimigo):
+    """Função hp_inimigo -> [(novo_hp, probabilidade)] da regeneração por turno."""
+    if not isinstance(inimigo, Chefao):
+        return lambda hp: ((hp, 1.0),)
+    chance, cura, maximo = inimigo.CHANCE_REGENERACAO, inimigo.CURA_REGENERACAO, inimigo.hp_maximo
+    return lambda hp: ((min(hp + cura, maximo), chance), (hp, 1 - chance))
+
+
+def calcular_probabilidades(personagem, inimigo, politica="atacar"):
+    """
+    Calcula a distribuição exata dos resultados do combate.
+
+    Args:
+        personagem: Personagem no estado atual (HP, mana e atributos)
+        inimigo: Inimigo no estado inicial do combate
+        politica: "atacar", "habilidade" (quando houver mana; senão ataca) ou
+            uma função politica(hp, mana, hp_inimigo, mana_inimigo) que retorna
+            "atacar" ou "habilidade"
+
+    Returns:
+        dict: Com as chaves
+            - "vitoria": probabilidade de vencer
+            - "turnos_esperados": número esperado de turnos
+            - "hp_restante_esperado": HP esperado ao fim, dado que venceu
+            - "desfechos": {(vitoria, hp_final, mana_final): probabilidade};
+              nas derrotas hp_final é 0 (antes da restauração feita pela missão)
+    """
+    custo, *perfil_habilidade = personagem.HABILIDADE
+    golpes = {
+        "atacar": _aplicar_defesa(distribuicao_golpe(personagem.dano_base, *personagem.ATAQUE), inimigo.defesa),
+        "habilidade": _aplicar_defesa(distribuicao_golpe(personagem.dano_base, *perfil_habilidade), inimigo.defesa)
+    }
+    ataque_inimigo = _dano_inimigo(inimigo, personagem.defesa)
+    regenerar = _regeneracao(inimigo)
+    inicial = (personagem.hp, personagem.mana, inimigo.hp, getattr(inimigo, "mana", 0))
+
+    if politica in ("atacar", "habilidade"):
+        desfechos, turnos_esperados = _propagar_independente(
+            inicial, politica, custo, golpes, ataque_inimigo, regenerar)
+    elif callable(politica):
+        desfechos, turnos_esperados = _propagar_conjunto(
+            inicial, politica, custo, golpes, ataque_inimigo, regenerar)
+    else:
+        raise ValueError("politica deve ser 'atacar', 'habilidade' ou uma função")
+
+    vitoria = sum(p for (venceu, _, _), p in desfechos.items() if venceu)
+    hp_vitoria = sum(p * hp for (venceu, hp, _), p in desfechos.items() if venceu)
+    return {
+        "vitoria": vitoria,
+        "turnos_esperados": turnos_esperados,
+        "hp_restante_esperado": hp_vitoria / vitoria if vitoria else 0.0,
+        "desfechos": dict(desfechos)
+    }
+
+
+def _propagar_independente(inicial, politica, custo, golpes, ataque_inimigo, regenerar):
+    """
+    Propagação para políticas fixas ("atacar" ou "habilidade").
+
+    Com a ação independente do estado, a mana do jogador segue uma sequência
+    determinística e o HP do inimigo e o par (HP do jogador, mana do inimigo)
+    evoluem de forma independente até que um dos dois caia. Basta propagar as
+    duas cadeias separadamente e combiná-las turno a turno, o que é muito mais
+    barato que percorrer o espaço de estados conjunto.
+    """
+    hp, mana, hp_inimigo, mana_inimigo = inicial
+    inimigo_vivo = {hp_inimigo: 1.0}
+    jogador_vivo = {(hp, mana_inimigo): 1.0}
+    desfechos = defaultdict(float)
+    turnos_esperados = 0.0
+
+    while inimigo_vivo and jogador_vivo:
+        massa_inimigo = sum(inimigo_vivo.values())
+        massa_jogador = sum(jogador_vivo.values())
+        turnos_esperados += massa_inimigo * massa_jogador
+
+        if politica == "habilidade" and mana >= custo:
+            distribuicao, mana = golpes["habilidade"], mana - custo
+        else:
+            distribuicao = golpes["atacar"]
+
+        # Ação do jogador e regeneração sobre a cadeia do inimigo
+        abatido = 0.0
+        proximo_inimigo = defaultdict(float)
+        for hp_atual, p in inimigo_vivo.items():
+            for dano, q in distribuicao.items():
+                if dano >= hp_atual:
+                    abatido += p * q
+                else:
+                    for hp_regenerado, r in regenerar(hp_atual - dano):
+                        proximo_inimigo[hp_regenerado] += p * q * r
+
+        if abatido:
+            for (hp_atual, _), p in jogador_vivo.items():
+                desfechos[(True, hp_atual, mana)] += p * abatido
+
+        # Ataque do inimigo sobre a cadeia do jogador
+        derrotado = 0.0
+        proximo_jogador = defaultdict(float)
+        for (hp_atual, mana_atual), p in jogador_vivo.items():
+            for (dano, nova_mana), s in ataque_inimigo(mana_atual).items():
+                if dano >= hp_atual:
+                    derrotado += p * s
+                else:
+                    proximo_jogador[(hp_atual - dano, nova_mana)] += p * s
+
+        sobrevive = massa_inimigo - abatido
+        if derrotado and sobrevive > 0:
+            desfechos[(False, 0, mana)] += sobrevive * derrotado
+
+        inimigo_vivo, jogador_vivo = proximo_inimigo, proximo_jogador
+
+    return desfechos, turnos_esperados
+
+
+def _propagar_conjunto(inicial, politica, custo, golpes, ataque_inimigo, regenerar):
+    """
+    Propagação sobre o espaço de estados conjunto, para políticas que
+    dependem do estado (HP e mana dos dois lados).
+    """
+    estados = {inicial: 1.0}
+    desfechos = defaultdict(float)
+    turnos_esperados = 0.0
+
+    while estados:
+        # Cada estado ainda em aberto inicia um novo turno
+        turnos_esperados += sum(estados.values())
+        proximos = defaultdict(float)
+
+        for (hp, mana, hp_inimigo, mana_inimigo), p in estados.items():
+            if politica(hp, mana, hp_inimigo, mana_inimigo) == "habilidade" and mana >= custo:
+                distribuicao, mana_restante = golpes["habilidade"], mana - custo
+            else:
+                distribuicao, mana_restante = golpes["atacar"], mana
+
+            respostas = ataque_inimigo(mana_inimigo)
+            for dano, q in distribuicao.items():
+                if dano >= hp_inimigo:
+                    desfechos[(True, hp, mana_restante)] += p * q
+                    continue
+                for hp_regenerado, r in regenerar(hp_inimigo - dano):
+                    pqr = p * q * r
+                    for (dano_recebido, nova_mana_inimigo), s in respostas.items():
+                        if dano_recebido >= hp:
+                            desfechos[(False, 0, mana_restante)] += pqr * s
+                        else:
+                            proximos[(hp - dano_recebido, mana_restante, hp_regenerado, nova_mana_inimigo)] += pqr * s
+
+        estados = proximos
+
+    return desfechos, turnos_esperados
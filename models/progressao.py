@@ -0,0 +1,218 @@
+"""
+Módulo com a progressão de níveis: a tabela de XP acumulada e o cálculo do
+nível alcançado por um ganho de XP de qualquer tamanho.
+
+O XP para o próximo nível começa em 100 e, a cada nível, passa a ser
+int(limite * 1.5). Em vez de subir um nível por vez, o ganho é resolvido com
+uma busca binária (bisect) nas somas acumuladas dessa sequência, com o mesmo
+arredondamento, em O(log n).
+"""
+
+from bisect import bisect_right
+from numbers import Integral
+
+from utils.cache import CacheLRU
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: acelera apenas a API em lote
+    np = None
+
+
+XP_PRIMEIRO_NIVEL = 100
+FATOR_XP = 1.5
+# Ganhos de atributos a cada nível
+HP_POR_NIVEL = 20
+DANO_POR_NIVEL = 2
+DEFESA_POR_NIVEL = 1
+
+# Maior valor representável em int64 (limite do caminho com numpy)
+_MAXIMO_INT64 = 2 ** 63 - 1
+
+
+def proximo_limite(limite):
+    """XP necessário para o nível seguinte, com o arredondamento do jogo."""
+    return int(limite * FATOR_XP)
+
+
+class TabelaXP:
+    """
+    Sequência de limites de XP a partir de um limite inicial, com as somas
+    acumuladas. A tabela cresce sob demanda.
+
+    limites[i] é o XP necessário para passar do i-ésimo nível da sequência
+    ao seguinte e acumulados[i] é a soma de limites[:i] (acumulados[0] == 0).
+    """
+
+    __slots__ = ("limites", "acumulados", "_posicoes")
+
+    def __init__(self, inicial=XP_PRIMEIRO_NIVEL):
+        """
+        Inicializa a tabela.
+
+        Args:
+            inicial (int): Primeiro limite da sequência (>= 2)
+        """
+        if inicial < 2:
+            # Com limite 1 a sequência não cresce (int(1 * 1.5) == 1)
+            raise ValueError("o limite inicial deve ser >= 2")
+        self.limites = [inicial]
+        self.acumulados = [0, inicial]
+        self._posicoes = {inicial: 0}
+
+    def _estender(self, total):
+        """Acrescenta limites até que a soma acumulada passe de `total`."""
+        limites, acumulados, posicoes = self.limites, self.acumulados, self._posicoes
+        while acumulados[-1] <= total:
+            limite = proximo_limite(limites[-1])
+            posicoes[limite] = len(limites)
+            limites.append(limite)
+            acumulados.append(acumulados[-1] + limite)
+
+    def posicao(self, limite):
+        """
+        Retorna a posição de `limite` na sequência, ou None se ele não faz
+        parte dela.
+        """
+        posicao = self._posicoes.get(limite)
+        if posicao is None and limite > self.limites[-1]:
+            # Estende até alcançar o limite (ou ultrapassá-lo, se não estiver na sequência)
+            while self.limites[-1] < limite:
+                self._estender(self.acumulados[-1])
+            posicao = self._posicoes.get(limite)
+        return posicao
+
+    def avancar(self, posicao, xp):
+        """
+        Resolve um ganho de XP a partir de uma posição da sequência.
+
+        Args:
+            posicao (int): Posição do limite atual na sequência
+            xp (int): XP atual, já somado ao ganho
+
+        Returns:
+            tuple: (níveis ganhos, XP restante, novo limite)
+        """
+        total = self.acumulados[posicao] + xp
+        self._estender(total)
+        # Maior j com acumulados[j] <= total: o XP cobre os limites até j - 1
+        destino = bisect_right(self.acumulados, total) - 1
+        return destino - posicao, total - self.acumulados[destino], self.limites[destino]
+
+
+# Tabela da sequência padrão (100, 150, 225, ...) e tabelas das sequências
+# de limites fora dela (saves antigos ou editados)
+TABELA_PADRAO = TabelaXP()
+_TABELAS = CacheLRU(capacidade=64)
+
+
+def _tabela_e_posicao(limite):
+    """Tabela que contém `limite` e a posição dele nela."""
+    posicao = TABELA_PADRAO.posicao(limite)
+    if posicao is not None:
+        return TABELA_PADRAO, posicao
+    return _TABELAS.obter(limite, lambda: TabelaXP(limite)), 0
+
+
+def avancar_niveis(limite, xp):
+    """
+    Calcula o resultado de subir de nível enquanto xp >= limite, exatamente
+    como o laço nível a nível, mas em O(log n).
+
+    Args:
+        limite (int): XP necessário para o próximo nível
+        xp (int): XP atual, já somado ao ganho
+
+    Returns:
+        tuple: (níveis ganhos, XP restante, novo limite)
+    """
+    if xp < limite:
+        return 0, xp, limite
+    if limite < 2:
+        if limite < 1:
+            raise ValueError("o XP para o próximo nível deve ser >= 1")
+        # Limite 1 não cresce: cada ponto de XP é um nível
+        return xp, 0, 1
+    tabela, posicao = _tabela_e_posicao(limite)
+    return tabela.avancar(posicao, xp)
+
+
+def _avancar_um_a_um(limites, xps):
+    """Resolve cada ganho com avancar_niveis (caminho sem numpy)."""
+    if not limites:
+        return [], [], []
+    niveis, restantes, novos = zip(*map(avancar_niveis, limites, xps))
+    return list(niveis), list(restantes), list(novos)
+
+
+def avancar_niveis_em_lote(limites, xps):
+    """
+    Versão em lote de avancar_niveis, para uma população inteira.
+
+    Com numpy, os limites da sequência padrão são resolvidos com duas buscas
+    vetorizadas (np.searchsorted) na tabela; os limites fora dela são
+    resolvidos um a um. Sem numpy, ou se os valores não cabem em int64,
+    todos são resolvidos um a um.
+
+    Args:
+        limites (sequence): XP necessário para o próximo nível de cada um
+        xps (sequence): XP atual de cada um, já somado ao ganho
+
+    Returns:
+        tuple: (níveis ganhos, XP restante, novos limites), como listas
+    """
+    limites, xps = list(limites), list(xps)
+    if np is None or not limites:
+        return _avancar_um_a_um(limites, xps)
+
+    # Estende a tabela padrão até cobrir o maior total possível: o maior
+    # XP a partir da última posição que algum limite pode ocupar
+    tabela = TABELA_PADRAO
+    tabela.posicao(max(limites))
+    tabela._estender(tabela.acumulados[len(tabela.limites) - 1] + max(max(xps), 0))
+    if tabela.acumulados[-1] > _MAXIMO_INT64 or min(xps) < -_MAXIMO_INT64:
+        return _avancar_um_a_um(limites, xps)
+
+    sequencia = np.array(tabela.limites, dtype=np.int64)
+    acumulados = np.array(tabela.acumulados, dtype=np.int64)
+    limites_np = np.array(limites, dtype=np.int64)
+    xps_np = np.array(xps, dtype=np.int64)
+
+    posicoes = np.minimum(np.searchsorted(sequencia, limites_np), len(sequencia) - 1)
+    totais = acumulados[posicoes] + xps_np
+    # Quem não alcança o próximo nível (inclusive com XP negativo) fica na mesma posição
+    destinos = np.maximum(np.searchsorted(acumulados, totais, side="right") - 1, posicoes)
+
+    niveis = (destinos - posicoes).tolist()
+    restantes = (totais - acumulados[destinos]).tolist()
+    novos = sequencia[destinos].tolist()
+    for i in np.flatnonzero(sequencia[posicoes] != limites_np).tolist():
+        niveis[i], restantes[i], novos[i] = avancar_niveis(limites[i], xps[i])
+    return niveis, restantes, novos
+
+
+def ganhar_xp_em_lote(personagens, quantidades):
+    """
+    Aplica um ganho de XP a cada personagem de uma população, com o mesmo
+    resultado de chamar personagem.ganhar_xp(quantidade) para cada um.
+
+    Args:
+        personagens (sequence): Personagens
+        quantidades (sequence | int): XP ganho por cada personagem, ou o
+            mesmo valor para todos (arrays e escalares do numpy são
+            convertidos para int, para que o save continue serializável)
+
+    Returns:
+        list: Para cada personagem, True se ele subiu de nível
+    """
+    personagens = list(personagens)
+    if isinstance(quantidades, Integral):
+        quantidades = [quantidades] * len(personagens)
+    xps = [p.xp + int(quantidade) for p, quantidade in zip(personagens, quantidades)]
+    niveis, restantes, novos = avancar_niveis_em_lote([p.xp_proximo_nivel for p in personagens], xps)
+
+    subiram = []
+    for personagem, xp, resultado in zip(personagens, xps, zip(niveis, restantes, novos)):
+        personagem.xp = xp
+        subiram.append(personagem._aplicar_niveis(*resultado))
+    return subiram
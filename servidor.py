@@ -0,0 +1,241 @@
+"""
+Servidor TCP do jogo em asyncio: cada conexão executa a sua própria sessão
+de Jogo, com entrada e saída pelo socket, um slot de save por jogador e
+um canal no log compartilhado.
+
+O protocolo é o próprio texto do jogo: o servidor envia as mensagens e
+cada prompt (terminado em ": " ou "> "); o cliente responde com uma linha.
+A primeira linha é o nome do jogador, que escolhe o slot de save.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--porta 8765] [--saves saves_servidor]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from urllib.parse import quote
+
+from jogo import Jogo
+from utils.analise_log import SketchQuantis
+from utils.logger import LoggerBufferizado
+from utils.repositorio import Repositorio
+
+
+class ConexaoEncerrada(Exception):
+    """O cliente fechou a conexão no meio da sessão."""
+
+
+def percentil(valores_ordenados, p):
+    """
+    Percentil `p` (0 a 100) de uma lista já ordenada, pelo método do posto
+    mais próximo.
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+def nome_do_slot(jogador):
+    """
+    Nome de arquivo do slot de save de um jogador: caracteres fora de
+    [A-Za-z0-9_.-] são codificados (%XX), então nomes diferentes nunca
+    caem no mesmo slot e não há como escapar do diretório de saves.
+    """
+    return quote(jogador, safe="-_.")
+
+
+class ServidorJogo:
+    """
+    Servidor que hospeda várias sessões de Jogo no mesmo processo.
+
+    A latência medida é o tempo entre receber uma linha do cliente e enviar
+    o prompt seguinte, ou seja, o tempo que o servidor levou para processar
+    aquela entrada (incluindo a espera por outras sessões no loop). Ela é
+    acumulada em microssegundos em um SketchQuantis, com memória limitada
+    por mais que o servidor fique no ar.
+    """
+
+    # Tamanho máximo do nome do jogador (em caracteres)
+    TAMANHO_MAXIMO_JOGADOR = 64
+
+    def __init__(self, host="127.0.0.1", porta=8765, diretorio_saves="saves_servidor", arquivo_log="servidor.log"):
+        """
+        Inicializa o servidor (ainda sem abrir a porta).
+
+        Args:
+            host (str): Endereço de escuta (apenas local por padrão)
+            porta (int): Porta TCP (0 escolhe uma porta livre)
+            diretorio_saves (str): Diretório dos saves, um arquivo por jogador
+            arquivo_log (str): Arquivo de log compartilhado pelas sessões
+        """
+        self.host = host
+        self.porta = porta
+        self.diretorio_saves = diretorio_saves
+        self.logger = LoggerBufferizado(arquivo_log)
+        self.sessoes_iniciadas = 0
+        self.sessoes_concluidas = 0
+        self.latencias = SketchQuantis()
+        # Jogadores com sessão aberta: cada slot só pode ter uma sessão
+        self._jogadores = set()
+        self._servidor = None
+        self._inicio_cpu = None
+        self._inicio = None
+
+    async def iniciar(self):
+        """
+        Abre a porta e começa a aceitar conexões.
+
+        Returns:
+            int: Porta em que o servidor está escutando
+        """
+        os.makedirs(self.diretorio_saves, exist_ok=True)
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta, backlog=4096)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        self._inicio_cpu = time.process_time()
+        self._inicio = time.perf_counter()
+        return self.porta
+
+    async def executar(self):
+        """Atende conexões até o servidor ser cancelado."""
+        await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self):
+        """Para de aceitar conexões e grava o log pendente."""
+        if self._servidor:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await asyncio.to_thread(self.logger.fechar)
+
+    async def _atender(self, reader, writer):
+        """Executa uma sessão de Jogo para uma conexão."""
+        self.sessoes_iniciadas += 1
+        sessao = f"sessao-{self.sessoes_iniciadas}"
+        recebido_em = None
+
+        def saida(texto=""):
+            writer.write(f"{texto}\n".encode("utf-8"))
+
+        def escrever(texto):
+            writer.write(texto.encode("utf-8"))
+
+        async def ler(prompt=""):
+            nonlocal recebido_em
+            writer.write(prompt.encode("utf-8"))
+            if recebido_em is not None:
+                self.latencias.adicionar(round((time.perf_counter() - recebido_em) * 1e6))
+            await writer.drain()
+            linha = await reader.readline()
+            if not linha:
+                raise ConexaoEncerrada(sessao)
+            recebido_em = time.perf_counter()
+            return linha.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        jogador = None
+        try:
+            jogador = await self._identificar(ler, saida)
+            if jogador is None:
+                await writer.drain()
+                return
+            jogo = Jogo(
+                saida=saida,
+                escrever=escrever,
+                repositorio=Repositorio(os.path.join(self.diretorio_saves, f"{nome_do_slot(jogador)}.json")),
+                logger=self.logger.canal(sessao)
+            )
+            jogo.logger.registrar(f"Jogador conectado: {jogador}")
+            try:
+                await jogo.executar_async(ler)
+                await writer.drain()
+                self.sessoes_concluidas += 1
+            except (ConexaoEncerrada, ConnectionError):
+                jogo.logger.registrar("Conexão encerrada pelo cliente")
+        except (ConexaoEncerrada, ConnectionError):
+            pass
+        finally:
+            self._jogadores.discard(jogador)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _identificar(self, ler, saida):
+        """
+        Pede o nome do jogador e reserva o seu slot de save.
+
+        Returns:
+            str: Nome do jogador, ou None se o slot já estiver em uso
+        """
+        jogador = ""
+        while not jogador:
+            jogador = (await ler("Nome do jogador: ")).strip()
+            if len(jogador) > self.TAMANHO_MAXIMO_JOGADOR:
+                saida(f"O nome deve ter no máximo {self.TAMANHO_MAXIMO_JOGADOR} caracteres.")
+                jogador = ""
+        if jogador in self._jogadores:
+            saida(f"O jogador {jogador} já está conectado.")
+            return None
+        self._jogadores.add(jogador)
+        return jogador
+
+    def relatorio(self):
+        """
+        Resume o desempenho do servidor desde que foi iniciado.
+
+        Returns:
+            dict: Sessões concluídas, tempo de CPU e de parede, sessões por
+            segundo de CPU (a capacidade de um núcleo) e percentis de latência
+            em milissegundos
+        """
+        tempo_cpu = time.process_time() - self._inicio_cpu if self._inicio_cpu is not None else 0.0
+        tempo = time.perf_counter() - self._inicio if self._inicio is not None else 0.0
+        return {
+            "sessoes": self.sessoes_concluidas,
+            "tempo_cpu": tempo_cpu,
+            "tempo": tempo,
+            "sessoes_por_segundo_cpu": self.sessoes_concluidas / tempo_cpu if tempo_cpu else 0.0,
+            "latencia_ms": {f"p{p}": (valor or 0) / 1000 for p, valor in
+                            zip((50, 90, 99), self.latencias.percentis((0.5, 0.9, 0.99)))}
+        }
+
+
+def exibir_relatorio(relatorio):
+    """Exibe o relatório do servidor no console."""
+    latencia = relatorio["latencia_ms"]
+    print(f"Sessões concluídas: {relatorio['sessoes']} em {relatorio['tempo']:.2f}s "
+          f"({relatorio['tempo_cpu']:.2f}s de CPU)")
+    print(f"Sessões por segundo de CPU (por núcleo): {relatorio['sessoes_por_segundo_cpu']:.1f}")
+    print("Latência por entrada: " + ", ".join(f"{nome} {valor:.2f}ms" for nome, valor in latencia.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor TCP do RPG OO (uma sessão de Jogo por conexão).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--saves", default="saves_servidor", help="diretório dos saves das sessões")
+    parser.add_argument("--log", default="servidor.log")
+    args = parser.parse_args()
+
+    servidor = ServidorJogo(args.host, args.porta, args.saves, args.log)
+
+    async def executar():
+        try:
+            await servidor.executar()
+        finally:
+            await servidor.encerrar()
+
+    print(f"Servidor escutando em {args.host}:{args.porta} (Ctrl+C para encerrar)")
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    exibir_relatorio(servidor.relatorio())
+
+
+if __name__ == "__main__":
+    main()
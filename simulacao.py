@@ -0,0 +1,168 @@
+"""
+Módulo de simulação Monte Carlo de missões.
+Executa muitas missões headless em paralelo, distribuindo blocos de
+missões entre processos, e agrega os resultados por classe, nível,
+dificuldade e inimigo.
+
+Uso:
+    python simulacao.py 100000 --semente 42 --processos 8
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from jogo import Jogo
+from models.classes import Guerreiro, Mago, Arqueiro
+from models.combate import politica_atacar, politica_habilidade, politica_cautelosa
+from models.missão import Missao
+from utils.aleatorio import GeradorAleatorio
+
+
+CLASSES = {"Guerreiro": Guerreiro, "Mago": Mago, "Arqueiro": Arqueiro}
+
+POLITICAS = {
+    "atacar": politica_atacar,
+    "habilidade": politica_habilidade,
+    "cautelosa": politica_cautelosa
+}
+
+# Ordem dos contadores agregados em cada chave
+CAMPOS = ("lutas", "vitorias", "turnos", "dano_causado", "dano_recebido", "criticos", "itens_usados")
+
+
+def criar_personagem(classe, nivel):
+    """
+    Cria um personagem da classe indicada já no nível desejado.
+
+    Args:
+        classe (str): Nome da classe ("Guerreiro", "Mago" ou "Arqueiro")
+        nivel (int): Nível desejado
+
+    Returns:
+        Personagem: Personagem com os atributos do nível
+    """
+    personagem = CLASSES[classe](f"{classe} {nivel}")
+    while personagem.nivel < nivel:
+        personagem.ganhar_xp(personagem.xp_proximo_nivel - personagem.xp)
+    return personagem
+
+
+def _simular_bloco(tarefa):
+    """
+    Executa um bloco de missões em um processo trabalhador.
+
+    Cada bloco usa seu próprio fluxo aleatório (GeradorAleatorio.fluxo),
+    derivado da semente global e do número do bloco, de modo que o resultado
+    não depende de qual processo executou o bloco nem de quantos processos
+    existem, e nenhum bloco toca no gerador global do módulo random.
+
+    Args:
+        tarefa (tuple): (semente, bloco, inicio, quantidade, grade, politica)
+
+    Returns:
+        dict: Contadores agregados por (classe, nivel, dificuldade, inimigo)
+    """
+    semente, bloco, inicio, quantidade, grade, politica = tarefa
+    rng = GeradorAleatorio(semente).fluxo(bloco)
+    escolher_acao = POLITICAS[politica]
+    contadores = {}
+
+    for i in range(inicio, inicio + quantidade):
+        classe, nivel, dificuldade = grade[i % len(grade)]
+        missao = Missao(rng.choice(Jogo.NOMES_MISSOES), dificuldade, rng=rng)
+        resultado = missao.resolver(criar_personagem(classe, nivel), escolher_acao)
+
+        chave = (classe, nivel, dificuldade, resultado["inimigo"])
+        linha = contadores.get(chave)
+        if linha is None:
+            linha = contadores[chave] = [0] * len(CAMPOS)
+        linha[0] += 1
+        linha[1] += resultado["vitoria"]
+        linha[2] += resultado["turnos"]
+        linha[3] += resultado["dano_causado"]
+        linha[4] += resultado["dano_recebido"]
+        linha[5] += resultado["criticos"]
+        linha[6] += len(resultado["itens_usados"])
+
+    return contadores
+
+
+def simular(n, semente=0, processos=None, tamanho_bloco=2000, classes=None,
+            niveis=range(1, 11), dificuldades=None, politica="atacar"):
+    """
+    Simula `n` missões percorrendo a grade classe x nível x dificuldade.
+
+    Args:
+        n (int): Número total de missões
+        semente (int): Semente que torna toda a execução reprodutível
+        processos (int, optional): Número de processos (padrão: todos os núcleos)
+        tamanho_bloco (int): Missões por bloco enviado a cada processo
+        classes (iterable, optional): Classes simuladas (padrão: todas)
+        niveis (iterable): Níveis simulados
+        dificuldades (iterable, optional): Dificuldades (padrão: Missao.TIPOS_INIMIGOS)
+        politica (str): Nome da política de combate (ver POLITICAS)
+
+    Returns:
+        dict: {(classe, nivel, dificuldade, inimigo): {campo: total}}
+    """
+    classes = list(classes or CLASSES)
+    dificuldades = list(dificuldades or Missao.TIPOS_INIMIGOS)
+    grade = [(c, nv, d) for c in classes for nv in niveis for d in dificuldades]
+
+    tarefas = [
+        (semente, bloco, inicio, min(tamanho_bloco, n - inicio), grade, politica)
+        for bloco, inicio in enumerate(range(0, n, tamanho_bloco))
+    ]
+
+    processos = processos or os.cpu_count() or 1
+    if processos == 1:
+        parciais = map(_simular_bloco, tarefas)
+        return _agregar(parciais)
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return _agregar(executor.map(_simular_bloco, tarefas))
+
+
+def _agregar(parciais):
+    """Soma os contadores parciais retornados pelos blocos."""
+    totais = {}
+    for parcial in parciais:
+        for chave, linha in parcial.items():
+            total = totais.get(chave)
+            if total is None:
+                totais[chave] = list(linha)
+            else:
+                for i, valor in enumerate(linha):
+                    total[i] += valor
+    return {chave: dict(zip(CAMPOS, linha)) for chave, linha in sorted(totais.items())}
+
+
+def exibir_relatorio(totais):
+    """Exibe a taxa de vitória e as médias por combinação simulada."""
+    print(f"{'Classe':<10} {'Nív':>3} {'Dificuldade':<11} {'Inimigo':<8} {'Lutas':>7} {'Vitória':>8} {'Turnos':>7} {'Dano/luta':>10}")
+    for (classe, nivel, dificuldade, inimigo), c in totais.items():
+        lutas = c["lutas"]
+        print(f"{classe:<10} {nivel:>3} {dificuldade:<11} {inimigo:<8} {lutas:>7} "
+              f"{c['vitorias'] / lutas:>8.1%} {c['turnos'] / lutas:>7.2f} {c['dano_causado'] / lutas:>10.1f}")
+
+
+def main():
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Simulação Monte Carlo de missões")
+    parser.add_argument("n", type=int, help="número de missões")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--bloco", type=int, default=2000, help="missões por bloco")
+    parser.add_argument("--nivel-max", type=int, default=10)
+    parser.add_argument("--politica", choices=sorted(POLITICAS), default="atacar")
+    args = parser.parse_args()
+
+    totais = simular(args.n, semente=args.semente, processos=args.processos,
+                     tamanho_bloco=args.bloco, niveis=range(1, args.nivel_max + 1),
+                     politica=args.politica)
+    exibir_relatorio(totais)
+
+
+if __name__ == "__main__":
+    main()
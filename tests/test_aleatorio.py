@@ -0,0 +1,83 @@
+"""Testes do gerador aleatório divisível e do seu uso no combate."""
+import asyncio
+import pickle
+import random
+
+import pytest
+
+from models.classes import Guerreiro
+from models.combate import politica_atacar
+from models.missão import Missao
+from simulacao import simular
+from utils.aleatorio import GeradorAleatorio
+
+
+def test_fluxos_reprodutiveis_e_independentes():
+    assert [GeradorAleatorio(42).fluxo(3).random() for _ in range(2)] == [GeradorAleatorio(42).fluxo(3).random()] * 2
+
+    raiz = GeradorAleatorio(42)
+    fluxos = [raiz.fluxo(i) for i in range(1000)]
+    assert len({f.getrandbits(64) for f in fluxos}) == 1000
+    # fluxo() não altera o gerador de origem; dividir() avança um valor
+    assert raiz.getstate() == GeradorAleatorio(42).getstate()
+    filho = raiz.dividir()
+    assert raiz.getstate() != GeradorAleatorio(42).getstate() and filho.random() != raiz.random()
+
+    gerador = GeradorAleatorio(7)
+    valores = [gerador.random() for _ in range(10000)]
+    assert 0.49 < sum(valores) / len(valores) < 0.51 and 0.0 <= min(valores) and max(valores) < 1.0
+
+
+def test_estado_e_serializacao():
+    gerador = GeradorAleatorio("semente")
+    assert gerador.randint(1, 100) == GeradorAleatorio("semente").randint(1, 100)
+    for _ in range(20):
+        gerador.random()
+
+    copia = pickle.loads(pickle.dumps(gerador))
+    assert [copia.random() for _ in range(30)] == [gerador.random() for _ in range(30)]
+
+
+def test_missao_com_rng_nao_usa_o_gerador_global():
+    random.seed(1)
+    estado_global = random.getstate()
+
+    resultados = []
+    for _ in range(2):
+        personagem = Guerreiro("Conan")
+        missao = Missao("Teste", "difícil", semente=123)
+        resultado = missao.resolver(personagem, politica_atacar)
+        resultados.append((type(missao.inimigo).__name__, missao.itens_recompensa, resultado["turnos"],
+                           resultado["dano_recebido"], personagem.hp))
+        assert personagem.rng is None  # o gerador da missão é desassociado ao fim
+
+    assert random.getstate() == estado_global
+    assert resultados[0] == resultados[1]
+
+
+def test_simulacao_nao_depende_do_gerador_global():
+    random.seed(1)
+    a = simular(300, semente=9, processos=1, tamanho_bloco=100, niveis=range(1, 3))
+    random.seed(2)
+    b = simular(300, semente=9, processos=1, tamanho_bloco=100, niveis=range(1, 3))
+    assert a == b
+
+
+def test_combate_interrompido_devolve_o_gerador_do_personagem():
+    personagem = Guerreiro("Conan")
+    original = personagem.rng
+
+    def politica_que_falha(personagem, inimigo):
+        raise EOFError
+
+    with pytest.raises(EOFError):
+        Missao("Teste", "fácil", semente=5).resolver(personagem, politica_que_falha)
+    assert personagem.rng is original
+
+    async def ler(prompt):
+        raise ConnectionResetError
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(Missao("Teste", "fácil", semente=5).executar_combate_async(
+            personagem, ler, saida=lambda *args: None, animacao=False))
+    assert personagem.rng is original
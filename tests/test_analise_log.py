@@ -0,0 +1,70 @@
+"""Testes da análise de logs em fluxo contínuo."""
+import gzip
+import random
+
+import pytest
+
+from models.classes import Arqueiro, Guerreiro, Mago
+from models.combate import politica_atacar
+from models.missão import Missao
+from utils.analise_log import SketchQuantis, analisar_log, main
+from utils.logger import Logger
+
+
+def test_sketch_exato_para_inteiros_e_aproximado_para_os_demais():
+    rng = random.Random(7)
+    inteiros = [rng.randint(0, 300) for _ in range(5000)]
+    sketch = SketchQuantis()
+    for valor in inteiros:
+        sketch.adicionar(valor)
+    ordenados = sorted(inteiros)
+    assert sketch.percentis([0.5, 0.9, 0.99]) == [ordenados[int(p * 4999)] for p in (0.5, 0.9, 0.99)]
+
+    grandes = [rng.lognormvariate(10, 2) for _ in range(5000)]
+    sketch = SketchQuantis(erro=0.01)
+    for valor in grandes:
+        sketch.adicionar(valor)
+    ordenados = sorted(grandes)
+    for p, estimado in zip((0.5, 0.99), sketch.percentis([0.5, 0.99])):
+        assert estimado == pytest.approx(ordenados[int(p * 4999)], rel=0.01)
+    dados = sketch.to_dict()
+    assert dados["min"] == ordenados[0] and dados["max"] == ordenados[-1]
+
+
+def test_relatorio_confere_com_os_combates(tmp_path, capsys):
+    caminho = str(tmp_path / "jogo.log")
+    logger = Logger(caminho)
+    resultados = []
+    tipos = list(Missao.TIPOS_INIMIGOS)
+    for semente in range(60):
+        classe = (Guerreiro, Mago, Arqueiro)[semente % 3]
+        missao = Missao("Teste", tipos[semente % len(tipos)], semente=semente)
+        resultados.append(missao.resolver(classe("Heroi"), politica_atacar, logger=logger))
+
+    # Parte do log como segmento rotacionado e comprimido, e uma missão em um canal
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    meio = conteudo.index(b"\n", len(conteudo) // 2) + 1
+    with gzip.open(caminho + ".20260101-000000-000000.gz", "wb") as f:
+        f.write(conteudo[:meio])
+    with open(caminho, "wb") as f:
+        f.write(conteudo[meio:])
+    canal = logger.canal("sessao-1")
+    canal.registrar("Iniciou missão: Extra contra Goblin")
+    canal.registrar("Turno 1: Heroi causou 40 de dano (crítico)")
+    canal.registrar("Missão concluída: Heroi venceu Goblin")
+
+    relatorio = analisar_log(caminho)
+    assert relatorio == analisar_log(caminho, usar_mmap=False)
+
+    vitorias = sum(r["vitoria"] for r in resultados)
+    assert sum(i["missoes"] for i in relatorio["inimigos"].values()) == len(resultados) + 1
+    assert sum(i["vitorias"] for i in relatorio["inimigos"].values()) == vitorias + 1
+    assert relatorio["criticos"] == sum(r["criticos"] for r in resultados) + 1
+    assert relatorio["xp_total"] == sum(r["xp"] for r in resultados)
+    assert relatorio["turnos_por_missao"]["contagem"] == len(resultados) + 1
+    assert relatorio["dano_jogador_por_turno"]["max"] == 40
+
+    assert analisar_log(caminho, rotacionados=False)["eventos"] < relatorio["eventos"]
+    assert main([caminho]) == 0
+    assert "Goblin" in capsys.readouterr().out
@@ -0,0 +1,30 @@
+"""Testes da suíte de benchmarks (comparação com a linha de base)."""
+import json
+
+from benchmarks.suite import REFERENCIA, comparar, fator_maquina, main
+
+
+def test_comparar_desconta_velocidade_da_maquina():
+    base = {REFERENCIA: {"us_por_op": 1.0}, "lento": {"us_por_op": 10.0}, "estavel": {"us_por_op": 10.0}}
+    atual = {REFERENCIA: {"us_por_op": 2.0}, "lento": {"us_por_op": 30.0},
+             "estavel": {"us_por_op": 21.0}, "novo": {"us_por_op": 5.0}}
+
+    fator = fator_maquina(atual, base)
+    assert fator == 2.0
+    regrediu = {nome: r for nome, _, _, _, r in comparar(atual, base, limite=0.25, fator=fator)}
+    # 30 / 2 = 15 (+50%) regride; 21 / 2 = 10.5 (+5%) não; casos novos nunca regridem
+    assert regrediu == {REFERENCIA: False, "lento": True, "estavel": False, "novo": False}
+
+
+def test_main_grava_baseline_e_falha_na_regressao(tmp_path):
+    caminho = tmp_path / "baseline.json"
+    argumentos = ["-k", "critico.is_critico", "--baseline", str(caminho), "--repeticoes", "1", "--tempo", "0.001", "--processos", "1"]
+
+    assert main(argumentos + ["--salvar"]) == 0
+    dados = json.loads(caminho.read_text(encoding="utf-8"))
+    assert set(dados["resultados"]) == {REFERENCIA, "critico.is_critico"}
+
+    # Uma base 1000x mais rápida (sem normalizar) é uma regressão
+    dados["resultados"]["critico.is_critico"]["us_por_op"] /= 1000
+    caminho.write_text(json.dumps(dados), encoding="utf-8")
+    assert main(argumentos + ["--sem-normalizar"]) == 1
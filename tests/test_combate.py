@@ -0,0 +1,48 @@
+"""Testes do motor de combate headless (Missao.resolver)."""
+import random
+
+from models.classes import Guerreiro, Mago
+from models.combate import politica_atacar, politica_cautelosa
+from models.missão import Missao
+
+
+def test_resolver_headless_sem_saida(capsys):
+    random.seed(7)
+    personagem = Guerreiro("Conan")
+    missao = Missao("Teste", "fácil")
+
+    resultado = missao.resolver(personagem, politica_atacar)
+
+    assert capsys.readouterr().out == ""
+    assert resultado["turnos"] >= 1
+    assert resultado["inimigo"] == missao.inimigo.nome
+    if resultado["vitoria"]:
+        assert not missao.inimigo.esta_vivo()
+        assert resultado["dano_causado"] == missao.inimigo.hp_maximo
+        assert resultado["xp"] == missao.xp_recompensa
+    assert 0 <= resultado["criticos"] <= resultado["turnos"]
+
+
+def test_politica_cautelosa_usa_pocao():
+    random.seed(3)
+    personagem = Mago("Gandalf")
+    personagem.adicionar_item("poção")
+    personagem.hp = 10
+    missao = Missao("Teste", "difícil")
+
+    resultado = missao.resolver(personagem, politica_cautelosa)
+
+    assert resultado["itens_usados"][0] == "poção"
+
+
+def test_interativo_usa_o_mesmo_motor(monkeypatch, capsys):
+    random.seed(11)
+    personagem = Guerreiro("Conan")
+    missao = Missao("Teste", "fácil")
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+
+    resultado = missao.executar_combate(personagem)
+
+    saida = capsys.readouterr().out
+    assert "=== Resultado da Missão ===" in saida
+    assert saida.count("--- Turno") == resultado["turnos"]
@@ -0,0 +1,34 @@
+"""Testes da API vetorizada de críticos (calcular_critico_batch)."""
+import pytest
+
+from utils import calcular_critico_batch
+
+np = pytest.importorskip("numpy")
+
+
+def test_batch_multiply_e_mascara():
+    danos = np.arange(0, 1000)
+    finais, criticos = calcular_critico_batch(danos, chance=0.5, multiplicador=1.75, rng=np.random.default_rng(1))
+
+    assert finais.shape == danos.shape and criticos.dtype == bool
+    assert 0 < criticos.sum() < len(danos)
+    esperado = [int(d * 1.75) if c else int(d) for d, c in zip(danos, criticos)]
+    assert finais.tolist() == esperado
+
+
+def test_batch_add_e_chance_extremas():
+    danos = np.full(100, 10)
+    finais, criticos = calcular_critico_batch(danos, chance=1.0, multiplicador=3.9, mode="add")
+    assert criticos.all() and (finais == 13).all()
+
+    finais, criticos = calcular_critico_batch(danos, chance=0.0, multiplicador=3.9, mode="add")
+    assert not criticos.any() and (finais == 10).all()
+
+
+def test_batch_validacao():
+    with pytest.raises(ValueError):
+        calcular_critico_batch([1, 2], chance=1.5)
+    with pytest.raises(ValueError):
+        calcular_critico_batch([1, 2], mode="power")
+    with pytest.raises(ValueError):
+        calcular_critico_batch([-1, 2])
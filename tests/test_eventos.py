@@ -0,0 +1,90 @@
+"""Testes do registro estruturado de eventos."""
+import pytest
+
+from models.classes import Guerreiro, Mago
+from models.combate import politica_atacar, politica_habilidade
+from models.missão import Missao
+from utils import eventos
+from utils.analise_log import analisar_log
+from utils.eventos import TAMANHO_REGISTRO, LeitorEventos, RegistroEventos, analisar_eventos
+from utils.logger import Logger
+
+
+def _missoes(logger, quantidade=30):
+    dificuldades = list(Missao.TIPOS_INIMIGOS)
+    for semente in range(quantidade):
+        classe, politica = (Guerreiro, politica_atacar) if semente % 2 else (Mago, politica_habilidade)
+        Missao("Bosque", dificuldades[semente % 3], semente=semente).resolver(classe("Heroi"), politica,
+                                                                              logger=logger)
+
+
+def test_visao_em_texto_e_relatorio_iguais_aos_do_log(tmp_path, monkeypatch):
+    caminho_log, caminho_eventos = str(tmp_path / "jogo.log"), str(tmp_path / "eventos.bin")
+    _missoes(Logger(caminho_log))
+    registro = RegistroEventos(caminho_eventos)
+    _missoes(registro)
+    registro.registrar("Jogo salvo: Heroi")
+    registro.fechar()
+
+    with open(caminho_log, encoding="utf-8") as f:
+        texto = [linha.split("] ", 1)[1].rstrip("\n") for linha in f if linha.startswith("[")]
+    with LeitorEventos(caminho_eventos) as leitor:
+        linhas = [linha.split("] ", 1)[1] for linha in leitor.linhas()]
+    assert linhas == texto + ["Jogo salvo: Heroi"]
+
+    relatorio = analisar_eventos(caminho_eventos)
+    esperado = analisar_log(caminho_log)
+    for chave in ("inicio", "fim", "xp_por_hora"):
+        del relatorio[chave], esperado[chave]
+    assert relatorio == esperado
+    # Sem numpy, o relatório sai da varredura dos registros
+    monkeypatch.setattr(eventos, "np", None)
+    assert {k: v for k, v in analisar_eventos(caminho_eventos).items() if k in esperado} == esperado
+
+
+def test_reabrir_descarta_registro_incompleto_e_continua_as_missoes(tmp_path):
+    caminho = str(tmp_path / "eventos.bin")
+    registro = RegistroEventos(caminho)
+    _missoes(registro, quantidade=3)
+    registro.fechar()
+    with open(caminho, "ab") as f:
+        f.write(b"\x01" * (TAMANHO_REGISTRO // 2))  # escrita interrompida
+
+    registro = RegistroEventos(caminho)
+    assert registro.missao == 3
+    _missoes(registro, quantidade=1)
+    registro.fechar()
+
+    with LeitorEventos(caminho) as leitor:
+        missoes = [campos[2] for campos in leitor.registros()]
+        assert missoes[-1] == 4 and sorted(missoes) == missoes
+        assert all(linha.startswith("[") for linha in leitor.linhas())
+
+
+def test_mensagens_livres_nao_entram_na_tabela_de_nomes(tmp_path):
+    caminho = str(tmp_path / "eventos.bin")
+    registro = RegistroEventos(caminho)
+    _missoes(registro, quantidade=2)
+    tamanho_tabela = len(registro._nomes)
+    for i in range(50):
+        registro.registrar(f"Jogo salvo: Heroi ({i})")
+    assert len(registro._nomes) == tamanho_tabela
+    registro.fechar()
+    # Reaberto: as mensagens seguintes continuam no fim do arquivo de texto
+    registro = RegistroEventos(caminho)
+    registro.registrar("Jogo carregado: Herói")
+    registro.fechar()
+
+    with LeitorEventos(caminho) as leitor:
+        assert len(leitor.nomes) == tamanho_tabela
+        mensagens = [linha.split("] ", 1)[1] for linha in leitor.linhas() if "Jogo " in linha]
+    assert mensagens == [f"Jogo salvo: Heroi ({i})" for i in range(50)] + ["Jogo carregado: Herói"]
+
+
+def test_arquivo_que_nao_e_de_eventos(tmp_path):
+    caminho = tmp_path / "jogo.log"
+    caminho.write_text("=== Log do Jogo RPG ===\n" * 4, encoding="utf-8")
+    with pytest.raises(ValueError):
+        RegistroEventos(str(caminho))
+    with pytest.raises(ValueError):
+        LeitorEventos(str(caminho))
@@ -0,0 +1,65 @@
+"""Testes do índice de saves."""
+import os
+
+from models.classes import Arqueiro, Guerreiro, Mago
+from utils.indice_saves import IndiceSaves
+from utils.repositorio import Repositorio
+from utils.roster import escrever_roster
+
+
+def test_listagem_pelo_indice_atualizado_a_cada_salvar(tmp_path):
+    indice = IndiceSaves(str(tmp_path))
+    personagens = []
+    for i, cls in enumerate((Guerreiro, Mago, Arqueiro) * 4):
+        personagem = cls(f"{cls.__name__} {i:02d}")
+        personagem.ganhar_xp(i * 100)
+        indice.repositorio(f"slot{i}.json", formato="binario" if i % 2 else "json").salvar(personagem)
+        personagens.append(personagem)
+
+    # O índice é criado uma vez e depois só recebe os registros novos
+    assert indice.reconstrucoes == 1
+    assert [e["nome"] for e in indice.listar()] == sorted(p.nome for p in personagens)
+    magos = indice.listar(classe="Mago", ordem="nivel")
+    assert [e["nivel"] for e in magos] == sorted((p.nivel for p in personagens if p.classe == "Mago"), reverse=True)
+    assert indice.contar(nivel_min=3) == sum(p.nivel >= 3 for p in personagens)
+
+    # Regravar um slot atualiza o registro no lugar
+    repositorio = indice.repositorio("slot0.json")
+    guerreiro = repositorio.carregar()
+    guerreiro.ganhar_xp(10 ** 6)
+    repositorio.salvar(guerreiro)
+    assert indice.listar(ordem="nivel", limite=1)[0]["nome"] == guerreiro.nome
+    assert indice.contar() == 12 and indice.reconstrucoes == 1
+
+    selecionado = indice.listar(classe="Arqueiro")[0]
+    assert indice.hidratar(selecionado).to_dict() == personagens[2].to_dict()
+    assert indice.carregar(guerreiro.nome).to_dict() == guerreiro.to_dict()
+    assert [p.classe for p in indice.buscar(classe="Mago")] == ["Mago"] * 4
+
+
+def test_reconstrucao_quando_o_diretorio_muda_por_fora(tmp_path):
+    indice = IndiceSaves(str(tmp_path))
+    indice.repositorio("a.json").salvar(Guerreiro("Conan"))
+    indice.listar()
+    reconstrucoes = indice.reconstrucoes
+
+    # Save gravado sem o índice, roster novo, arquivo inválido e save removido
+    nome_longo = "Sir " + "Ã" * 60
+    Repositorio(str(tmp_path / "b.json")).salvar(Mago(nome_longo))
+    escrever_roster(str(tmp_path / "roster.jsonl"), [Arqueiro("Legolas"), Mago("Saruman")])
+    (tmp_path / "lixo.json").write_text("não é um save")
+    assert indice.contar() == 4 and indice.reconstrucoes == reconstrucoes + 1
+
+    saruman = [e for e in indice.listar() if e["nome"] == "Saruman"][0]
+    assert saruman["offset"] > 0 and indice.hidratar(saruman).classe == "Mago"
+    # Nomes longos ficam truncados no índice, mas o carregamento confere o nome inteiro
+    assert indice.carregar(nome_longo).nome == nome_longo
+
+    os.unlink(tmp_path / "a.json")
+    assert indice.carregar("Conan") is None
+
+    # Índice corrompido (truncado) também é reconstruído
+    with open(indice.arquivo_indice, "r+b") as f:
+        f.truncate(100)
+    assert indice.contar() == 3
+    assert sorted(os.listdir(tmp_path)) == [".indice-saves", "b.json", "lixo.json", "roster.jsonl"]
@@ -0,0 +1,58 @@
+"""Testes do inventário empilhado por nome."""
+from models.classes import Mago
+from models.inventario import Inventario, Item
+from utils.repositorio import Repositorio
+
+
+def test_empilha_por_nome_mantendo_ordem():
+    inventario = Inventario()
+    for nome in ["poção", "elixir", "poção", "poção de mana", "poção"]:
+        inventario.adicionar_item(Item(nome, ""))
+
+    assert len(inventario) == 3 and inventario.total() == 5
+    assert [it.nome for it in inventario] == ["poção", "elixir", "poção de mana"]
+    assert inventario.quantidade("poção") == 3
+    assert inventario.descrever() == "poção x3, elixir, poção de mana"
+
+    assert inventario.remover_item("elixir")
+    assert not inventario.remover_item("elixir")
+    assert "elixir" not in inventario
+    assert inventario.to_dict() == {"poção": 3, "poção de mana": 1}
+
+
+def test_usar_item_e_serializacao_compacta(tmp_path):
+    mago = Mago("Gandalf")
+    for _ in range(1000):
+        mago.adicionar_item("poção")
+    mago.adicionar_item("cristal")
+    mago.hp = 10
+
+    assert mago.usar_item("poção") and mago.hp == 40
+    assert not mago.usar_item("cristal")
+    assert mago.to_dict()["inventario"] == {"poção": 999, "cristal": 1}
+
+    repositorio = Repositorio(str(tmp_path / "save.json"))
+    repositorio.salvar(mago)
+    assert repositorio.carregar().inventario.to_dict() == {"poção": 999, "cristal": 1}
+
+
+def test_carrega_saves_antigos_em_lista():
+    inventario = Inventario.from_dict(["poção", "poção", "elixir"])
+    assert inventario.to_dict() == {"poção": 2, "elixir": 1}
+
+
+def test_catalogo_compartilha_instancias_e_define_recompensas():
+    from models.catalogo import CATALOGO
+    from models.missão import Missao
+
+    mago = Mago("Gandalf")
+    for _ in range(1000):
+        mago.adicionar_item("poção")
+    carregado = Inventario.from_dict({"poção": 3})
+
+    assert mago.inventario[0] is CATALOGO.obter("poção") is carregado[0]
+    assert Missao.ITENS_POSSIVEIS == ["poção", "poção de mana", "elixir", "cristal"]
+
+    mago.mana = 0
+    mago.adicionar_item("poção de mana")
+    assert mago.usar_item("poção de mana") and mago.mana == 25
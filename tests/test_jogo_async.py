@@ -0,0 +1,78 @@
+"""Testes do loop assíncrono do jogo e da animação de crítico em segundo plano."""
+import asyncio
+import random
+
+from jogo import Jogo
+from utils import animacao_critico_async
+
+
+def test_animacao_nao_bloqueia_o_loop():
+    eventos = []
+
+    async def outra_tarefa():
+        for _ in range(4):
+            eventos.append("tarefa")
+            await asyncio.sleep(0.01)
+
+    async def principal():
+        await asyncio.gather(
+            animacao_critico_async(speed=0.01, length=4, escrever=lambda t: eventos.append("frame")),
+            outra_tarefa()
+        )
+
+    asyncio.run(principal())
+
+    # Os frames e a outra tarefa se intercalam em vez de rodar em sequência
+    assert eventos.count("frame") == 5
+    assert "tarefa" in eventos[:4]
+
+
+def test_executar_async_com_entrada_roteirizada(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    random.seed(5)
+    menu = iter(["1", "2", "3", "0"])
+
+    async def ler(prompt):
+        await asyncio.sleep(0)
+        if prompt == "\n> ":
+            return next(menu)
+        if prompt == "Nome do personagem: ":
+            return "Conan"
+        return "1"  # Classe Guerreiro e ataque básico em todos os turnos
+
+    jogo = Jogo()
+    asyncio.run(jogo.executar_async(ler))
+    jogo.logger.fechar()
+
+    saida = capsys.readouterr().out
+    assert jogo.personagem.classe == "Guerreiro"
+    assert "=== Resultado da Missão ===" in saida
+    assert "Obrigado por jogar!" in saida
+
+
+def test_modo_automatico_async_nao_bloqueia_o_loop():
+    from models.classes import Guerreiro
+    from models.missão import Missao
+    from utils.cache import CacheLRU
+
+    semente = next(s for s in range(100) if type(Missao("M", "difícil", semente=s).inimigo).__name__ == "Chefao")
+    esperado = Missao("M", "difícil", semente=semente).resolver_automaticamente(Guerreiro("Conan"), cache=CacheLRU())
+    cache = CacheLRU()
+    ticks = []
+
+    async def relogio(pronto):
+        while not pronto.done():
+            ticks.append(1)
+            await asyncio.sleep(0.001)
+
+    async def principal():
+        tarefa = asyncio.ensure_future(Missao("M", "difícil", semente=semente).resolver_automaticamente_async(
+            Guerreiro("Conan"), cache=cache))
+        await relogio(tarefa)
+        return await tarefa
+
+    resultado = asyncio.run(principal())
+
+    # O cálculo da distribuição roda fora do loop: o relógio continua andando
+    assert len(ticks) > 5
+    assert resultado == esperado and cache.falhas == 1
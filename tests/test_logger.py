@@ -0,0 +1,134 @@
+"""Testes do Logger, do LoggerBufferizado e da rotação de logs."""
+import os
+
+from utils.logger import Logger, LoggerBufferizado, RotacaoLog, ler_log, segmentos_log
+
+
+def _linhas(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [linha for linha in f if linha.startswith("[")]
+
+
+def test_logger_registra_com_timestamp(tmp_path):
+    caminho = tmp_path / "jogo.log"
+    logger = Logger(str(caminho))
+    logger.registrar("Jogo iniciado")
+
+    assert _linhas(caminho)[0].endswith("] Jogo iniciado\n")
+
+
+def test_bufferizado_grava_em_lote_e_ao_fechar(tmp_path):
+    caminho = tmp_path / "jogo.log"
+    logger = LoggerBufferizado(str(caminho), tamanho_lote=1000, intervalo=60)
+    for i in range(500):
+        logger.registrar(f"Turno {i}: Goblin causou 1 de dano")
+
+    assert _linhas(caminho) == []
+    logger.descarregar()
+    assert len(_linhas(caminho)) == 500
+
+    logger.registrar("Jogo encerrado")
+    logger.fechar()
+    assert _linhas(caminho)[-1].endswith("Jogo encerrado\n")
+
+    # Depois de fechado, volta a gravar de forma síncrona
+    logger.registrar("depois")
+    assert _linhas(caminho)[-1].endswith("depois\n")
+
+
+def test_bufferizado_limpar_log_descarta_pendentes(tmp_path):
+    caminho = tmp_path / "jogo.log"
+    logger = LoggerBufferizado(str(caminho), durabilidade="fsync")
+    logger.registrar("antes")
+    logger.limpar_log()
+    logger.registrar("depois")
+    logger.fechar()
+
+    assert [l.split("] ", 1)[1] for l in _linhas(caminho)] == ["depois\n"]
+
+
+def test_rotacao_por_tamanho_comprime_e_mantem_os_mais_recentes(tmp_path):
+    caminho = str(tmp_path / "jogo.log")
+    rotacao = RotacaoLog(tamanho_maximo=400, manter=2)
+    logger = Logger(caminho, rotacao=rotacao)
+    for i in range(60):
+        logger.registrar(f"Turno {i}: Goblin causou {i} de dano")
+    rotacao.aguardar()
+
+    segmentos = segmentos_log(caminho)
+    assert len(segmentos) == 2 and all(s.endswith(".gz") for s in segmentos)
+    assert sorted(os.listdir(tmp_path)) == sorted(["jogo.log"] + [os.path.basename(s) for s in segmentos])
+
+    # A leitura atravessa os segmentos comprimidos e o arquivo atual, em ordem
+    turnos = [int(l.split("Turno ")[1].split(":")[0]) for l in ler_log(caminho) if l.startswith("[")]
+    assert turnos == list(range(turnos[0], 60)) and turnos[0] > 0
+    assert len(list(ler_log(caminho, rotacionados=False))) < len(list(ler_log(caminho)))
+
+
+def test_segmentos_ordenados_pela_sequencia_e_nao_pelo_relogio(tmp_path):
+    caminho = str(tmp_path / "jogo.log")
+    # Segmento no formato antigo (hora local) e um relógio que voltou no tempo
+    (tmp_path / "jogo.log.29991231-235959-000000").write_text("antigo\n", encoding="utf-8")
+    (tmp_path / "jogo.log.00000009-29991231T235959Z").write_text("nono\n", encoding="utf-8")
+    rotacao = RotacaoLog(tamanho_maximo=1, manter=2, comprimir=False)
+    for texto in ("décimo", "décimo primeiro"):
+        (tmp_path / "jogo.log").write_text(f"{texto}\n", encoding="utf-8")
+        rotacao.rotacionar(caminho)
+    rotacao.aguardar()
+
+    assert [os.path.basename(s)[:17] for s in segmentos_log(caminho)] == [
+        "jogo.log.00000010", "jogo.log.00000011"]
+    assert list(ler_log(caminho)) == ["décimo\n", "décimo primeiro\n"]
+
+
+def test_rotacao_por_tempo_no_logger_bufferizado(tmp_path):
+    caminho = str(tmp_path / "jogo.log")
+    rotacao = RotacaoLog(tamanho_maximo=None, intervalo=0, manter=10, comprimir=False)
+    logger = LoggerBufferizado(caminho, tamanho_lote=10, intervalo=60, rotacao=rotacao)
+    for i in range(30):
+        logger.registrar(f"evento {i}")
+    logger.fechar()
+    rotacao.aguardar()
+
+    # Um segmento por lote gravado
+    assert len(segmentos_log(caminho)) == 3
+    eventos = [l.split("] ", 1)[1].strip() for l in ler_log(caminho) if l.startswith("[")]
+    assert eventos == [f"evento {i}" for i in range(30)]
+
+
+def test_bufferizado_sobrevive_a_falhas_de_arquivo(tmp_path, capsys):
+    diretorio = tmp_path / "logs"
+    diretorio.mkdir()
+    logger = LoggerBufferizado(str(diretorio / "jogo.log"), intervalo=60)
+    logger.registrar("antes")
+    logger.descarregar()
+    os.remove(diretorio / "jogo.log")
+    diretorio.rmdir()
+
+    # Os comandos não travam e a thread de escrita continua viva
+    logger.limpar_log()
+    logger.registrar("sem diretório")
+    logger.descarregar()
+    assert logger._thread.is_alive()
+    assert "Erro" in capsys.readouterr().out
+
+    diretorio.mkdir()
+    logger.registrar("depois")
+    logger.fechar()
+    assert not logger._thread.is_alive()
+    assert _linhas(diretorio / "jogo.log")[-1].endswith("depois\n")
+
+
+def test_bufferizado_nao_perde_mensagens_registradas_durante_o_fechamento(tmp_path):
+    import threading
+    caminho = tmp_path / "jogo.log"
+    logger = LoggerBufferizado(str(caminho), tamanho_lote=10, intervalo=60)
+    threads = [threading.Thread(target=lambda n=n: [logger.registrar(f"t{n} {i}") for i in range(500)])
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    logger.fechar()
+    for thread in threads:
+        thread.join()
+
+    assert len(_linhas(caminho)) == 2000
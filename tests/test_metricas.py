@@ -0,0 +1,55 @@
+"""Testes do registro de métricas e do combate instrumentado."""
+import json
+
+from models.classes import Mago
+from models.combate import politica_cautelosa
+from models.missão import Missao
+from utils.metricas import MetricasCombate, RegistroMetricas
+
+
+def test_registro_exporta_json_e_prometheus(tmp_path):
+    registro = RegistroMetricas()
+    itens = registro.contador("rpg_itens_total", "Itens", ("item",))
+    dano = registro.histograma("rpg_dano", "Dano", (5, 10))
+    itens.incrementar(('poção "grande"',), 2)
+    for valor in (3, 5, 7, 40):
+        dano.observar(valor)
+
+    texto = registro.para_prometheus()
+    assert 'rpg_itens_total{item="poção \\"grande\\""} 2' in texto
+    # Faixas acumuladas, com o limite incluído na faixa
+    assert 'rpg_dano_bucket{le="5"} 2' in texto
+    assert 'rpg_dano_bucket{le="10"} 3' in texto
+    assert 'rpg_dano_bucket{le="+Inf"} 4' in texto
+    assert "rpg_dano_sum 55" in texto and "rpg_dano_count 4" in texto
+
+    registro.exportar(str(tmp_path / "metricas.json"))
+    dados = json.loads((tmp_path / "metricas.json").read_text(encoding="utf-8"))
+    assert dados["rpg_dano"]["series"][0]["contagens"] == [2, 1, 1]
+    registro.exportar(str(tmp_path / "metricas.prom"))
+    assert (tmp_path / "metricas.prom").read_text(encoding="utf-8") == texto
+
+
+def test_combate_instrumentado_nao_altera_o_combate():
+    metricas = MetricasCombate()
+    criticos = 0
+    for semente in range(40):
+        resultados = []
+        for m in (None, metricas):
+            personagem = Mago("Gandalf")
+            personagem.adicionar_item("poção")
+            missao = Missao("Teste", "difícil", semente=semente)
+            resultados.append(missao.resolver(personagem, politica_cautelosa, metricas=m))
+        assert resultados[0] == resultados[1]
+
+        criticos += resultados[1]["criticos"]
+
+    combates = sum(metricas.combates.series.values())
+    golpes = sum(metricas.golpes.series.values())
+    dano = sum(serie[1] for serie in metricas.dano_causado.series.values())
+    assert combates == 40
+    assert sum(metricas.criticos.series.values()) == criticos
+    assert golpes == sum(serie[2] for serie in metricas.dano_causado.series.values())
+    assert dano > 0 and metricas.mana_insuficiente.valor(("Mago",)) > 0
+    assert metricas.fases.total(("acao_jogador",)) == sum(
+        serie[1] for serie in metricas.turnos.series.values())
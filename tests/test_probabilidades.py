@@ -0,0 +1,66 @@
+"""Testes do cálculo exato de probabilidades de combate."""
+import random
+
+from models.classes import Arqueiro, Mago
+from models.combate import politica_habilidade
+from models.inimigo import Chefao, Lobo
+from models.missão import Missao
+from models.probabilidades import calcular_probabilidades, distribuicao_fator
+
+
+def test_distribuicao_fator_soma_um():
+    distribuicao = distribuicao_fator(11, 0.8, 1.2)
+    assert set(distribuicao) == {8, 9, 10, 11, 12, 13}
+    assert abs(sum(distribuicao.values()) - 1) < 1e-12
+
+
+def test_politica_fixa_coincide_com_espaco_conjunto():
+    arqueiro = Arqueiro("Legolas")
+    arqueiro.hp = 40  # mantém pequeno o espaço de estados conjunto
+    for inimigo in (Lobo, Chefao):
+        rapido = calcular_probabilidades(arqueiro, inimigo(), "habilidade")
+        conjunto = calcular_probabilidades(arqueiro, inimigo(), lambda *estado: "habilidade")
+
+        assert abs(sum(rapido["desfechos"].values()) - 1) < 1e-9
+        assert abs(rapido["vitoria"] - conjunto["vitoria"]) < 1e-9
+        assert abs(rapido["turnos_esperados"] - conjunto["turnos_esperados"]) < 1e-9
+
+
+def test_confere_com_simulacao():
+    exato = calcular_probabilidades(Mago("Gandalf"), Chefao(), "habilidade")
+
+    random.seed(2024)
+    n, vitorias = 4000, 0
+    for _ in range(n):
+        missao = Missao("Teste", "difícil")
+        missao.inimigo = Chefao()
+        vitorias += missao.resolver(Mago("Gandalf"), politica_habilidade)["vitoria"]
+
+    assert abs(vitorias / n - exato["vitoria"]) < 0.03
+
+
+def test_missao_automatica_usa_cache_e_tem_a_mesma_distribuicao():
+    from models.combate import politica_atacar
+    from models.inimigo import Orc
+    from utils.cache import CacheLRU
+
+    def missao_contra_orc():
+        missao = Missao("Teste", "médio")
+        missao.inimigo = Orc()
+        missao.xp_recompensa = missao.inimigo.xp_recompensa
+        return missao
+
+    random.seed(99)
+    cache = CacheLRU(capacidade=2)
+    n, hp_automatico, hp_jogado = 3000, 0, 0
+    for _ in range(n):
+        mago = Mago("Gandalf")
+        missao_contra_orc().resolver_automaticamente(mago, cache=cache)
+        hp_automatico += mago.hp
+
+        mago = Mago("Gandalf")
+        missao_contra_orc().resolver(mago, politica_atacar)
+        hp_jogado += mago.hp
+
+    assert cache.estatisticas()["falhas"] == 1 and cache.acertos == n - 1
+    assert abs(hp_automatico / n - hp_jogado / n) < 1.5
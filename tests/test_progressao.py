@@ -0,0 +1,71 @@
+"""Testes da tabela de XP e do ganho de níveis em O(log n)."""
+import json
+import random
+
+import pytest
+
+import models.progressao as progressao
+from models.classes import Guerreiro, Mago
+from models.progressao import avancar_niveis, avancar_niveis_em_lote, ganhar_xp_em_lote
+
+
+def _nivel_a_nivel(limite, xp):
+    """O laço original de ganhar_xp."""
+    niveis = 0
+    while xp >= limite:
+        xp -= limite
+        niveis += 1
+        limite = int(limite * 1.5)
+    return niveis, xp, limite
+
+
+def _casos():
+    rng = random.Random(7)
+    casos = [(100, 0), (100, 99), (100, 100), (100, 250), (150, 10 ** 40), (1, 5), (2, 3)]
+    for _ in range(3000):
+        limite = rng.choice([100, 337, 2553, rng.randint(1, 10 ** 6), 10 ** 20])
+        xp = rng.choice([rng.randint(-50, 10 ** 4), rng.randint(0, 10 ** 12), limite, limite - 1])
+        casos.append((limite, xp))
+    return casos
+
+
+def test_avancar_niveis_igual_ao_laco():
+    for limite, xp in _casos():
+        assert avancar_niveis(limite, xp) == _nivel_a_nivel(limite, xp)
+
+
+@pytest.mark.parametrize("com_numpy", [True, False])
+def test_lote_igual_ao_laco(monkeypatch, com_numpy):
+    if com_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(progressao, "np", None)
+    casos = _casos()
+    niveis, restantes, novos = avancar_niveis_em_lote([c[0] for c in casos], [c[1] for c in casos])
+    assert list(zip(niveis, restantes, novos)) == [_nivel_a_nivel(*c) for c in casos]
+
+
+def test_ganhar_xp_em_lote_igual_a_ganhar_xp():
+    quantidades = [0, 99, 100, 5000, 123456, 10 ** 9]
+    individuais = [Mago("m") for _ in quantidades]
+    lote = [Mago("m") for _ in quantidades]
+    lote[2].xp_proximo_nivel = individuais[2].xp_proximo_nivel = 777  # save fora da sequência padrão
+
+    subiram = [p.ganhar_xp(q) for p, q in zip(individuais, quantidades)]
+    assert ganhar_xp_em_lote(lote, quantidades) == subiram
+    assert [p.to_dict() for p in lote] == [p.to_dict() for p in individuais]
+
+    if progressao.np is not None:
+        # Quantidades do numpy não podem vazar para o save (JSON)
+        ganhar_xp_em_lote(lote, progressao.np.array(quantidades, dtype=progressao.np.int64))
+        ganhar_xp_em_lote(lote, progressao.np.int64(7))
+        assert all(type(p.xp) is int for p in lote)
+        json.dumps([p.to_dict() for p in lote])
+
+    guerreiro = Guerreiro("g")
+    hp_maximo, dano_base = guerreiro.hp_maximo, guerreiro.dano_base
+    guerreiro.hp = 1
+    assert guerreiro.ganhar_xp(15000)
+    assert (guerreiro.nivel, guerreiro.xp, guerreiro.xp_proximo_nivel) == (11, 3707, 5743)
+    assert guerreiro.hp == guerreiro.hp_maximo == hp_maximo + 200
+    assert guerreiro.dano_base == dano_base + 20
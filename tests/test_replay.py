@@ -0,0 +1,103 @@
+"""Testes dos replays binários de missões."""
+import random
+
+from jogo import Jogo
+from models.classes import Arqueiro, Mago
+from models.personagem import Personagem
+from models.combate import politica_cautelosa
+from models.missão import Missao
+from utils.replay import ArquivoReplay, Replay, reproduzir, reproduzir_arquivo
+
+
+def _gravar_missao(i, automatico=False):
+    personagem = (Mago if i % 2 else Arqueiro)(f"Heroi{i}")
+    personagem.adicionar_item("poção")
+    personagem.hp = 25
+    missao = Missao("Teste", "difícil", semente=1000 + i)
+    inicial = personagem.to_dict()
+    if automatico:
+        resultado = missao.resolver_automaticamente(personagem)
+        return Replay.da_missao(missao, inicial, personagem, resultado, "atacar")
+    resultado = missao.resolver(personagem, politica_cautelosa)
+    return Replay.da_missao(missao, inicial, personagem, resultado)
+
+
+def test_codificacao_ida_e_volta_e_reproducao():
+    replay = _gravar_missao(1)
+    decodificado = Replay.decodificar(replay.codificar())
+
+    for campo in Replay.__slots__:
+        assert getattr(decodificado, campo) == getattr(replay, campo)
+    assert ("item", "poção") in decodificado.acoes
+    assert len(replay.codificar()) < 120
+    assert reproduzir(decodificado) == {"ok": True, "final": replay.final, "divergencias": []}
+
+
+def test_arquivo_com_indice_e_deteccao_de_divergencia(tmp_path):
+    arquivo = ArquivoReplay(str(tmp_path / "replays.rpl"))
+    replays = [_gravar_missao(i, automatico=i % 3 == 0) for i in range(30)]
+    arquivo.gravar_varios(replays[:20])
+    assert arquivo.gravar(replays[20]) == 20
+    arquivo.gravar_varios(replays[21:])
+
+    assert len(arquivo) == 30
+    assert arquivo.ler(17).semente == replays[17].semente
+    assert reproduzir_arquivo(arquivo.caminho)["divergentes"] == []
+
+    # Um replay adulterado é apontado na reexecução em lote
+    adulterado = _gravar_missao(99)
+    adulterado.final["hp"] += 1
+    arquivo.gravar(adulterado)
+    assert reproduzir_arquivo(arquivo.caminho)["divergentes"] == [(30, ["estado final"])]
+
+    (tmp_path / "replays.rpl.idx").unlink()
+    assert arquivo.reconstruir_indice() == 31
+    assert arquivo.ler(30).semente == adulterado.semente
+
+
+def test_jogo_grava_missoes_interativas(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    random.seed(4)
+    respostas = iter(["Conan", "1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(respostas, "1"))
+    jogo = Jogo(replays=ArquivoReplay("replays.rpl"))
+    jogo.criar_personagem()
+    jogo.encarar_missao()
+    jogo.encarar_missao(automatico=True)
+    jogo.logger.fechar()
+
+    replays = list(jogo.replays)
+    assert [r.modo for r in replays] == ["turnos", "atacar"]
+    assert all(reproduzir(r)["ok"] for r in replays)
+
+
+def test_nomes_longos_classe_generica_e_valores_grandes():
+    personagem = Personagem("Ç" * 130, "Bardo")
+    personagem.hp_maximo = personagem.hp = 70_000
+    personagem.xp = 2 ** 40
+    for _ in range(300):
+        personagem.adicionar_item("poção")
+    missao = Missao("Teste", "fácil", semente=2 ** 70)
+    inicial = personagem.to_dict()
+    resultado = missao.resolver(personagem, politica_cautelosa)
+    replay = Replay.da_missao(missao, inicial, personagem, resultado)
+
+    decodificado = Replay.decodificar(replay.codificar())
+    for campo in Replay.__slots__:
+        assert getattr(decodificado, campo) == getattr(replay, campo)
+    assert reproduzir(decodificado)["ok"]
+
+
+def test_falha_ao_gravar_replay_nao_interrompe_a_missao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Arquivo de uma versão anterior do formato: o replay não pode ser acrescentado
+    (tmp_path / "replays.rpl").write_bytes(b"RPGR\x02")
+    saidas = []
+    jogo = Jogo(saida=saidas.append, replays=ArquivoReplay("replays.rpl"))
+    jogo.personagem = Mago("Heroi")
+    jogo.encarar_missao(automatico=True)
+    jogo.logger.fechar()
+
+    assert "\nErro ao gravar o replay da missão!" in saidas
+    assert "Erro ao gravar o replay" in (tmp_path / "jogo.log").read_text(encoding="utf-8")
+    assert (tmp_path / "replays.rpl").read_bytes() == b"RPGR\x02"
@@ -0,0 +1,235 @@
+"""Testes dos repositórios de save (JSON, binário, journal e SQLite)."""
+import pytest
+
+from models.classes import Arqueiro, Guerreiro, Mago
+from utils.repositorio import Repositorio
+from utils.repositorio_journal import RepositorioJournal, ler_journal
+from utils.repositorio_sqlite import RepositorioSQLite
+
+
+def test_json_ida_e_volta(tmp_path):
+    repositorio = Repositorio(str(tmp_path / "save.json"))
+    mago = Mago("Gandalf")
+    mago.ganhar_xp(250)
+    mago.adicionar_item("poção")
+
+    assert repositorio.salvar(mago)
+    carregado = repositorio.carregar()
+
+    assert isinstance(carregado, Mago)
+    assert carregado.to_dict() == mago.to_dict()
+
+
+def test_sqlite_slots_listagem_e_exclusao(tmp_path):
+    repositorio = RepositorioSQLite(str(tmp_path / "saves.db"))
+    personagens = [cls(f"{cls.__name__} {i}") for i in range(50) for cls in (Guerreiro, Mago, Arqueiro)]
+    for i, p in enumerate(personagens):
+        p.ganhar_xp(i * 10)
+    assert repositorio.salvar_varios(personagens) == 150
+
+    assert repositorio.contar() == 150
+    assert repositorio.contar(classe="Mago") == 50
+    magos = repositorio.listar(classe="Mago", nivel_min=2, ordem="nivel")
+    assert magos and all(m["classe"] == "Mago" and m["nivel"] >= 2 for m in magos)
+    assert [m["nivel"] for m in magos] == sorted((m["nivel"] for m in magos), reverse=True)
+
+    alvo = personagens[40]
+    assert repositorio.carregar(alvo.nome).to_dict() == alvo.to_dict()
+    assert all(p.classe == "Arqueiro" for p in repositorio.buscar(classe="Arqueiro"))
+
+    assert repositorio.excluir(alvo.nome)
+    assert not repositorio.existe_save(alvo.nome)
+    assert repositorio.carregar(alvo.nome) is None
+    repositorio.fechar()
+
+
+def test_salvamento_ignorado_quando_nada_mudou(tmp_path, monkeypatch):
+    caminho = tmp_path / "save.json"
+    repositorio = Repositorio(str(caminho))
+    guerreiro = Guerreiro("Conan")
+    assert guerreiro.esta_sujo()
+
+    assert repositorio.salvar(guerreiro)
+    assert not guerreiro.esta_sujo()
+
+    gravacoes = []
+    monkeypatch.setattr("utils.repositorio.gravar_atomicamente", lambda *a: gravacoes.append(a))
+    guerreiro.hp = guerreiro.hp  # mesmo valor: continua limpo
+    assert repositorio.salvar(guerreiro) and gravacoes == []
+
+    guerreiro.adicionar_item("poção")
+    guerreiro.receber_dano(10)
+    assert guerreiro.campos_sujos() == {"inventario", "hp"}
+    assert repositorio.salvar(guerreiro) and len(gravacoes) == 1
+
+
+def test_gravacao_atomica_preserva_save_anterior(tmp_path, monkeypatch):
+    caminho = tmp_path / "save.json"
+    repositorio = Repositorio(str(caminho))
+    repositorio.salvar(Guerreiro("Conan"))
+    original = caminho.read_bytes()
+
+    def falha(*args):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr("utils.repositorio.os.replace", falha)
+    assert not repositorio.salvar(Mago("Gandalf"))
+    assert caminho.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["save.json"]
+
+
+def test_binario_ida_e_volta_e_deteccao_de_formato(tmp_path):
+    caminho = str(tmp_path / "save.bin")
+    mago = Mago("Gandalf, o Cinzento")
+    mago.ganhar_xp(5000)
+    for item in ("poção", "poção", "elixir"):
+        mago.adicionar_item(item)
+
+    assert Repositorio(caminho, formato="binario").salvar(mago)
+    conteudo = (tmp_path / "save.bin").read_bytes()
+    assert conteudo.startswith(b"RPGS")
+    assert len(conteudo) < len(Repositorio().codificar(mago.to_dict()))
+
+    # Leitura detecta o formato: um repositório JSON carrega o save binário...
+    assert Repositorio(caminho).carregar().to_dict() == mago.to_dict()
+    # ...e um binário carrega um save JSON antigo
+    Repositorio(caminho).salvar(mago)
+    assert Repositorio(caminho, formato="binario").carregar().to_dict() == mago.to_dict()
+
+
+def test_binario_corrompido_ou_invalido(tmp_path):
+    caminho = tmp_path / "save.bin"
+    repositorio = Repositorio(str(caminho), formato="binario")
+    repositorio.salvar(Arqueiro("Legolas"))
+    conteudo = caminho.read_bytes()
+
+    for invalido in (conteudo[:-1], conteudo[:10], conteudo[:4] + b"\x63" + conteudo[5:]):
+        with pytest.raises(ValueError):
+            Repositorio.decodificar(invalido)
+        caminho.write_bytes(invalido)
+        assert repositorio.carregar() is None
+
+    guerreiro = Guerreiro("Conan")
+    guerreiro.xp = 2 ** 64
+    with pytest.raises(ValueError):
+        repositorio.codificar(guerreiro.to_dict())
+    with pytest.raises(ValueError):
+        Repositorio(formato="xml")
+
+
+def test_journal_acrescenta_deltas_e_compacta(tmp_path):
+    caminho = tmp_path / "save.journal"
+    repositorio = RepositorioJournal(str(caminho), compactar_a_cada=8, durabilidade="flush")
+    mago = Mago("Gandalf")
+    mago.adicionar_item("poção")
+    assert repositorio.salvar(mago)
+    snapshot = caminho.stat().st_size
+
+    tamanhos = []
+    for turno in range(3):
+        mago.receber_dano(7)
+        mago.habilidade_especial()
+        mago.adicionar_item("elixir")
+        assert repositorio.salvar(mago)
+        tamanhos.append(caminho.stat().st_size)
+    # Cada salvamento só acrescenta os deltas (HP, mana e um item)
+    assert all(b - a < snapshot for a, b in zip([snapshot] + tamanhos, tamanhos))
+
+    mago.ganhar_xp(1000)
+    mago.usar_item("poção")
+    assert repositorio.salvar(mago)
+    assert RepositorioJournal(str(caminho)).carregar().to_dict() == mago.to_dict()
+
+    # Ao passar de compactar_a_cada deltas o journal volta a ser um snapshot
+    mago.receber_dano(1)
+    repositorio.salvar(mago)
+    assert caminho.stat().st_size < tamanhos[-1]
+    assert RepositorioJournal(str(caminho)).carregar().to_dict() == mago.to_dict()
+
+
+def test_journal_descarta_registro_interrompido(tmp_path):
+    caminho = tmp_path / "save.journal"
+    repositorio = RepositorioJournal(str(caminho))
+    guerreiro = Guerreiro("Conan")
+    repositorio.salvar(guerreiro)
+    guerreiro.ganhar_xp(50)
+    repositorio.salvar(guerreiro)
+    esperado = guerreiro.to_dict()
+    integro = caminho.stat().st_size
+
+    # Último registro gravado pela metade
+    guerreiro.receber_dano(30)
+    repositorio.salvar(guerreiro)
+    with open(caminho, "r+b") as f:
+        f.truncate(caminho.stat().st_size - 3)
+
+    novo = RepositorioJournal(str(caminho))
+    carregado = novo.carregar()
+    assert carregado.to_dict() == esperado
+    assert caminho.stat().st_size == integro and novo.descartados > 0
+
+    # Registro com CRC inválido também é descartado
+    carregado.receber_dano(5)
+    novo.salvar(carregado)
+    with open(caminho, "r+b") as f:
+        f.seek(-1, 2)
+        ultimo = f.read(1)
+        f.seek(-1, 2)
+        f.write(bytes([ultimo[0] ^ 0xFF]))
+    assert RepositorioJournal(str(caminho)).carregar().to_dict() == esperado
+
+
+
+def test_journal_descarta_salvamento_final_com_varios_deltas(tmp_path):
+    caminho = tmp_path / "save.journal"
+    repositorio = RepositorioJournal(str(caminho))
+    mago = Mago("Gandalf")
+    repositorio.salvar(mago)
+    mago.ganhar_xp(30)
+    repositorio.salvar(mago)
+    esperado = mago.to_dict()
+    integro = caminho.stat().st_size
+
+    # Um salvamento que muda HP, mana e inventário
+    mago.receber_dano(7)
+    mago.habilidade_especial()
+    mago.adicionar_item("elixir")
+    repositorio.salvar(mago)
+    repositorio.fechar()
+    conteudo = caminho.read_bytes()
+
+    # Dano no primeiro delta do último salvamento: o salvamento inteiro é descartado
+    corrompido = bytearray(conteudo)
+    corrompido[integro + 9 + 5] ^= 0xFF
+    caminho.write_bytes(bytes(corrompido))
+    assert RepositorioJournal(str(caminho)).carregar().to_dict() == esperado
+    assert caminho.stat().st_size == integro
+
+    # Cauda preenchida com zeros (o sistema de arquivos estendeu o arquivo sem os dados)
+    caminho.write_bytes(conteudo[:integro] + bytes(40))
+    novo = RepositorioJournal(str(caminho))
+    assert novo.carregar().to_dict() == esperado and novo.descartados == 40
+
+
+def test_journal_corrompido_no_meio_nao_e_truncado(tmp_path):
+    caminho = tmp_path / "save.journal"
+    repositorio = RepositorioJournal(str(caminho))
+    guerreiro = Guerreiro("Conan")
+    repositorio.salvar(guerreiro)
+    tamanhos = [caminho.stat().st_size]
+    for _ in range(4):
+        guerreiro.ganhar_xp(10)
+        repositorio.salvar(guerreiro)
+        tamanhos.append(caminho.stat().st_size)
+    repositorio.fechar()
+
+    # Um byte trocado no segundo de quatro deltas
+    corrompido = bytearray(caminho.read_bytes())
+    corrompido[tamanhos[2] - 1] ^= 0xFF
+    caminho.write_bytes(bytes(corrompido))
+
+    with pytest.raises(ValueError, match="corrompido"):
+        ler_journal(bytes(corrompido))
+    novo = RepositorioJournal(str(caminho))
+    assert novo.carregar() is None
+    assert caminho.read_bytes() == bytes(corrompido) and novo.descartados == 0
@@ -0,0 +1,58 @@
+"""Testes do roster em JSONL."""
+import pytest
+
+from models.classes import Arqueiro, Guerreiro, Mago
+from models.personagem import Personagem
+from utils.roster import anexar_roster, escrever_roster, ler_dados_roster, ler_roster
+
+
+def _populacao(n):
+    for i in range(n):
+        for cls in (Guerreiro, Mago, Arqueiro):
+            personagem = cls(f"{cls.__name__} {i}")
+            personagem.ganhar_xp(i * 40)
+            yield personagem
+
+
+def test_ida_e_volta_filtros_e_leitura_preguicosa(tmp_path):
+    caminho = str(tmp_path / "roster.jsonl")
+    personagens = list(_populacao(30))
+    # Aceita geradores e lotes menores que o total
+    assert escrever_roster(caminho, iter(personagens), lote=7) == 90
+
+    carregados = list(ler_roster(caminho))
+    assert [type(p) for p in carregados] == [type(p) for p in personagens]
+    assert [p.to_dict() for p in carregados] == [p.to_dict() for p in personagens]
+
+    magos = list(ler_roster(caminho, classe="Mago", nivel_min=3))
+    esperados = [p.to_dict() for p in personagens if p.classe == "Mago" and p.nivel >= 3]
+    assert magos and [m.to_dict() for m in magos] == esperados
+
+    # Só a primeira linha é construída até que o gerador seja consumido
+    leitor = ler_roster(caminho)
+    assert next(leitor).nome == "Guerreiro 0"
+    leitor.close()
+
+
+def test_reescrita_no_lugar_anexacao_e_linhas_invalidas(tmp_path):
+    caminho = str(tmp_path / "roster.jsonl")
+    escrever_roster(caminho, _populacao(5))
+    acima_do_1 = sum(1 for d in ler_dados_roster(caminho, nivel_min=2))
+
+    # Transforma o roster a partir dele mesmo
+    def curar(dados):
+        dados["hp"] = dados["hp_maximo"]
+        return dados
+
+    assert escrever_roster(caminho, (curar(d) for d in ler_dados_roster(caminho) if d["nivel"] > 1)) == acima_do_1
+    assert all(d["hp"] == d["hp_maximo"] for d in ler_dados_roster(caminho))
+    assert [p.name for p in tmp_path.iterdir()] == ["roster.jsonl"]
+
+    assert anexar_roster(caminho, [Personagem("Bardo", "Bardo")]) == 1
+    ultimo = list(ler_roster(caminho))[-1]
+    assert type(ultimo) is Personagem and ultimo.classe == "Bardo"
+
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write("\n{quebrado\n")
+    with pytest.raises(ValueError, match=f"linha {acima_do_1 + 3}"):
+        list(ler_dados_roster(caminho))
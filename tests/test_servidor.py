@@ -0,0 +1,66 @@
+"""Testes do servidor TCP com várias sessões de Jogo."""
+import asyncio
+
+from servidor import ServidorJogo, nome_do_slot, percentil
+
+
+async def _cliente(porta, linhas):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    # As linhas podem ser enviadas de uma vez: o servidor lê uma por prompt
+    writer.write("".join(f"{linha}\n" for linha in linhas).encode("utf-8"))
+    await writer.drain()
+    saida = (await reader.read()).decode("utf-8")
+    writer.close()
+    await writer.wait_closed()
+    return saida
+
+
+def test_sessoes_simultaneas_com_saves_e_log_separados(tmp_path):
+    async def principal():
+        servidor = ServidorJogo(porta=0, diretorio_saves=str(tmp_path / "saves"),
+                                arquivo_log=str(tmp_path / "servidor.log"))
+        porta = await servidor.iniciar()
+        saidas = await asyncio.gather(*(
+            _cliente(porta, [f"Jogador{i}", "1", f"Jogador{i}", "2", "6", "6", "4", "0"]) for i in range(5)
+        ))
+        relatorio = servidor.relatorio()
+        await servidor.encerrar()
+        return saidas, relatorio
+
+    saidas, relatorio = asyncio.run(principal())
+
+    for i, saida in enumerate(saidas):
+        assert f"Personagem criado: Jogador{i} (Mago)" in saida
+        assert "Jogo salvo com sucesso!" in saida
+        assert saida.rstrip().endswith("Obrigado por jogar! Até logo!")
+    assert sorted(p.name for p in (tmp_path / "saves").iterdir()) == [f"Jogador{i}.json" for i in range(5)]
+    assert "[sessao-3] Personagem criado:" in (tmp_path / "servidor.log").read_text(encoding="utf-8")
+    assert relatorio["sessoes"] == 5
+    assert relatorio["latencia_ms"]["p50"] <= relatorio["latencia_ms"]["p99"]
+
+
+
+def test_slot_do_jogador_sobrevive_ao_reinicio_do_servidor(tmp_path):
+    async def sessao(linhas):
+        servidor = ServidorJogo(porta=0, diretorio_saves=str(tmp_path / "saves"),
+                                arquivo_log=str(tmp_path / "servidor.log"))
+        porta = await servidor.iniciar()
+        try:
+            return await _cliente(porta, linhas)
+        finally:
+            await servidor.encerrar()
+
+    asyncio.run(sessao(["ana", "1", "Ana", "1", "4", "0"]))
+    asyncio.run(sessao(["../bia", "1", "Bia", "2", "4", "0"]))
+    # Novo processo de servidor: cada jogador volta ao próprio save
+    assert "Personagem: Ana (Guerreiro)" in asyncio.run(sessao(["ana", "5", "0"]))
+    assert "Personagem: Bia (Mago)" in asyncio.run(sessao(["../bia", "5", "0"]))
+    assert sorted(p.name for p in (tmp_path / "saves").iterdir()) == ["..%2Fbia.json", "ana.json"]
+    assert nome_do_slot("a b/c") != nome_do_slot("a_b_c")
+
+
+def test_percentil():
+    valores = list(range(1, 101))
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 99) == 99
+    assert percentil([], 50) == 0.0
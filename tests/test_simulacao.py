@@ -0,0 +1,15 @@
+"""Testes da simulação Monte Carlo de missões."""
+from simulacao import criar_personagem, simular
+
+
+def test_criar_personagem_no_nivel():
+    personagem = criar_personagem("Mago", 4)
+    assert personagem.nivel == 4 and personagem.xp == 0
+
+
+def test_simulacao_reprodutivel_independente_de_processos():
+    serial = simular(600, semente=5, processos=1, tamanho_bloco=100, niveis=range(1, 4))
+    paralelo = simular(600, semente=5, processos=2, tamanho_bloco=100, niveis=range(1, 4))
+
+    assert serial == paralelo
+    assert sum(c["lutas"] for c in serial.values()) == 600
@@ -2,7 +2,7 @@
 Pacote utils contendo utilitários do jogo (repositório e logger).
 """
 
-from .critico import calcular_critico, is_critico
+from .critico import animacao_critico_async, calcular_critico, calcular_critico_batch, is_critico
 
-__all__ = ["calcular_critico", "is_critico"]
+__all__ = ["animacao_critico_async", "calcular_critico", "calcular_critico_batch", "is_critico"]
 
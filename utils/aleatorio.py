@@ -0,0 +1,125 @@
+"""
+Módulo com o gerador aleatório do jogo: um gerador que pode ser dividido
+em fluxos independentes.
+
+Cada fluxo é identificado por uma chave de 64 bits, derivada com o
+SplitMix64, e os seus valores saem do Mersenne Twister em C do módulo
+random semeado com essa chave. Assim milhares de fluxos paralelos (um por
+missão, por sessão ou por processo) são reprodutíveis, nunca compartilham
+estado e não disputam o gerador global do módulo random, e cada rolagem
+custa o mesmo que em um random.Random.
+"""
+
+import hashlib
+import os
+import random
+
+
+_MASCARA = (1 << 64) - 1
+# Incremento do SplitMix64 (parte fracionária da razão áurea em 64 bits)
+_GAMA = 0x9E3779B97F4A7C15
+# Constantes que separam as chaves derivadas por dividir() e por fluxo()
+_DIVISAO = 0x5851F42D4C957F2D
+_FLUXO = 0xD1342543DE82EF95
+
+
+def _misturar(z):
+    """Função de mistura do SplitMix64 (finalizador de 64 bits)."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA
+    return z ^ (z >> 31)
+
+
+class GeradorAleatorio(random.Random):
+    """
+    Gerador aleatório divisível, compatível com random.Random.
+
+    Sobrescreve seed() e o estado; random(), getrandbits() e os demais
+    métodos vêm de random.Random (o Mersenne Twister em C), semeado com a
+    chave do fluxo. A chave só é usada para derivar fluxos filhos.
+    """
+
+    # Versão 2: valores do Mersenne Twister (a versão 1 usava blocos de SHAKE128)
+    VERSAO_ESTADO = 2
+
+    def __init__(self, semente=None):
+        """
+        Inicializa o gerador.
+
+        Args:
+            semente (int | str | bytes, optional): Semente; None usa os.urandom
+        """
+        super().__init__(semente)
+
+    def seed(self, a=None, version=2):
+        """
+        Reinicia o gerador a partir de uma semente.
+
+        Args:
+            a (int | str | bytes, optional): Semente; None usa os.urandom
+        """
+        if a is None:
+            a = int.from_bytes(os.urandom(8), "little")
+        if isinstance(a, (str, bytes, bytearray)):
+            if isinstance(a, str):
+                a = a.encode("utf-8")
+            a = int.from_bytes(hashlib.sha512(a).digest()[:8], "little")
+        if not isinstance(a, int):
+            raise TypeError("a semente deve ser int, str, bytes ou None")
+
+        # Inteiros maiores que 64 bits são dobrados em blocos de 64 bits
+        a = abs(a)
+        chave = _misturar(a & _MASCARA)
+        a >>= 64
+        while a:
+            chave = _misturar(chave ^ (a & _MASCARA))
+            a >>= 64
+        self._iniciar(chave)
+
+    def _iniciar(self, chave):
+        """Posiciona o gerador no início do fluxo da `chave`."""
+        self._chave = chave
+        super().seed(chave)
+
+    @classmethod
+    def _da_chave(cls, chave):
+        """Cria um gerador diretamente a partir de uma chave já misturada."""
+        gerador = cls.__new__(cls)
+        gerador._iniciar(chave)
+        return gerador
+
+    def dividir(self):
+        """
+        Cria um gerador filho independente, avançando este gerador em um valor.
+
+        Returns:
+            GeradorAleatorio: Novo gerador com chave própria
+        """
+        return self._da_chave(_misturar(self.getrandbits(64) ^ _DIVISAO))
+
+    def fluxo(self, indice):
+        """
+        Retorna o fluxo de número `indice` derivado deste gerador, sem
+        alterar o seu estado. O mesmo índice sempre produz o mesmo fluxo,
+        independentemente da ordem (ou do processo) em que é pedido.
+
+        Args:
+            indice (int): Número do fluxo (>= 0)
+
+        Returns:
+            GeradorAleatorio: Gerador do fluxo
+        """
+        base = _misturar(self._chave ^ _FLUXO)
+        return self._da_chave(_misturar((base + (indice + 1) * _GAMA) & _MASCARA))
+
+    def getstate(self):
+        """Retorna o estado do gerador (permite copiar e serializar)."""
+        return (self.VERSAO_ESTADO, self._chave, super().getstate())
+
+    def setstate(self, estado):
+        """Restaura um estado retornado por getstate()."""
+        versao, chave, estado_mt = estado
+        if versao != self.VERSAO_ESTADO:
+            raise ValueError(f"versão de estado incompatível: {versao}")
+        self._chave = chave
+        super().setstate(estado_mt)
@@ -0,0 +1,388 @@
+"""
+Módulo com a análise dos logs do jogo em fluxo contínuo: taxa de vitória
+por inimigo, dano por turno, frequência de críticos e XP por hora, a partir
+das linhas gravadas por Logger.registrar:
+
+    [AAAA-MM-DD HH:MM:SS] Iniciou missão: M contra Inimigo
+    [AAAA-MM-DD HH:MM:SS] Turno N: Nome causou D de dano[ (crítico)]
+    [AAAA-MM-DD HH:MM:SS] Turno N: Nome usou habilidade especial causando D de dano[ (crítico)]
+    [AAAA-MM-DD HH:MM:SS] Missão concluída: Nome venceu Inimigo
+    [AAAA-MM-DD HH:MM:SS] Missão falhou: Nome foi derrotado por Inimigo
+    [AAAA-MM-DD HH:MM:SS] XP ganho: X, Itens: ...
+
+(com um "[canal] " opcional depois do timestamp, como nos logs do servidor).
+
+Os arquivos são lidos em blocos (ou por mmap, quando não comprimidos) e
+varridos por uma única expressão regular sobre os bytes, sem decodificar as
+linhas que não interessam. Os percentis vêm de um sketch de memória
+limitada (SketchQuantis), de modo que logs de vários gigabytes (e os
+segmentos rotacionados, ver utils.logger) são analisados sem carregá-los.
+
+Uso:
+    python -m utils.analise_log [jogo.log] [--sem-mmap] [--so-atual] [--json]
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from bisect import bisect_right
+from datetime import datetime
+
+from utils.logger import segmentos_log
+
+
+PERCENTIS = (0.5, 0.9, 0.99)
+_BLOCO = 1 << 20
+
+_EVENTO = re.compile(
+    rb"^\[(?P<hora>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] (?:\[(?P<canal>[^\]\n]*)\] )?(?:"
+    rb"Turno (?P<turno>\d+): (?P<autor>[^\n]*?) (?:causou|usou habilidade especial causando) "
+    rb"(?P<dano>\d+) de dano(?P<critico> \(cr\xc3\xadtico\))?"
+    rb"|Iniciou miss\xc3\xa3o: [^\n]* contra (?P<inicio>[^\n]*?)"
+    rb"|Miss\xc3\xa3o conclu\xc3\xadda: [^\n]*? venceu (?P<vitoria>[^\n]*?)"
+    rb"|Miss\xc3\xa3o falhou: [^\n]*? foi derrotado por (?P<derrota>[^\n]*?)"
+    rb"|XP ganho: (?P<xp>\d+)[^\n]*?"
+    rb")\r?$",
+    re.MULTILINE,
+)
+
+
+class SketchQuantis:
+    """
+    Sketch de percentis em fluxo contínuo, com memória limitada: inteiros
+    de 0 a LIMITE_EXATO - 1 (danos, turnos) são contados exatamente; os
+    demais valores vão para baldes em escala logarítmica com erro relativo
+    de no máximo `erro` (como no DDSketch). Cada observação custa um
+    incremento em dicionário e qualquer percentil pode ser consultado no
+    final.
+    """
+
+    __slots__ = ("contagem", "soma", "_exatos", "_baldes", "_zeros", "_gama", "_log_gama",
+                 "_minimo", "_maximo")
+
+    LIMITE_EXATO = 4096
+
+    def __init__(self, erro=0.01):
+        """
+        Inicializa o sketch.
+
+        Args:
+            erro (float): Erro relativo máximo dos valores fora da faixa exata
+        """
+        if not 0 < erro < 1:
+            raise ValueError("erro deve estar entre 0 e 1")
+        self.contagem = 0
+        self.soma = 0
+        self._exatos = {}
+        # índice do balde -> contagem (índices negativos para valores negativos)
+        self._baldes = {}
+        self._zeros = 0
+        self._gama = (1 + erro) / (1 - erro)
+        self._log_gama = math.log(self._gama)
+        self._minimo = None
+        self._maximo = None
+
+    def adicionar(self, valor):
+        """Acrescenta uma observação."""
+        self.contagem += 1
+        self.soma += valor
+        if valor.__class__ is int and 0 <= valor < self.LIMITE_EXATO:
+            exatos = self._exatos
+            exatos[valor] = exatos.get(valor, 0) + 1
+            return
+
+        # Fora da faixa exata: guarda os extremos exatos e conta no balde
+        if self._minimo is None or valor < self._minimo:
+            self._minimo = valor
+        if self._maximo is None or valor > self._maximo:
+            self._maximo = valor
+        if valor == 0:
+            self._zeros += 1
+            return
+        indice = math.ceil(math.log(abs(valor)) / self._log_gama)
+        if valor < 0:
+            indice = -indice - 1
+        self._baldes[indice] = self._baldes.get(indice, 0) + 1
+
+    def adicionar_contagens(self, valores, contagens):
+        """Acrescenta `contagens[i]` observações de `valores[i]` (valores já agregados)."""
+        exatos = self._exatos
+        for valor, contagem in zip(valores, contagens):
+            if valor.__class__ is int and 0 <= valor < self.LIMITE_EXATO:
+                self.contagem += contagem
+                self.soma += valor * contagem
+                exatos[valor] = exatos.get(valor, 0) + contagem
+            else:
+                for _ in range(contagem):
+                    self.adicionar(valor)
+
+    def _representante(self, indice):
+        """Valor que representa um balde (erro relativo <= erro)."""
+        sinal = 1
+        if indice < 0:
+            sinal, indice = -1, -indice - 1
+        return sinal * 2 * self._gama ** indice / (self._gama + 1)
+
+    def _valores(self):
+        """Pares (valor, contagem) em ordem crescente de valor."""
+        pares = list(self._exatos.items())
+        pares.extend((self._representante(i), c) for i, c in self._baldes.items())
+        if self._zeros:
+            pares.append((0, self._zeros))
+        pares.sort()
+        return pares
+
+    def percentis(self, ps):
+        """
+        Estima vários percentis.
+
+        Args:
+            ps (iterable): Percentis entre 0 e 1
+
+        Returns:
+            list: Estimativas (None sem observações)
+        """
+        pares = self._valores()
+        if not pares:
+            return [None for _ in ps]
+        acumulados = list(itertools.accumulate(c for _, c in pares))
+        total = acumulados[-1]
+        # Posição (0 a total - 1) do percentil: o valor na posição int(p * (total - 1))
+        return [pares[bisect_right(acumulados, int(p * (total - 1)))][0] for p in ps]
+
+    def to_dict(self, ps=PERCENTIS):
+        """Contagem, média, extremos e percentis."""
+        # Extremos exatos: as chaves da faixa exata e os extremos dos demais valores
+        minimos = [v for v in (min(self._exatos, default=None), self._minimo) if v is not None]
+        maximos = [v for v in (max(self._exatos, default=None), self._maximo) if v is not None]
+        dados = {"contagem": self.contagem, "media": self.soma / self.contagem if self.contagem else None,
+                 "min": min(minimos) if minimos else None, "max": max(maximos) if maximos else None}
+        for p, valor in zip(ps, self.percentis(ps)):
+            dados[f"p{p * 100:g}"] = valor
+        return dados
+
+
+class AnaliseLog:
+    """
+    Agregador das estatísticas de um log. Recebe blocos de bytes que
+    terminam em fim de linha (alimentar) e monta o relatório (to_dict).
+    A memória usada não depende do tamanho do log: só do número de
+    inimigos diferentes e de missões em andamento ao mesmo tempo (uma por
+    canal).
+    """
+
+    def __init__(self, percentis=PERCENTIS):
+        self.percentis = percentis
+        self.dano_jogador = SketchQuantis()
+        self.dano_inimigo = SketchQuantis()
+        self.turnos = SketchQuantis()
+        self.golpes = 0
+        self.criticos = 0
+        self.xp = 0
+        # inimigo -> [missões, vitórias]
+        self.inimigos = {}
+        # canal -> [inimigo, último turno] da missão em andamento
+        self._missoes = {}
+        self.primeira_hora = None
+        self.ultima_hora = None
+        self.linhas = 0
+
+    def alimentar(self, bloco):
+        """
+        Processa um bloco de linhas do log.
+
+        Args:
+            bloco (bytes | mmap.mmap): Linhas completas do log
+        """
+        missoes = self._missoes
+        inimigos = self.inimigos
+        adicionar_jogador = self.dano_jogador.adicionar
+        adicionar_inimigo = self.dano_inimigo.adicionar
+        linhas = golpes = criticos = xp_total = 0
+        primeira = hora = None
+        for evento in _EVENTO.finditer(bloco):
+            hora, canal, turno, autor, dano, critico, inicio, vitoria, derrota, xp = evento.groups()
+            linhas += 1
+            if primeira is None:
+                primeira = hora
+            if dano is not None:
+                missao = missoes.get(canal)
+                if missao is None:
+                    # Missão iniciada antes do começo do log: não há como
+                    # saber se o golpe é do jogador ou do inimigo
+                    continue
+                missao[1] = turno
+                if autor == missao[0]:
+                    adicionar_inimigo(int(dano))
+                else:
+                    adicionar_jogador(int(dano))
+                    golpes += 1
+                    if critico is not None:
+                        criticos += 1
+            elif xp is not None:
+                xp_total += int(xp)
+            elif inicio is not None:
+                missoes[canal] = [inicio, None]
+            else:
+                inimigo = derrota if vitoria is None else vitoria
+                contagem = inimigos.get(inimigo)
+                if contagem is None:
+                    contagem = inimigos[inimigo] = [0, 0]
+                contagem[0] += 1
+                if vitoria is not None:
+                    contagem[1] += 1
+                missao = missoes.pop(canal, None)
+                if missao is not None and missao[1] is not None:
+                    self.turnos.adicionar(int(missao[1]))
+
+        self.linhas += linhas
+        self.golpes += golpes
+        self.criticos += criticos
+        self.xp += xp_total
+        if hora is not None:
+            if self.primeira_hora is None:
+                self.primeira_hora = primeira
+            self.ultima_hora = hora
+
+    def to_dict(self):
+        """
+        Monta o relatório.
+
+        Returns:
+            dict: Estatísticas agregadas do log
+        """
+        horas = None
+        if self.primeira_hora is not None:
+            inicio, fim = (datetime.strptime(h.decode(), "%Y-%m-%d %H:%M:%S")
+                           for h in (self.primeira_hora, self.ultima_hora))
+            horas = (fim - inicio).total_seconds() / 3600
+
+        return {
+            "eventos": self.linhas,
+            "inicio": self.primeira_hora.decode() if self.primeira_hora else None,
+            "fim": self.ultima_hora.decode() if self.ultima_hora else None,
+            "inimigos": {
+                inimigo.decode("utf-8", "replace"): {
+                    "missoes": missoes, "vitorias": vitorias, "taxa_vitoria": vitorias / missoes}
+                for inimigo, (missoes, vitorias) in sorted(self.inimigos.items())
+            },
+            "dano_jogador_por_turno": self.dano_jogador.to_dict(self.percentis),
+            "dano_inimigo_por_turno": self.dano_inimigo.to_dict(self.percentis),
+            "turnos_por_missao": self.turnos.to_dict(self.percentis),
+            "golpes": self.golpes,
+            "criticos": self.criticos,
+            "taxa_critico": self.criticos / self.golpes if self.golpes else None,
+            "xp_total": self.xp,
+            "xp_por_hora": self.xp / horas if horas else None,
+        }
+
+
+def _blocos(caminho, usar_mmap=True):
+    """Lê um arquivo de log (comprimido ou não) em blocos de linhas completas."""
+    if caminho.endswith(".gz"):
+        arquivo = gzip.open(caminho, 'rb')
+    else:
+        try:
+            arquivo = open(caminho, 'rb')
+        except FileNotFoundError:
+            # Segmento comprimido depois de listado
+            caminho += ".gz"
+            arquivo = gzip.open(caminho, 'rb')
+
+    with arquivo:
+        if usar_mmap and not caminho.endswith(".gz"):
+            if os.fstat(arquivo.fileno()).st_size == 0:
+                return
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                yield mapa
+            return
+
+        resto = b""
+        while True:
+            bloco = arquivo.read(_BLOCO)
+            if not bloco:
+                break
+            fim = bloco.rfind(b"\n") + 1
+            if fim:
+                yield resto + bloco[:fim]
+                resto = bloco[fim:]
+            else:
+                resto += bloco
+        if resto:
+            yield resto
+
+
+def analisar_log(arquivo_log="jogo.log", rotacionados=True, usar_mmap=True, percentis=PERCENTIS):
+    """
+    Analisa um log e os seus segmentos rotacionados, em ordem.
+
+    Args:
+        arquivo_log (str): Caminho do log atual
+        rotacionados (bool): Se False, analisa só o arquivo atual
+        usar_mmap (bool): Lê os arquivos não comprimidos por mmap
+        percentis (tuple): Percentis estimados para cada distribuição
+
+    Returns:
+        dict: Relatório de AnaliseLog.to_dict()
+    """
+    caminhos = segmentos_log(arquivo_log) if rotacionados else []
+    if os.path.exists(arquivo_log):
+        caminhos.append(arquivo_log)
+    analise = AnaliseLog(percentis)
+    for caminho in caminhos:
+        for bloco in _blocos(caminho, usar_mmap):
+            analise.alimentar(bloco)
+    return analise.to_dict()
+
+
+def _formatar(valor):
+    if valor is None:
+        return "-"
+    return f"{valor:.2f}" if isinstance(valor, float) else str(valor)
+
+
+def exibir_relatorio(relatorio, saida=print):
+    """Exibe o relatório em texto."""
+    saida(f"Eventos: {relatorio['eventos']} ({relatorio['inicio'] or '-'} a {relatorio['fim'] or '-'})")
+    saida(f"\n{'Inimigo':<20} {'Missões':>8} {'Vitórias':>9} {'Taxa':>7}")
+    for inimigo, dados in relatorio["inimigos"].items():
+        saida(f"{inimigo:<20} {dados['missoes']:>8} {dados['vitorias']:>9} {dados['taxa_vitoria']:>7.1%}")
+
+    saida(f"\n{'Distribuição':<24} {'N':>8} {'Média':>8} {'Mín':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'Máx':>6}")
+    for chave in ("dano_jogador_por_turno", "dano_inimigo_por_turno", "turnos_por_missao"):
+        d = relatorio[chave]
+        saida(f"{chave:<24} {d['contagem']:>8} {_formatar(d['media']):>8} {_formatar(d['min']):>6} "
+              f"{_formatar(d.get('p50')):>8} {_formatar(d.get('p90')):>8} {_formatar(d.get('p99')):>8} "
+              f"{_formatar(d['max']):>6}")
+
+    taxa = relatorio["taxa_critico"]
+    saida(f"\nCríticos: {relatorio['criticos']} de {relatorio['golpes']} golpes"
+          f" ({'-' if taxa is None else f'{taxa:.1%}'})")
+    saida(f"XP: {relatorio['xp_total']} ({_formatar(relatorio['xp_por_hora'])} por hora)")
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Estatísticas dos logs do jogo")
+    parser.add_argument("arquivo", nargs="?", default="jogo.log", help="log atual (padrão: jogo.log)")
+    parser.add_argument("--sem-mmap", action="store_true", help="lê em blocos em vez de usar mmap")
+    parser.add_argument("--so-atual", action="store_true", help="ignora os segmentos rotacionados")
+    parser.add_argument("--json", action="store_true", help="exibe o relatório em JSON")
+    args = parser.parse_args(argv)
+
+    relatorio = analisar_log(args.arquivo, rotacionados=not args.so_atual, usar_mmap=not args.sem_mmap)
+    if args.json:
+        print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    else:
+        exibir_relatorio(relatorio)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
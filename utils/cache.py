@@ -0,0 +1,82 @@
+"""
+Módulo que implementa um cache LRU (menos usado recentemente) com
+capacidade limitada e contadores de acertos, falhas e remoções.
+"""
+
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache de tamanho limitado: ao atingir a capacidade, remove a entrada
+    usada há mais tempo.
+    """
+
+    def __init__(self, capacidade=256):
+        """
+        Inicializa o cache.
+
+        Args:
+            capacidade (int): Número máximo de entradas
+        """
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser >= 1")
+        self.capacidade = capacidade
+        self._entradas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave, calcular):
+        """
+        Retorna o valor da chave, calculando-o (e guardando) se não estiver no cache.
+
+        Args:
+            chave: Chave (hashable)
+            calcular (callable): Função sem argumentos que produz o valor
+
+        Returns:
+            O valor associado à chave
+        """
+        try:
+            valor = self._entradas[chave]
+        except KeyError:
+            self.falhas += 1
+            valor = calcular()
+            self._entradas[chave] = valor
+            if len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+                self.remocoes += 1
+            return valor
+
+        self.acertos += 1
+        self._entradas.move_to_end(chave)
+        return valor
+
+    def __contains__(self, chave):
+        return chave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def limpar(self):
+        """Remove todas as entradas e zera os contadores."""
+        self._entradas.clear()
+        self.acertos = self.falhas = self.remocoes = 0
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: tamanho, capacidade, acertos, falhas, remocoes e taxa_acerto
+        """
+        consultas = self.acertos + self.falhas
+        return {
+            "tamanho": len(self._entradas),
+            "capacidade": self.capacidade,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0
+        }
@@ -1,7 +1,14 @@
+import asyncio
 import random
+import sys
 import time
 from typing import Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: só é necessário para a API em lote
+    np = None
+
 
 def is_critico(chance: float, rng: Optional[random.Random] = None) -> bool:
     """
@@ -18,22 +25,59 @@ def is_critico(chance: float, rng: Optional[random.Random] = None) -> bool:
     return rng.random() <= chance
 
 
-def _animacao_critico(speed: float = 0.05, length: int = 8) -> None:
+# Gerador próprio da animação: os efeitos são só estéticos e não devem
+# consumir sorteios do gerador global, que reproduz os combates (replays)
+_rng_animacao = random.Random()
+
+
+def _frames_critico(length: int):
     """
-    Pequena animação estética. `speed` controla a velocidade entre frames.
+    Gera os quadros da animação de crítico: a cada quadro a linha ganha um efeito.
     """
 
     efeitos = ["⚡", "✨", "💥", "🔥", "⚔️", "💫"]
     linha = ""
 
     for _ in range(length):
-        linha += random.choice(efeitos)
+        linha += _rng_animacao.choice(efeitos)
+        yield linha
+
+
+def _animacao_critico(speed: float = 0.05, length: int = 8) -> None:
+    """
+    Pequena animação estética. `speed` controla a velocidade entre frames.
+    """
+
+    for linha in _frames_critico(length):
         print(f"\r{linha}", end="", flush=True)
         time.sleep(speed)
 
     print()
 
 
+def _escrever_console(texto: str) -> None:
+    sys.stdout.write(texto)
+    sys.stdout.flush()
+
+
+async def animacao_critico_async(speed: float = 0.05, length: int = 8, escrever=None) -> None:
+    """
+    Versão assíncrona de `_animacao_critico`: entre os frames o controle volta
+    para o loop de eventos (`asyncio.sleep`), então a animação pode rodar como
+    tarefa em segundo plano enquanto a entrada e o combate continuam.
+
+    - `escrever`: função que recebe o texto de cada frame (padrão: stdout).
+    """
+
+    escrever = escrever or _escrever_console
+
+    for linha in _frames_critico(length):
+        escrever(f"\r{linha}")
+        await asyncio.sleep(speed)
+
+    escrever("\n")
+
+
 def calcular_critico(
     dano_base: int,
     chance: float = 0.20,
@@ -90,6 +134,53 @@ def calcular_critico(
     return dano_final, True
 
 
+def calcular_critico_batch(
+    danos,
+    chance: float = 0.20,
+    multiplicador: float = 1.8,
+    mode: str = "multiply",
+    rng=None,
+):
+    """
+    Versão vetorizada de `calcular_critico` para muitos danos de uma vez.
+
+    Os parâmetros são validados uma única vez e todos os sorteios são feitos
+    com uma única chamada ao gerador. Não há animação nem mensagens.
+
+    Parâmetros:
+    - `danos`: array (ou sequência) NumPy de danos base inteiros, >= 0.
+    - `chance`, `multiplicador`, `mode`: mesmos significados de `calcular_critico`.
+    - `rng`: `numpy.random.Generator` para testes determinísticos.
+
+    Retorna uma tupla `(danos_finais, criticos)`, onde `criticos` é a máscara
+    booleana dos acertos críticos. Requer NumPy.
+    """
+
+    if np is None:
+        raise ImportError("calcular_critico_batch requer o pacote numpy")
+
+    if not 0.0 <= chance <= 1.0:
+        raise ValueError("chance deve estar entre 0.0 e 1.0")
+
+    if mode not in ("multiply", "add"):
+        raise ValueError("mode deve ser 'multiply' ou 'add'")
+
+    danos = np.asarray(danos, dtype=np.int64)
+    if danos.size and danos.min() < 0:
+        raise ValueError("danos devem ser >= 0")
+
+    rng = rng if rng is not None else np.random.default_rng()
+    criticos = rng.random(danos.shape) <= chance
+
+    if mode == "multiply":
+        # int() trunca em direção a zero; como os danos são >= 0, equivale a floor
+        amplificados = np.floor(danos * multiplicador).astype(np.int64)
+    else:  # add
+        amplificados = danos + int(multiplicador)
+
+    return np.where(criticos, amplificados, danos), criticos
+
+
 if __name__ == "__main__":
     # Demo rápido quando executado diretamente
     print("Demo: calcular_critico")
@@ -0,0 +1,513 @@
+"""
+Módulo com o registro estruturado de eventos do jogo: cada evento do
+combate é gravado como um registro binário de tamanho fixo, sem montar
+texto nem timestamp formatado, e o texto do jogo.log passa a ser uma visão
+opcional sobre os mesmos eventos (formatar_evento, em utils.tipos_evento).
+
+Layout do arquivo de eventos:
+    cabeçalho   "RPGE", versão (1 byte) e preenchimento até 32 bytes
+    registros   32 bytes cada, little-endian e alinhados:
+                tempo (time.monotonic_ns, int64), quantidade (int64),
+                missão (uint32), ator (uint32), alvo (uint32),
+                turno (uint16), tipo (uint8), flags (uint8)
+
+Ator e alvo são índices da tabela de nomes, gravada à parte em
+"<arquivo>.nomes" (uma string JSON por linha; o índice 0 é o nome vazio).
+As mensagens livres (MENSAGEM) não entram na tabela, que só cresce com os
+nomes de personagens, inimigos e missões: o texto é acrescentado a
+"<arquivo>.mensagens" (UTF-8, sem separadores) e o registro guarda a
+posição (quantidade) e o tamanho em bytes (alvo).
+Como os registros têm tamanho fixo, o arquivo pode ser mapeado em memória
+e lido como um array (numpy, quando disponível) sem decodificar nada.
+
+O tempo é o relógio monotônico; um registro RELOGIO, gravado a cada
+abertura do arquivo, guarda o par (monotônico, time.time_ns) usado para
+converter os tempos seguintes em data e hora.
+
+Uso:
+    python -m utils.eventos [eventos.bin] [--texto] [--json]
+"""
+
+import argparse
+import atexit
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from utils.tipos_evento import (ATAQUE, CRITICO, DERROTA, HABILIDADE, INICIO, INIMIGO, MENSAGEM, RECOMPENSA,
+                                RELOGIO, VITORIA, formatar_evento)
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: a leitura cai para struct.iter_unpack
+    np = None
+
+
+MAGICO = b"RPGE"
+# Versão 2: o texto das mensagens livres fica em "<arquivo>.mensagens"
+VERSAO = 2
+# Versões que o leitor entende (na 1 o texto das mensagens está na tabela de nomes)
+VERSOES_LEGIVEIS = (1, 2)
+
+_CABECALHO = struct.Struct("<4sB27x")
+_REGISTRO = struct.Struct("<qqIIIHBB")
+TAMANHO_REGISTRO = _REGISTRO.size
+
+_FIM_MISSAO = (RECOMPENSA, DERROTA)
+
+if np is not None:
+    DTYPE = np.dtype([("tempo", "<i8"), ("quantidade", "<i8"), ("missao", "<u4"), ("ator", "<u4"),
+                      ("alvo", "<u4"), ("turno", "<u2"), ("tipo", "u1"), ("flags", "u1")])
+else:
+    DTYPE = None
+
+
+def _caminho_nomes(arquivo):
+    return arquivo + ".nomes"
+
+
+def _caminho_mensagens(arquivo):
+    return arquivo + ".mensagens"
+
+
+def _ler_nomes(arquivo):
+    """
+    Lê a tabela de nomes, descartando uma linha final interrompida.
+
+    Returns:
+        tuple: (lista de nomes, bytes íntegros do arquivo)
+    """
+    nomes, fim = [], 0
+    try:
+        with open(_caminho_nomes(arquivo), 'rb') as f:
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                try:
+                    nomes.append(json.loads(linha))
+                except ValueError:
+                    break
+                fim += len(linha)
+    except FileNotFoundError:
+        pass
+    return nomes, fim
+
+
+class RegistroEventos:
+    """
+    Destino estruturado dos eventos do jogo, com a interface de logger:
+    o Combate envia os eventos por `evento` e o Jogo as demais mensagens
+    por `registrar`. Pode ser passado como `logger` ao Jogo e às missões.
+
+    Cada evento é empacotado em um buffer pré-alocado e o buffer é gravado
+    (uma única escrita) ao fim de cada missão, quando enche, em
+    `descarregar` e em `fechar` (este último também na saída normal do
+    interpretador). Um crash do processo perde no máximo os eventos da
+    missão em andamento. Os nomes novos e o texto das mensagens são
+    gravados nos seus arquivos antes de qualquer registro que os use.
+
+    Os identificadores de missão são sequenciais por arquivo: um registro
+    deve ser usado por um jogo de cada vez.
+    """
+
+    def __init__(self, arquivo="eventos.bin", texto=None, tamanho_buffer=4096):
+        """
+        Abre (ou cria) o arquivo de eventos.
+
+        Args:
+            arquivo (str): Caminho do arquivo de eventos
+            texto (optional): Logger que também recebe cada evento como
+                texto (a visão legível; None para gravar só os eventos)
+            tamanho_buffer (int): Número de eventos mantidos em memória
+        """
+        self.arquivo = arquivo
+        self.texto = texto
+        self._buffer = bytearray(tamanho_buffer * TAMANHO_REGISTRO)
+        self._posicao = 0
+        self.missao = 0
+        self._arquivo = None
+        self._arquivo_nomes = None
+        self._arquivo_mensagens = None
+        self._abrir()
+        nomes, fim = _ler_nomes(arquivo)
+        self._arquivo_nomes = open(_caminho_nomes(arquivo), 'ab', buffering=0)
+        self._arquivo_nomes.truncate(fim)
+        # Um texto gravado sem o seu registro (crash antes de descarregar)
+        # só ocupa espaço: nenhum registro aponta para ele
+        self._arquivo_mensagens = open(_caminho_mensagens(arquivo), 'ab', buffering=0)
+        self._tamanho_mensagens = self._arquivo_mensagens.seek(0, os.SEEK_END)
+        # nome -> índice na tabela
+        self._nomes = {}
+        for indice, nome in enumerate(nomes):
+            self._nomes.setdefault(nome, indice)
+        self._proximo_nome = len(nomes)
+        if not nomes:
+            self._novo_nome("")
+        self._anexar(RELOGIO, 0, 0, 0, time.time_ns())
+        atexit.register(self.fechar)
+
+    def _abrir(self):
+        """Abre o arquivo para acréscimos, descartando um registro final incompleto."""
+        if not os.path.exists(self.arquivo) or os.path.getsize(self.arquivo) == 0:
+            with open(self.arquivo, 'wb') as f:
+                f.write(_CABECALHO.pack(MAGICO, VERSAO))
+        else:
+            with open(self.arquivo, 'r+b') as f:
+                cabecalho = f.read(_CABECALHO.size)
+                if len(cabecalho) < _CABECALHO.size or _CABECALHO.unpack(cabecalho) != (MAGICO, VERSAO):
+                    raise ValueError(f"{self.arquivo} não é um arquivo de eventos")
+                tamanho = os.fstat(f.fileno()).st_size
+                registros = (tamanho - _CABECALHO.size) // TAMANHO_REGISTRO
+                fim = _CABECALHO.size + registros * TAMANHO_REGISTRO
+                if fim < tamanho:
+                    f.truncate(fim)
+                if registros:
+                    # Os registros estão em ordem: o último tem a maior missão
+                    f.seek(fim - TAMANHO_REGISTRO)
+                    self.missao = _REGISTRO.unpack(f.read(TAMANHO_REGISTRO))[2]
+        self._arquivo = open(self.arquivo, 'ab', buffering=0)
+
+    def _novo_nome(self, nome):
+        """Acrescenta um nome à tabela e devolve o seu índice."""
+        indice = self._proximo_nome
+        linha = json.dumps(nome, ensure_ascii=False).encode("utf-8") + b"\n"
+        if self._arquivo_nomes is not None:
+            self._arquivo_nomes.write(linha)
+        else:
+            with open(_caminho_nomes(self.arquivo), 'ab') as f:
+                f.write(linha)
+        self._nomes[nome] = indice
+        self._proximo_nome += 1
+        return indice
+
+    def _anexar(self, tipo, turno, ator, alvo, quantidade, flags=0):
+        """Empacota um registro no buffer."""
+        if self._posicao == len(self._buffer):
+            self.descarregar()
+        _REGISTRO.pack_into(self._buffer, self._posicao, time.monotonic_ns(), quantidade, self.missao,
+                            ator, alvo, turno, tipo, flags)
+        self._posicao += TAMANHO_REGISTRO
+
+    def evento(self, tipo, turno, ator, quantidade=0, alvo="", flags=0):
+        """
+        Registra um evento do combate (argumentos de formatar_evento).
+        """
+        nomes = self._nomes
+        id_ator = nomes.get(ator)
+        if id_ator is None:
+            id_ator = self._novo_nome(ator)
+        id_alvo = nomes.get(alvo)
+        if id_alvo is None:
+            id_alvo = self._novo_nome(alvo)
+        if tipo == INICIO:
+            self.missao += 1
+        self._anexar(tipo, turno or 0, id_ator, id_alvo, quantidade, flags)
+        if self.texto is not None:
+            self.texto.registrar(formatar_evento(tipo, turno, ator, quantidade, alvo, flags))
+        if tipo in _FIM_MISSAO or self._arquivo is None:
+            self.descarregar()
+
+    def registrar(self, mensagem):
+        """
+        Registra uma mensagem livre (ex.: "Jogo salvo: Nome").
+
+        Args:
+            mensagem (str): Mensagem a ser registrada
+        """
+        dados = mensagem.encode("utf-8")
+        posicao = self._tamanho_mensagens
+        if self._arquivo_mensagens is not None:
+            self._arquivo_mensagens.write(dados)
+        else:
+            with open(_caminho_mensagens(self.arquivo), 'ab') as f:
+                f.write(dados)
+        self._tamanho_mensagens += len(dados)
+        self._anexar(MENSAGEM, 0, 0, len(dados), posicao)
+        if self.texto is not None:
+            self.texto.registrar(mensagem)
+        if self._arquivo is None:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava os eventos do buffer no arquivo."""
+        if not self._posicao:
+            return
+        try:
+            with memoryview(self._buffer) as visao:
+                if self._arquivo is not None:
+                    self._arquivo.write(visao[:self._posicao])
+                else:
+                    # Depois de fechado, cada evento é gravado na hora
+                    with open(self.arquivo, 'ab') as f:
+                        f.write(visao[:self._posicao])
+        except Exception as e:
+            print(f"Erro ao gravar os eventos: {e}")
+        self._posicao = 0
+
+    def fechar(self):
+        """Grava os eventos pendentes e fecha os arquivos."""
+        if self._arquivo is None:
+            return
+        self.descarregar()
+        self._arquivo.close()
+        self._arquivo_nomes.close()
+        self._arquivo_mensagens.close()
+        self._arquivo = self._arquivo_nomes = self._arquivo_mensagens = None
+        atexit.unregister(self.fechar)
+
+
+class LeitorEventos:
+    """
+    Leitura de um arquivo de eventos por mmap. `array()` devolve os
+    registros como um array estruturado do numpy sobre o próprio mapa (sem
+    cópia); `registros()` os percorre como tuplas com struct.iter_unpack.
+    """
+
+    def __init__(self, arquivo="eventos.bin"):
+        """
+        Abre e mapeia o arquivo.
+
+        Raises:
+            ValueError: Se o arquivo não é um arquivo de eventos
+        """
+        self.arquivo = arquivo
+        self.nomes = _ler_nomes(arquivo)[0]
+        with open(arquivo, 'rb') as f:
+            tamanho = os.fstat(f.fileno()).st_size
+            if tamanho < _CABECALHO.size:
+                raise ValueError(f"{arquivo} não é um arquivo de eventos")
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, self.versao = _CABECALHO.unpack_from(self._mapa)
+        if magico != MAGICO or self.versao not in VERSOES_LEGIVEIS:
+            self._mapa.close()
+            raise ValueError(f"{arquivo} não é um arquivo de eventos")
+        try:
+            with open(_caminho_mensagens(arquivo), 'rb') as f:
+                self._mensagens = f.read()
+        except FileNotFoundError:
+            self._mensagens = b""
+        # Um registro final incompleto (escrita interrompida) é ignorado
+        self.quantidade = (tamanho - _CABECALHO.size) // TAMANHO_REGISTRO
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self):
+        return self.quantidade
+
+    def registros(self):
+        """Tuplas (tempo, quantidade, missão, ator, alvo, turno, tipo, flags)."""
+        fim = _CABECALHO.size + self.quantidade * TAMANHO_REGISTRO
+        return _REGISTRO.iter_unpack(memoryview(self._mapa)[_CABECALHO.size:fim])
+
+    def array(self):
+        """
+        Os registros como array estruturado (campos de DTYPE), ou None sem
+        numpy. O array aponta para o mapa: copie-o para usá-lo depois de
+        fechar o leitor.
+        """
+        if np is None:
+            return None
+        return np.frombuffer(self._mapa, dtype=DTYPE, count=self.quantidade, offset=_CABECALHO.size)
+
+    def nome(self, indice):
+        """Nome da tabela (ou "?" se a tabela não chegou a ser gravada)."""
+        return self.nomes[indice] if indice < len(self.nomes) else "?"
+
+    def mensagem(self, posicao, tamanho):
+        """Texto de uma mensagem livre (ou "?" se o texto não chegou a ser gravado)."""
+        if posicao + tamanho > len(self._mensagens):
+            return "?"
+        return self._mensagens[posicao:posicao + tamanho].decode("utf-8")
+
+    def linhas(self):
+        """
+        A visão em texto: as linhas que o jogo.log teria, com timestamp.
+
+        Yields:
+            str: "[AAAA-MM-DD HH:MM:SS] mensagem"
+        """
+        nome = self.nome
+        referencia = 0
+        for tempo, quantidade, _, ator, alvo, turno, tipo, flags in self.registros():
+            if tipo == RELOGIO:
+                referencia = quantidade - tempo
+                continue
+            hora = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime((referencia + tempo) // 1_000_000_000))
+            if tipo == MENSAGEM and self.versao >= 2:
+                yield f"[{hora}] {self.mensagem(quantidade, alvo)}"
+            else:
+                yield f"[{hora}] {formatar_evento(tipo, turno, nome(ator), quantidade, nome(alvo), flags)}"
+
+    def fechar(self):
+        """Desfaz o mapeamento (adiado pelo Python enquanto houver arrays sobre ele)."""
+        try:
+            self._mapa.close()
+        except BufferError:
+            pass
+
+
+def _horario(ns):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ns // 1_000_000_000))
+
+
+def _relatorio(leitor, percentis, eventos, inimigos, dano_jogador, dano_inimigo, turnos,
+               golpes, criticos, xp, inicio, fim):
+    """Monta o relatório no formato de AnaliseLog.to_dict()."""
+    horas = (fim - inicio) / 3.6e12 if inicio is not None else None
+    return {
+        "eventos": eventos,
+        "inicio": _horario(inicio) if inicio is not None else None,
+        "fim": _horario(fim) if fim is not None else None,
+        "inimigos": {
+            inimigo: {"missoes": missoes, "vitorias": vitorias, "taxa_vitoria": vitorias / missoes}
+            for inimigo, (missoes, vitorias) in sorted(
+                (leitor.nome(indice), contagem) for indice, contagem in inimigos.items())
+        },
+        "dano_jogador_por_turno": dano_jogador.to_dict(percentis),
+        "dano_inimigo_por_turno": dano_inimigo.to_dict(percentis),
+        "turnos_por_missao": turnos.to_dict(percentis),
+        "golpes": golpes,
+        "criticos": criticos,
+        "taxa_critico": criticos / golpes if golpes else None,
+        "xp_total": xp,
+        "xp_por_hora": xp / horas if horas else None,
+    }
+
+
+def _analisar_array(leitor, percentis):
+    """Relatório calculado com operações vetorizadas do numpy."""
+    from utils.analise_log import SketchQuantis
+    registros = leitor.array()
+    tipo = registros["tipo"]
+    relogios = np.flatnonzero(tipo == RELOGIO)
+    eventos = np.flatnonzero(tipo > MENSAGEM)
+    inicio = fim = None
+    if eventos.size:
+        # Relógio em vigor no primeiro e no último evento
+        def horario(i):
+            r = relogios[np.searchsorted(relogios, i) - 1]
+            return int(registros["quantidade"][r]) + int(registros["tempo"][i]) - int(registros["tempo"][r])
+        inicio, fim = horario(eventos[0]), horario(eventos[-1])
+
+    golpe = (tipo == ATAQUE) | (tipo == HABILIDADE)
+    do_inimigo = golpe & (registros["flags"] & INIMIGO != 0)
+    do_jogador = golpe & ~do_inimigo
+    dano_jogador, dano_inimigo, turnos = SketchQuantis(), SketchQuantis(), SketchQuantis()
+    for sketch, selecao in ((dano_jogador, do_jogador), (dano_inimigo, do_inimigo)):
+        valores, contagens = np.unique(registros["quantidade"][selecao], return_counts=True)
+        sketch.adicionar_contagens(valores.tolist(), contagens.tolist())
+
+    finais = (tipo == VITORIA) | (tipo == DERROTA)
+    inimigos = {}
+    chaves, indices = np.unique(registros["alvo"][finais], return_inverse=True)
+    missoes = np.bincount(indices, minlength=chaves.size)
+    vitorias = np.bincount(indices, weights=tipo[finais] == VITORIA, minlength=chaves.size)
+    for chave, total, venceu in zip(chaves.tolist(), missoes.tolist(), vitorias.tolist()):
+        inimigos[chave] = (total, int(venceu))
+
+    # Turnos: o turno do último golpe de cada missão encerrada
+    missao_golpe = registros["missao"][golpe][::-1]
+    if missao_golpe.size:
+        ids, ultimo = np.unique(missao_golpe, return_index=True)
+        encerrada = np.isin(ids, registros["missao"][finais])
+        valores, contagens = np.unique(registros["turno"][golpe][::-1][ultimo][encerrada], return_counts=True)
+        turnos.adicionar_contagens(valores.tolist(), contagens.tolist())
+
+    return _relatorio(leitor, percentis, int(eventos.size), inimigos, dano_jogador, dano_inimigo, turnos,
+                      int(do_jogador.sum()), int((do_jogador & (registros["flags"] & CRITICO != 0)).sum()),
+                      int(registros["quantidade"][tipo == RECOMPENSA].sum()), inicio, fim)
+
+
+def _analisar_registros(leitor, percentis):
+    """Relatório calculado percorrendo os registros (sem numpy)."""
+    from utils.analise_log import SketchQuantis
+    dano_jogador, dano_inimigo, turnos = SketchQuantis(), SketchQuantis(), SketchQuantis()
+    inimigos = {}
+    # missão -> turno do último golpe
+    ultimos = {}
+    eventos = golpes = criticos = xp = 0
+    referencia = 0
+    inicio = fim = None
+    for tempo, quantidade, missao, _, alvo, turno, tipo, flags in leitor.registros():
+        if tipo == RELOGIO:
+            referencia = quantidade - tempo
+            continue
+        if tipo == MENSAGEM:
+            continue
+        eventos += 1
+        fim = referencia + tempo
+        if inicio is None:
+            inicio = fim
+        if tipo == ATAQUE or tipo == HABILIDADE:
+            ultimos[missao] = turno
+            if flags & INIMIGO:
+                dano_inimigo.adicionar(quantidade)
+            else:
+                dano_jogador.adicionar(quantidade)
+                golpes += 1
+                if flags & CRITICO:
+                    criticos += 1
+        elif tipo == RECOMPENSA:
+            xp += quantidade
+        elif tipo == VITORIA or tipo == DERROTA:
+            total, vitorias = inimigos.get(alvo, (0, 0))
+            inimigos[alvo] = (total + 1, vitorias + (tipo == VITORIA))
+            if missao in ultimos:
+                turnos.adicionar(ultimos.pop(missao))
+    return _relatorio(leitor, percentis, eventos, inimigos, dano_jogador, dano_inimigo, turnos,
+                      golpes, criticos, xp, inicio, fim)
+
+
+def analisar_eventos(arquivo="eventos.bin", percentis=None):
+    """
+    Analisa um arquivo de eventos, com o mesmo relatório de
+    utils.analise_log.analisar_log (vetorizado com numpy, se disponível).
+
+    Args:
+        arquivo (str): Caminho do arquivo de eventos
+        percentis (tuple, optional): Percentis estimados para cada
+            distribuição (padrão: utils.analise_log.PERCENTIS)
+
+    Returns:
+        dict: Relatório no formato de AnaliseLog.to_dict()
+    """
+    if percentis is None:
+        from utils.analise_log import PERCENTIS as percentis
+    with LeitorEventos(arquivo) as leitor:
+        if np is not None:
+            return _analisar_array(leitor, percentis)
+        return _analisar_registros(leitor, percentis)
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Relatório e visão em texto dos eventos do jogo")
+    parser.add_argument("arquivo", nargs="?", default="eventos.bin", help="arquivo de eventos (padrão: eventos.bin)")
+    parser.add_argument("--texto", action="store_true", help="exibe os eventos como as linhas do jogo.log")
+    parser.add_argument("--json", action="store_true", help="exibe o relatório em JSON")
+    args = parser.parse_args(argv)
+
+    if args.texto:
+        with LeitorEventos(args.arquivo) as leitor:
+            for linha in leitor.linhas():
+                print(linha)
+        return 0
+
+    relatorio = analisar_eventos(args.arquivo)
+    if args.json:
+        print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    else:
+        from utils.analise_log import exibir_relatorio
+        exibir_relatorio(relatorio)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+Módulo com o índice de saves de um diretório: um arquivo com um registro de
+tamanho fixo por personagem salvo (nome, classe, nível, arquivo, offset e
+mtime), para listar, ordenar e buscar saves sem abrir cada um deles.
+
+O índice é lido por mmap e os personagens só são construídos quando
+escolhidos (hidratar). Um Repositorio criado com indice=... atualiza o seu
+registro a cada salvar, no lugar, sem reescrever o índice. Antes de cada
+consulta o mtime dos saves no diretório é comparado com o do índice: se algo
+mudou por fora (arquivo novo, removido ou editado, ou índice corrompido), o
+índice é reconstruído, reaproveitando os registros dos arquivos inalterados.
+
+São indexados os saves avulsos (.json, .sav e .bin, em qualquer formato do
+Repositorio) e os rosters em JSONL (.jsonl, um registro por linha, com o
+offset da linha no arquivo).
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from utils.repositorio import Repositorio
+
+
+MAGICO = b"RPGI"
+VERSAO = 1
+
+# mágico, versão, quantidade de registros
+_CABECALHO = struct.Struct("<4sB3xQ")
+# nome, classe, arquivo (relativo ao diretório), flags, nível, offset, mtime (ns)
+_REGISTRO = struct.Struct("<64s16s255sBiqq")
+
+# Registro de um personagem (os demais só marcam arquivos sem personagens
+# válidos, para que não sejam reindexados a cada consulta)
+_VALIDO = 1
+
+
+def _texto_fixo(texto, tamanho):
+    """Codifica um texto para um campo de tamanho fixo, truncando em um caractere inteiro."""
+    return texto.encode("utf-8")[:tamanho].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _texto(campo):
+    """Decodifica um campo de texto de tamanho fixo."""
+    return campo.rstrip(b"\0").decode("utf-8")
+
+
+class IndiceSaves:
+    """
+    Índice dos saves de um diretório, com listagem, busca e carregamento
+    sob demanda (mesmas consultas de RepositorioSQLite).
+    """
+
+    NOME_INDICE = ".indice-saves"
+    EXTENSOES_SAVE = (".json", ".sav", ".bin")
+    EXTENSAO_ROSTER = ".jsonl"
+
+    def __init__(self, diretorio, arquivo_indice=None):
+        """
+        Inicializa o índice. O arquivo só é criado na primeira consulta ou
+        salvamento.
+
+        Args:
+            diretorio (str): Diretório dos saves
+            arquivo_indice (str, optional): Caminho do arquivo de índice
+                (padrão: .indice-saves dentro do diretório)
+        """
+        self.diretorio = diretorio
+        self.arquivo_indice = arquivo_indice or os.path.join(diretorio, self.NOME_INDICE)
+        # (arquivo, offset) -> posição do registro, carregado sob demanda
+        self._posicoes = None
+        # Quantas vezes o índice foi reconstruído por esta instância
+        self.reconstrucoes = 0
+
+    def repositorio(self, nome_arquivo, formato="json"):
+        """
+        Cria um Repositorio para um save deste diretório, que mantém o índice
+        atualizado a cada salvar.
+
+        Args:
+            nome_arquivo (str): Nome do arquivo de save no diretório
+            formato (str): Formato de gravação: "json" ou "binario"
+
+        Returns:
+            Repositorio: Repositório ligado a este índice
+        """
+        return Repositorio(os.path.join(self.diretorio, nome_arquivo), formato=formato, indice=self)
+
+    # --- leitura e reconstrução ---
+
+    def _arquivos_no_disco(self):
+        """Saves e rosters do diretório, com o mtime (ns) de cada um."""
+        extensoes = self.EXTENSOES_SAVE + (self.EXTENSAO_ROSTER,)
+        arquivos = {}
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(extensoes) and not entrada.name.startswith(".") and entrada.is_file():
+                    arquivos[entrada.name] = entrada.stat().st_mtime_ns
+        return arquivos
+
+    def _ler(self):
+        """
+        Lê os registros do índice (via mmap).
+
+        Returns:
+            list: Tuplas (nome, classe, arquivo, flags, nivel, offset, mtime),
+                ou None se o índice não existe ou está corrompido
+        """
+        try:
+            with open(self.arquivo_indice, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                magico, versao, quantidade = _CABECALHO.unpack_from(mapa, 0)
+                if (magico != MAGICO or versao != VERSAO
+                        or len(mapa) != _CABECALHO.size + quantidade * _REGISTRO.size):
+                    return None
+                with memoryview(mapa) as visao:
+                    return [(_texto(nome), _texto(classe), _texto(arquivo), flags, nivel, offset, mtime)
+                            for nome, classe, arquivo, flags, nivel, offset, mtime
+                            in _REGISTRO.iter_unpack(visao[_CABECALHO.size:])]
+        except (OSError, ValueError, struct.error):
+            # Inexistente, vazio (mmap de tamanho 0), truncado ou com texto inválido
+            return None
+
+    def _sincronizar(self):
+        """Retorna os registros do índice, reconstruindo-o se estiver desatualizado."""
+        registros = self._ler()
+        disco = self._arquivos_no_disco()
+        if registros is not None and {r[2]: r[6] for r in registros} == disco:
+            return registros
+        return self._reconstruir(registros or [], disco)
+
+    def _registro(self, dados, nome_arquivo, offset, mtime):
+        """Monta a tupla de registro de um personagem."""
+        return (dados.get("nome", ""), dados.get("classe", "Guerreiro"), nome_arquivo,
+                _VALIDO, dados.get("nivel", 1), offset, mtime)
+
+    def _indexar_arquivo(self, nome_arquivo, mtime):
+        """Lê um save (ou roster) do diretório e retorna os seus registros."""
+        caminho = os.path.join(self.diretorio, nome_arquivo)
+        registros = []
+        try:
+            with open(caminho, "rb") as f:
+                if nome_arquivo.endswith(self.EXTENSAO_ROSTER):
+                    offset = 0
+                    for linha in f:
+                        if linha.strip():
+                            try:
+                                registros.append(self._registro(json.loads(linha), nome_arquivo, offset, mtime))
+                            except ValueError:
+                                pass
+                        offset += len(linha)
+                else:
+                    registros.append(self._registro(Repositorio.decodificar(f.read()), nome_arquivo, 0, mtime))
+        except (OSError, ValueError, AttributeError):
+            pass
+        # Arquivos sem personagens válidos ficam registrados, só para o controle de mtime
+        return registros or [("", "", nome_arquivo, 0, 0, -1, mtime)]
+
+    def _reconstruir(self, anteriores, disco):
+        """Regrava o índice, reindexando só os arquivos que mudaram."""
+        registros = [r for r in anteriores if disco.get(r[2]) == r[6]]
+        inalterados = {r[2] for r in registros}
+        for nome_arquivo, mtime in sorted(disco.items()):
+            if nome_arquivo not in inalterados:
+                registros.extend(self._indexar_arquivo(nome_arquivo, mtime))
+
+        diretorio = os.path.dirname(os.path.abspath(self.arquivo_indice))
+        fd, temporario = tempfile.mkstemp(prefix=".tmp-", dir=diretorio)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_CABECALHO.pack(MAGICO, VERSAO, len(registros)))
+                f.write(b"".join(map(self._empacotar, registros)))
+            os.replace(temporario, self.arquivo_indice)
+        except BaseException:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            raise
+        self._posicoes = None
+        self.reconstrucoes += 1
+        return registros
+
+    @staticmethod
+    def _empacotar(registro):
+        """Converte uma tupla de registro nos bytes do índice."""
+        nome, classe, arquivo, flags, nivel, offset, mtime = registro
+        return _REGISTRO.pack(_texto_fixo(nome, 64), _texto_fixo(classe, 16), arquivo.encode("utf-8"),
+                              flags, nivel, offset, mtime)
+
+    # --- atualização ---
+
+    def atualizar(self, caminho, dados):
+        """
+        Atualiza (ou acrescenta) o registro de um save avulso do diretório,
+        regravando só aquele registro. Chamado pelo Repositorio após salvar.
+
+        Args:
+            caminho (str): Caminho do arquivo de save
+            dados (dict): Dados salvos, no formato de Personagem.to_dict()
+        """
+        nome_arquivo = os.path.basename(caminho)
+        if (os.path.dirname(os.path.abspath(caminho)) != os.path.abspath(self.diretorio)
+                or not nome_arquivo.endswith(self.EXTENSOES_SAVE)):
+            return
+
+        try:
+            with open(self.arquivo_indice, "r+b") as f:
+                magico, versao, quantidade = _CABECALHO.unpack(f.read(_CABECALHO.size))
+                if self._posicoes is None or len(self._posicoes) != quantidade:
+                    self._posicoes = None
+                    registros = self._ler()
+                    if registros is None:
+                        raise ValueError("índice corrompido")
+                    self._posicoes = {(r[2], r[5]): i for i, r in enumerate(registros)}
+                posicao = self._posicoes.get((nome_arquivo, 0))
+                registro = self._empacotar(self._registro(dados, nome_arquivo, 0, os.stat(caminho).st_mtime_ns))
+                if posicao is None:
+                    posicao = quantidade
+                    os.pwrite(f.fileno(), registro, _CABECALHO.size + posicao * _REGISTRO.size)
+                    os.pwrite(f.fileno(), _CABECALHO.pack(MAGICO, VERSAO, quantidade + 1), 0)
+                    self._posicoes[(nome_arquivo, 0)] = posicao
+                else:
+                    os.pwrite(f.fileno(), registro, _CABECALHO.size + posicao * _REGISTRO.size)
+        except (OSError, ValueError, struct.error):
+            # Sem índice válido: a próxima consulta o reconstrói por inteiro
+            self._posicoes = None
+            self._sincronizar()
+
+    # --- consultas ---
+
+    def _entradas(self, classe=None, nivel_min=None, nivel_max=None):
+        """Registros válidos que atendem aos filtros, como dicionários."""
+        if classe is not None:
+            classe = _texto_fixo(classe, 16).decode("utf-8")
+        return [{"nome": nome, "classe": classe_, "nivel": nivel,
+                 "caminho": os.path.join(self.diretorio, arquivo), "offset": offset, "mtime": mtime / 1e9}
+                for nome, classe_, arquivo, flags, nivel, offset, mtime in self._sincronizar()
+                if flags & _VALIDO
+                and (classe is None or classe_ == classe)
+                and (nivel_min is None or nivel >= nivel_min)
+                and (nivel_max is None or nivel <= nivel_max)]
+
+    def listar(self, classe=None, nivel_min=None, nivel_max=None, ordem="nome", limite=None):
+        """
+        Lista o resumo dos saves lendo só o índice.
+
+        Args:
+            classe (str, optional): Filtra pela classe
+            nivel_min (int, optional): Nível mínimo
+            nivel_max (int, optional): Nível máximo
+            ordem (str): "nome", "nivel" (decrescente) ou "recentes"
+            limite (int, optional): Número máximo de resultados
+
+        Returns:
+            list: Dicionários com nome, classe, nivel, caminho, offset e mtime
+                (nomes com mais de 64 bytes aparecem truncados)
+        """
+        ordens = {
+            "nome": lambda e: (e["nome"], e["caminho"], e["offset"]),
+            "nivel": lambda e: (-e["nivel"], e["nome"], e["caminho"], e["offset"]),
+            "recentes": lambda e: (-e["mtime"], e["caminho"], e["offset"]),
+        }
+        if ordem not in ordens:
+            raise ValueError(f"ordem deve ser uma de {tuple(ordens)}")
+        entradas = sorted(self._entradas(classe, nivel_min, nivel_max), key=ordens[ordem])
+        return entradas if limite is None else entradas[:limite]
+
+    def contar(self, classe=None, nivel_min=None, nivel_max=None):
+        """
+        Conta os saves que atendem aos filtros.
+
+        Returns:
+            int: Quantidade de personagens salvos
+        """
+        return len(self._entradas(classe, nivel_min, nivel_max))
+
+    def hidratar(self, entrada):
+        """
+        Carrega o personagem completo de uma entrada da listagem.
+
+        Args:
+            entrada (dict): Entrada retornada por listar()
+
+        Returns:
+            Personagem: Instância do personagem
+        """
+        with open(entrada["caminho"], "rb") as f:
+            if entrada["caminho"].endswith(self.EXTENSAO_ROSTER):
+                f.seek(entrada["offset"])
+                dados = json.loads(f.readline())
+            else:
+                dados = Repositorio.decodificar(f.read())
+        return Repositorio.construir_personagem(dados)
+
+    def buscar(self, classe=None, nivel_min=None, nivel_max=None):
+        """
+        Carrega, um a um, os personagens que atendem aos filtros.
+
+        Yields:
+            Personagem: Personagens encontrados, em ordem de nome
+        """
+        for entrada in self.listar(classe, nivel_min, nivel_max):
+            yield self.hidratar(entrada)
+
+    def carregar(self, nome=None):
+        """
+        Carrega um personagem pelo nome (o save mais recente, se houver
+        vários) ou, sem nome, o salvo mais recentemente.
+
+        Args:
+            nome (str, optional): Nome do personagem
+
+        Returns:
+            Personagem: Instância do personagem, ou None se não existir
+        """
+        chave = None if nome is None else _texto_fixo(nome, 64).decode("utf-8")
+        for entrada in self.listar(ordem="recentes"):
+            if chave is None or entrada["nome"] == chave:
+                personagem = self.hidratar(entrada)
+                # Nomes longos estão truncados no índice: confirma o nome completo
+                if nome is None or personagem.nome == nome:
+                    return personagem
+        return None
@@ -1,10 +1,201 @@
 """
 Módulo que implementa o sistema de logging do jogo.
-Registra eventos importantes em um arquivo .log
+Registra eventos importantes em um arquivo .log, com rotação opcional por
+tamanho e por tempo (RotacaoLog) e leitura contínua dos segmentos (ler_log).
 """
 
+import atexit
+import gzip
 import os
-from datetime import datetime
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+
+# Sufixo dos segmentos rotacionados: jogo.log.NNNNNNNN-AAAAMMDDTHHMMSSZ[.gz],
+# com um número de sequência crescente (que define a ordem) e a hora em UTC.
+# Os segmentos antigos, só com a hora local (AAAAMMDD-HHMMSS-uuuuuu), vêm antes.
+_SEGMENTO = re.compile(r"\.(?:(\d{8,})-\d{8}T\d{6}Z|(\d{8}-\d{6}-\d{6}))(\.gz)?$")
+
+
+def _segmentos(arquivo_log):
+    """
+    Segmentos rotacionados de um log, do mais antigo ao mais novo.
+    
+    Returns:
+        list: Pares (chave de ordenação, caminho)
+    """
+    diretorio = os.path.dirname(os.path.abspath(arquivo_log))
+    prefixo = os.path.basename(arquivo_log)
+    segmentos = {}
+    for nome in os.listdir(diretorio):
+        if not nome.startswith(prefixo):
+            continue
+        encontrado = _SEGMENTO.fullmatch(nome, len(prefixo))
+        if encontrado is None:
+            continue
+        sequencia, carimbo, comprimido = encontrado.groups()
+        chave = (1, int(sequencia)) if sequencia is not None else (0, carimbo)
+        if comprimido is None or chave not in segmentos:
+            segmentos[chave] = os.path.join(diretorio, nome)
+    return sorted(segmentos.items())
+
+
+def segmentos_log(arquivo_log):
+    """
+    Lista os segmentos rotacionados de um log, do mais antigo ao mais novo.
+    
+    Um segmento que está sendo comprimido pode existir nas duas versões por
+    um instante; nesse caso é listada só a versão sem compressão.
+    
+    Args:
+        arquivo_log (str): Caminho do log atual
+        
+    Returns:
+        list: Caminhos dos segmentos (.gz para os já comprimidos)
+    """
+    return [caminho for _, caminho in _segmentos(arquivo_log)]
+
+
+def _abrir_segmento(caminho):
+    """Abre um segmento (comprimido ou não) para leitura de texto."""
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, 'rt', encoding='utf-8')
+    try:
+        return open(caminho, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        # Foi comprimido depois de listado
+        return gzip.open(caminho + ".gz", 'rt', encoding='utf-8')
+
+
+def ler_log(arquivo_log, rotacionados=True):
+    """
+    Lê as linhas de um log, uma por vez, passando pelos segmentos
+    rotacionados (comprimidos ou não) antes do arquivo atual.
+    
+    Args:
+        arquivo_log (str): Caminho do log atual
+        rotacionados (bool): Se False, lê só o arquivo atual
+        
+    Yields:
+        str: Linhas do log, em ordem cronológica
+    """
+    caminhos = segmentos_log(arquivo_log) if rotacionados else []
+    if os.path.exists(arquivo_log):
+        caminhos.append(arquivo_log)
+    for caminho in caminhos:
+        with _abrir_segmento(caminho) as f:
+            yield from f
+
+
+class RotacaoLog:
+    """
+    Política de rotação de um log: quando o arquivo passa de `tamanho_maximo`
+    bytes, ou depois de `intervalo` segundos, ele é renomeado para um
+    segmento numerado, com a hora em UTC (jogo.log.NNNNNNNN-AAAAMMDDTHHMMSSZ),
+    e um novo arquivo é iniciado. A ordem e a limpeza seguem o número, e
+    não o relógio: mudanças de horário de verão ou ajustes do relógio não
+    embaralham os segmentos. A rotação é verificada depois de cada escrita.
+    
+    A compressão (gzip, gravada em .gz.tmp e renomeada para .gz) e a remoção
+    dos segmentos além dos `manter` mais recentes rodam em uma thread
+    própria, de modo que quem registra nunca espera por elas.
+    """
+    
+    def __init__(self, tamanho_maximo=10 * 1024 * 1024, intervalo=None, manter=5, comprimir=True):
+        """
+        Inicializa a política.
+        
+        Args:
+            tamanho_maximo (int, optional): Tamanho, em bytes, que dispara a rotação
+            intervalo (float, optional): Tempo, em segundos, que dispara a rotação
+            manter (int): Número de segmentos rotacionados mantidos
+            comprimir (bool): Se os segmentos são comprimidos com gzip
+        """
+        if tamanho_maximo is None and intervalo is None:
+            raise ValueError("informe tamanho_maximo e/ou intervalo")
+        if manter < 1:
+            raise ValueError("manter deve ser >= 1")
+        self.tamanho_maximo = tamanho_maximo
+        self.intervalo = intervalo
+        self.manter = manter
+        self.comprimir = comprimir
+        self._inicio = time.monotonic()
+        self._fila = queue.Queue()
+        self._thread = None
+    
+    def deve_rotacionar(self, tamanho):
+        """
+        Verifica se o log atual deve ser rotacionado.
+        
+        Args:
+            tamanho (int): Tamanho atual do arquivo, em bytes
+        """
+        return ((self.tamanho_maximo is not None and tamanho >= self.tamanho_maximo)
+                or (self.intervalo is not None and time.monotonic() - self._inicio >= self.intervalo))
+    
+    def rotacionar(self, arquivo_log):
+        """
+        Renomeia o log atual para um segmento e agenda a compressão e a
+        limpeza dos segmentos antigos. Quem chama inicia o novo arquivo.
+        
+        Args:
+            arquivo_log (str): Caminho do log atual
+            
+        Returns:
+            str: Caminho do segmento criado
+        """
+        existentes = _segmentos(arquivo_log)
+        ultima = existentes[-1][0] if existentes else (0, 0)
+        sequencia = ultima[1] + 1 if ultima[0] == 1 else 1
+        carimbo = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        segmento = f"{arquivo_log}.{sequencia:08d}-{carimbo}"
+        os.replace(arquivo_log, segmento)
+        self._inicio = time.monotonic()
+        
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar, name=f"rotacao:{arquivo_log}", daemon=True)
+            self._thread.start()
+            atexit.register(self.aguardar)
+        self._fila.put((arquivo_log, segmento))
+        return segmento
+    
+    def aguardar(self):
+        """Bloqueia até que as compressões e limpezas agendadas terminem."""
+        self._fila.join()
+    
+    def _executar(self):
+        """Laço da thread de compressão."""
+        while True:
+            arquivo_log, segmento = self._fila.get()
+            try:
+                if self.comprimir:
+                    self._comprimir(segmento)
+                for antigo in segmentos_log(arquivo_log)[:-self.manter]:
+                    os.unlink(antigo)
+            except Exception as e:
+                print(f"Erro ao comprimir o log: {e}")
+            finally:
+                self._fila.task_done()
+    
+    @staticmethod
+    def _comprimir(segmento):
+        """Comprime um segmento em .gz.tmp, renomeia para .gz e remove o original."""
+        temporario = segmento + ".gz.tmp"
+        try:
+            with open(segmento, 'rb') as origem, gzip.open(temporario, 'wb', compresslevel=6) as destino:
+                shutil.copyfileobj(origem, destino, 1 << 20)
+            os.replace(temporario, segmento + ".gz")
+        except BaseException:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            raise
+        os.unlink(segmento)
 
 
 class Logger:
@@ -12,14 +203,18 @@ class Logger:
     Classe responsável por registrar eventos do jogo em arquivo de log.
     """
     
-    def __init__(self, arquivo_log="jogo.log"):
+    def __init__(self, arquivo_log="jogo.log", rotacao=None):
         """
         Inicializa o logger.
         
         Args:
             arquivo_log (str): Nome do arquivo de log
+            rotacao (RotacaoLog, optional): Política de rotação do arquivo
         """
         self.arquivo_log = arquivo_log
+        self.rotacao = rotacao
+        self._segundo_cache = None
+        self._timestamp_cache = ""
         self._criar_arquivo_se_nao_existir()
     
     def _criar_arquivo_se_nao_existir(self):
@@ -30,6 +225,20 @@ class Logger:
                 f.write(f"Iniciado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write("=" * 50 + "\n\n")
     
+    def _timestamp(self):
+        """
+        Retorna o timestamp atual formatado.
+        A formatação só é refeita quando o segundo muda.
+        
+        Returns:
+            str: Timestamp no formato AAAA-MM-DD HH:MM:SS
+        """
+        segundo = int(time.time())
+        if segundo != self._segundo_cache:
+            self._timestamp_cache = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(segundo))
+            self._segundo_cache = segundo
+        return self._timestamp_cache
+    
     def registrar(self, mensagem):
         """
         Registra uma mensagem no arquivo de log.
@@ -37,15 +246,35 @@ class Logger:
         Args:
             mensagem (str): Mensagem a ser registrada
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"[{timestamp}] {mensagem}\n"
+        log_entry = f"[{self._timestamp()}] {mensagem}\n"
         
         try:
             with open(self.arquivo_log, 'a', encoding='utf-8') as f:
                 f.write(log_entry)
+                tamanho = f.tell() if self.rotacao is not None else 0
+            if self.rotacao is not None and self.rotacao.deve_rotacionar(tamanho):
+                self._rotacionar()
         except Exception as e:
             print(f"Erro ao escrever no log: {e}")
     
+    def _rotacionar(self):
+        """Rotaciona o arquivo atual e inicia um novo."""
+        self.rotacao.rotacionar(self.arquivo_log)
+        self._criar_arquivo_se_nao_existir()
+    
+    def canal(self, nome):
+        """
+        Cria um canal de log: as mensagens do canal vão para este mesmo
+        arquivo, prefixadas com o nome do canal (ex.: uma sessão do servidor).
+        
+        Args:
+            nome (str): Nome do canal
+            
+        Returns:
+            CanalLog: Canal com o método registrar()
+        """
+        return CanalLog(self, nome)
+    
     def limpar_log(self):
         """Limpa o arquivo de log."""
         with open(self.arquivo_log, 'w', encoding='utf-8') as f:
@@ -53,3 +282,215 @@ class Logger:
             f.write(f"Log limpo em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write("=" * 50 + "\n\n")
 
+
+class CanalLog:
+    """
+    Canal de um logger compartilhado. Vários canais (um por sessão, por
+    exemplo) escrevem no mesmo arquivo sem precisar de um arquivo ou uma
+    thread de escrita cada um.
+    """
+    
+    __slots__ = ("logger", "nome", "_prefixo")
+    
+    def __init__(self, logger, nome):
+        """
+        Inicializa o canal.
+        
+        Args:
+            logger (Logger): Logger que grava as mensagens
+            nome (str): Nome do canal
+        """
+        self.logger = logger
+        self.nome = nome
+        self._prefixo = f"[{nome}] "
+    
+    def registrar(self, mensagem):
+        """
+        Registra uma mensagem no logger, prefixada com o nome do canal.
+        
+        Args:
+            mensagem (str): Mensagem a ser registrada
+        """
+        self.logger.registrar(self._prefixo + mensagem)
+
+
+class LoggerBufferizado(Logger):
+    """
+    Logger que enfileira as mensagens e as grava em lotes a partir de uma
+    thread de escrita, que mantém o arquivo aberto.
+    
+    O lote é gravado quando atinge `tamanho_lote` mensagens, quando passa
+    `intervalo` segundos desde a última gravação, ou quando `descarregar`,
+    `limpar_log` ou `fechar` são chamados (este último também na saída
+    normal do interpretador).
+    
+    Garantias em caso de falha, conforme `durabilidade`:
+    - "nenhuma": o lote fica no buffer do arquivo em Python; um crash do
+      processo perde tudo o que ainda não foi gravado pelo buffer.
+    - "flush" (padrão): cada lote é entregue ao sistema operacional. Um crash
+      do processo perde apenas as mensagens ainda na fila (no máximo
+      `intervalo` segundos ou `tamanho_lote` mensagens); uma queda de energia
+      pode perder o que o sistema ainda não gravou em disco.
+    - "fsync": cada lote também é sincronizado em disco com os.fsync,
+      sobrevivendo a quedas de energia com o mesmo limite da fila.
+    """
+    
+    DURABILIDADES = ("nenhuma", "flush", "fsync")
+    
+    def __init__(self, arquivo_log="jogo.log", tamanho_lote=256, intervalo=1.0, durabilidade="flush",
+                 rotacao=None):
+        """
+        Inicializa o logger e inicia a thread de escrita.
+        
+        Args:
+            arquivo_log (str): Nome do arquivo de log
+            tamanho_lote (int): Número de mensagens que força uma gravação
+            intervalo (float): Tempo máximo, em segundos, entre gravações
+            durabilidade (str): "nenhuma", "flush" ou "fsync" (ver docstring da classe)
+            rotacao (RotacaoLog, optional): Política de rotação, verificada
+                pela thread de escrita depois de cada lote
+        """
+        if durabilidade not in self.DURABILIDADES:
+            raise ValueError(f"durabilidade deve ser uma de {self.DURABILIDADES}")
+        
+        super().__init__(arquivo_log, rotacao)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.durabilidade = durabilidade
+        self._fila = queue.SimpleQueue()
+        # Protege _fechado: nada é enfileirado depois do comando "fechar"
+        self._trava = threading.Lock()
+        self._fechado = False
+        self._thread = threading.Thread(target=self._executar, name=f"logger:{arquivo_log}", daemon=True)
+        self._thread.start()
+        atexit.register(self.fechar)
+    
+    def registrar(self, mensagem):
+        """
+        Enfileira uma mensagem para ser gravada pela thread de escrita.
+        
+        Args:
+            mensagem (str): Mensagem a ser registrada
+        """
+        linha = f"[{self._timestamp()}] {mensagem}\n"
+        with self._trava:
+            if not self._fechado:
+                self._fila.put(linha)
+                return
+        super().registrar(mensagem)
+    
+    def descarregar(self):
+        """Bloqueia até que todas as mensagens enfileiradas sejam gravadas."""
+        if not self._fechado:
+            self._enviar_comando("descarregar")
+    
+    def limpar_log(self):
+        """Grava as mensagens pendentes e depois limpa o arquivo de log."""
+        if self._fechado:
+            super().limpar_log()
+        else:
+            self._enviar_comando("limpar")
+    
+    def fechar(self):
+        """Grava as mensagens pendentes, fecha o arquivo e encerra a thread."""
+        with self._trava:
+            if self._fechado:
+                return
+            self._fechado = True
+            pronto = threading.Event()
+            self._fila.put(("fechar", pronto))
+        self._aguardar(pronto)
+        self._thread.join()
+        atexit.unregister(self.fechar)
+    
+    def _enviar_comando(self, comando):
+        """Envia um comando para a thread de escrita e espera sua execução."""
+        pronto = threading.Event()
+        self._fila.put((comando, pronto))
+        self._aguardar(pronto)
+    
+    def _aguardar(self, pronto):
+        """Espera um comando, desistindo se a thread de escrita terminou."""
+        while not pronto.wait(0.5):
+            if not self._thread.is_alive():
+                return
+    
+    def _gravar(self, arquivo, lote):
+        """Grava um lote de linhas respeitando a durabilidade configurada."""
+        try:
+            arquivo.write("".join(lote))
+            if self.durabilidade != "nenhuma":
+                arquivo.flush()
+                if self.durabilidade == "fsync":
+                    os.fsync(arquivo.fileno())
+        except Exception as e:
+            print(f"Erro ao escrever no log: {e}")
+    
+    def _abrir_arquivo(self):
+        """Abre o log para acréscimos (None se não for possível)."""
+        try:
+            return open(self.arquivo_log, 'a', encoding='utf-8')
+        except Exception as e:
+            print(f"Erro ao abrir o log: {e}")
+            return None
+    
+    def _executar(self):
+        """
+        Laço da thread de escrita: agrupa mensagens e executa comandos.
+        Falhas de arquivo são exibidas e a thread continua; se o log não
+        puder ser aberto, o lote é descartado e a abertura é tentada de novo
+        no próximo.
+        """
+        arquivo = self._abrir_arquivo()
+        lote = []
+        prazo = time.monotonic() + self.intervalo
+        
+        while True:
+            try:
+                item = self._fila.get(timeout=max(0.0, prazo - time.monotonic()))
+            except queue.Empty:
+                item = None
+            
+            if item.__class__ is str:
+                lote.append(item)
+                if len(lote) < self.tamanho_lote and time.monotonic() < prazo:
+                    continue
+            
+            if lote:
+                if arquivo is None:
+                    arquivo = self._abrir_arquivo()
+                if arquivo is not None:
+                    self._gravar(arquivo, lote)
+                    if self.rotacao is not None and self.rotacao.deve_rotacionar(arquivo.tell()):
+                        arquivo.close()
+                        try:
+                            self._rotacionar()
+                        except Exception as e:
+                            print(f"Erro ao rotacionar o log: {e}")
+                        arquivo = self._abrir_arquivo()
+                lote.clear()
+            prazo = time.monotonic() + self.intervalo
+            
+            if item is None or item.__class__ is str:
+                continue
+            
+            comando, pronto = item
+            try:
+                if comando == "limpar":
+                    if arquivo is not None:
+                        arquivo.close()
+                        arquivo = None
+                    Logger.limpar_log(self)
+                    arquivo = self._abrir_arquivo()
+                elif comando == "fechar":
+                    if arquivo is not None:
+                        arquivo.close()
+                    return
+                elif self.durabilidade == "nenhuma" and arquivo is not None:
+                    arquivo.flush()
+            except Exception as e:
+                print(f"Erro ao escrever no log: {e}")
+                if comando == "fechar":
+                    return
+            finally:
+                pronto.set()
@@ -0,0 +1,271 @@
+"""
+Módulo com o registro de métricas do jogo: contadores e histogramas com
+rótulos, exportáveis em JSON ou no formato de texto do Prometheus.
+
+As métricas são opcionais: o combate só é instrumentado quando recebe um
+MetricasCombate (ver models.combate.CombateInstrumentado). Sem ele, o
+combate usa a classe Combate comum e nenhum código de medição é executado.
+"""
+
+import json
+import os
+from bisect import bisect_left
+
+from utils.repositorio import gravar_atomicamente
+
+
+class Contador:
+    """Contador que só cresce, com uma série por combinação de rótulos."""
+
+    __slots__ = ("nome", "ajuda", "rotulos", "series")
+
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        """
+        Inicializa o contador.
+
+        Args:
+            nome (str): Nome da métrica (ex.: "rpg_criticos_total")
+            ajuda (str): Descrição exibida na exportação
+            rotulos (tuple): Nomes dos rótulos de cada série
+        """
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.series = {}
+
+    def incrementar(self, valores=(), quantidade=1):
+        """
+        Soma `quantidade` à série dos rótulos `valores`.
+
+        Args:
+            valores (tuple): Valores dos rótulos, na ordem de `rotulos`
+            quantidade (int | float): Valor somado
+        """
+        self.series[valores] = self.series.get(valores, 0) + quantidade
+
+    def valor(self, valores=()):
+        """Retorna o valor atual da série (0 se ela ainda não existe)."""
+        return self.series.get(valores, 0)
+
+    def to_dict(self):
+        return {
+            "tipo": self.tipo,
+            "ajuda": self.ajuda,
+            "series": [{"rotulos": dict(zip(self.rotulos, valores)), "valor": valor}
+                       for valores, valor in sorted(self.series.items())]
+        }
+
+    def _linhas_prometheus(self):
+        for valores, valor in sorted(self.series.items()):
+            yield f"{self.nome}{_rotulos_prometheus(self.rotulos, valores)} {_numero(valor)}"
+
+
+class Histograma:
+    """
+    Histograma com limites fixos: cada série conta as observações por faixa,
+    além da soma e do total de observações.
+    """
+
+    __slots__ = ("nome", "ajuda", "rotulos", "limites", "series")
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, limites, rotulos=()):
+        """
+        Inicializa o histograma.
+
+        Args:
+            nome (str): Nome da métrica
+            ajuda (str): Descrição exibida na exportação
+            limites (iterable): Limites superiores das faixas, em ordem crescente
+            rotulos (tuple): Nomes dos rótulos de cada série
+        """
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(limites)
+        # valores dos rótulos -> [contagens por faixa (a última é +Inf), soma, total]
+        self.series = {}
+
+    def observar(self, valor, valores=()):
+        """
+        Registra uma observação na série dos rótulos `valores`.
+
+        Args:
+            valor (int | float): Valor observado
+            valores (tuple): Valores dos rótulos, na ordem de `rotulos`
+        """
+        serie = self.series.get(valores)
+        if serie is None:
+            serie = self.series[valores] = [[0] * (len(self.limites) + 1), 0, 0]
+        # A faixa i conta os valores <= limites[i]
+        serie[0][bisect_left(self.limites, valor)] += 1
+        serie[1] += valor
+        serie[2] += 1
+
+    def total(self, valores=()):
+        """Retorna o número de observações da série."""
+        serie = self.series.get(valores)
+        return serie[2] if serie else 0
+
+    def to_dict(self):
+        return {
+            "tipo": self.tipo,
+            "ajuda": self.ajuda,
+            "limites": list(self.limites),
+            "series": [{"rotulos": dict(zip(self.rotulos, valores)), "contagens": contagens,
+                        "soma": soma, "total": total}
+                       for valores, (contagens, soma, total) in sorted(self.series.items())]
+        }
+
+    def _linhas_prometheus(self):
+        for valores, (contagens, soma, total) in sorted(self.series.items()):
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (float("inf"),), contagens):
+                acumulado += contagem
+                le = "+Inf" if limite == float("inf") else _numero(limite)
+                rotulos = _rotulos_prometheus(self.rotulos + ("le",), valores + (le,))
+                yield f"{self.nome}_bucket{rotulos} {acumulado}"
+            rotulos = _rotulos_prometheus(self.rotulos, valores)
+            yield f"{self.nome}_sum{rotulos} {_numero(soma)}"
+            yield f"{self.nome}_count{rotulos} {total}"
+
+
+def _numero(valor):
+    """Formata um número para a exportação (inteiros sem casa decimal)."""
+    if isinstance(valor, float) and not valor.is_integer():
+        return repr(valor)
+    return str(int(valor))
+
+
+def _rotulos_prometheus(nomes, valores):
+    """Monta o trecho {nome="valor",...} de uma série do Prometheus."""
+    if not nomes:
+        return ""
+    pares = []
+    for nome, valor in zip(nomes, valores):
+        valor = str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pares.append(f"{nome}=\"{valor}\"")
+    return "{" + ",".join(pares) + "}"
+
+
+class RegistroMetricas:
+    """
+    Registro que cria e guarda as métricas, e as exporta em JSON ou no
+    formato de texto do Prometheus.
+    """
+
+    FORMATOS = ("json", "prometheus")
+
+    def __init__(self):
+        """Inicializa um registro vazio."""
+        self.metricas = {}
+
+    def _registrar(self, metrica):
+        if metrica.nome in self.metricas:
+            raise ValueError(f"métrica já registrada: {metrica.nome}")
+        self.metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(self, nome, ajuda, rotulos=()):
+        """Cria e registra um Contador."""
+        return self._registrar(Contador(nome, ajuda, rotulos))
+
+    def histograma(self, nome, ajuda, limites, rotulos=()):
+        """Cria e registra um Histograma."""
+        return self._registrar(Histograma(nome, ajuda, limites, rotulos))
+
+    def to_dict(self):
+        """
+        Converte todas as métricas para um dicionário (exportação em JSON).
+
+        Returns:
+            dict: {nome da métrica: dados da métrica}
+        """
+        return {nome: metrica.to_dict() for nome, metrica in self.metricas.items()}
+
+    def para_prometheus(self):
+        """
+        Exporta as métricas no formato de texto do Prometheus.
+
+        Returns:
+            str: Texto com as linhas # HELP, # TYPE e as séries de cada métrica
+        """
+        linhas = []
+        for metrica in self.metricas.values():
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica._linhas_prometheus())
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho, formato=None):
+        """
+        Grava as métricas em um arquivo (de forma atômica).
+
+        Args:
+            caminho (str): Arquivo de destino
+            formato (str, optional): "json" ou "prometheus"; por padrão,
+                "prometheus" para arquivos .prom e .txt e "json" para os demais
+        """
+        if formato is None:
+            formato = "prometheus" if os.path.splitext(caminho)[1] in (".prom", ".txt") else "json"
+        if formato not in self.FORMATOS:
+            raise ValueError(f"formato deve ser um de {self.FORMATOS}")
+
+        if formato == "json":
+            conteudo = json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n"
+        else:
+            conteudo = self.para_prometheus()
+        gravar_atomicamente(caminho, conteudo.encode("utf-8"))
+
+
+class MetricasCombate:
+    """
+    Conjunto das métricas do combate, criadas em um RegistroMetricas.
+
+    As fases cronometradas são "acao_jogador", "acao_inimigo", "log" e
+    "saida" (exibição de mensagens). O tempo de log e de saída de uma ação
+    também está contido no tempo da fase da ação.
+    """
+
+    # Faixas dos histogramas
+    LIMITES_TURNOS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30)
+    LIMITES_DANO = (1, 2, 3, 5, 8, 10, 15, 20, 30, 50, 80)
+    LIMITES_SEGUNDOS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 0.1)
+
+    def __init__(self, registro=None):
+        """
+        Cria as métricas do combate.
+
+        Args:
+            registro (RegistroMetricas, optional): Registro onde as métricas
+                são criadas (padrão: um registro novo)
+        """
+        self.registro = registro if registro is not None else RegistroMetricas()
+        r = self.registro
+        self.combates = r.contador(
+            "rpg_combates_total", "Combates encerrados", ("classe", "inimigo", "desfecho"))
+        self.turnos = r.histograma(
+            "rpg_combate_turnos", "Turnos por combate", self.LIMITES_TURNOS, ("classe", "inimigo"))
+        self.golpes = r.contador(
+            "rpg_golpes_total", "Golpes do jogador que causaram dano", ("classe", "acao"))
+        self.criticos = r.contador(
+            "rpg_criticos_total", "Golpes críticos do jogador", ("classe", "acao"))
+        self.dano_causado = r.histograma(
+            "rpg_dano_causado", "Dano aplicado por golpe do jogador", self.LIMITES_DANO, ("classe", "acao"))
+        self.dano_recebido = r.histograma(
+            "rpg_dano_recebido", "Dano aplicado por ataque do inimigo", self.LIMITES_DANO, ("inimigo",))
+        self.mana_insuficiente = r.contador(
+            "rpg_mana_insuficiente_total", "Habilidades trocadas por ataque por falta de mana", ("classe",))
+        self.itens_usados = r.contador(
+            "rpg_itens_usados_total", "Itens usados em combate", ("item",))
+        self.regeneracoes = r.contador(
+            "rpg_regeneracoes_inimigo_total", "Regenerações do inimigo que curaram HP", ("inimigo",))
+        self.fases = r.histograma(
+            "rpg_fase_segundos", "Tempo de parede por fase do combate", self.LIMITES_SEGUNDOS, ("fase",))
+
+    def exportar(self, caminho, formato=None):
+        """Grava as métricas em um arquivo (ver RegistroMetricas.exportar)."""
+        self.registro.exportar(caminho, formato)
@@ -0,0 +1,509 @@
+"""
+Módulo de replays de missões em formato binário compacto.
+
+Cada replay guarda o necessário para reexecutar uma missão de forma
+determinística: a semente do gerador aleatório, o inimigo e as recompensas
+sorteados, o personagem no início, a ação de cada turno (1 byte) e o estado
+final esperado. Os replays são gravados em sequência em um arquivo, com um
+índice (.idx) de deslocamentos para acessar o n-ésimo replay diretamente.
+
+Uso (reexecuta todos os replays de um arquivo e aponta divergências):
+    python -m utils.replay replays.rpl
+"""
+
+import argparse
+import os
+import struct
+import time
+
+from models.missão import Missao
+from utils.repositorio import Repositorio, gravar_atomicamente
+
+
+MAGICO = b"RPGR"
+# Versão 2: a semente alimenta o GeradorAleatorio da missão (e não o módulo random)
+# Versão 3: textos, contagens e campos numéricos em inteiros de tamanho variável
+# Versão 4: o GeradorAleatorio passou a sortear com o Mersenne Twister
+VERSAO = 4
+
+# Tabelas de códigos (a posição na tupla é o código gravado)
+DIFICULDADES = ("fácil", "médio", "difícil")
+INIMIGOS = ("Goblin", "Lobo", "Orc", "Chefao")
+CLASSES = ("Guerreiro", "Mago", "Arqueiro")
+# Código de classe fora da tabela: o nome da classe vem em seguida, como texto
+CLASSE_OUTRA = 255
+# "turnos": combate jogado turno a turno; os demais são missões automáticas
+# (Missao.resolver_automaticamente) com a política de mesmo nome
+MODOS = ("turnos", "atacar", "habilidade")
+
+# Códigos de ação: 0 atacar, 1 habilidade, 2 primeiro item do inventário,
+# 3 + i o item de índice i na tabela de nomes do replay (gravados como
+# inteiros de tamanho variável: 1 byte enquanto o código for menor que 128)
+ACAO_ATACAR, ACAO_HABILIDADE, ACAO_ITEM = 0, 1, 2
+
+_CABECALHO = struct.Struct("<4sB")
+_TAMANHO = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+# dificuldade, inimigo, modo (a semente vem antes, como inteiro variável)
+_MISSAO = struct.Struct("<BBB")
+
+# Campos numéricos do personagem e do estado final, na ordem gravada
+CAMPOS_PERSONAGEM = ("nivel", "xp", "xp_proximo_nivel", "hp", "hp_maximo", "mana", "mana_maxima",
+                     "dano_base", "defesa")
+CAMPOS_FINAL = ("turnos", "hp", "mana", "nivel", "xp")
+
+
+def estado_final(personagem, resultado):
+    """
+    Resume o desfecho de uma missão para comparação entre gravação e replay.
+
+    Returns:
+        dict: vitoria, turnos, hp, mana, nivel e xp
+    """
+    return {
+        "vitoria": resultado["vitoria"],
+        "turnos": resultado["turnos"] or 0,
+        "hp": personagem.hp,
+        "mana": personagem.mana,
+        "nivel": personagem.nivel,
+        "xp": personagem.xp
+    }
+
+
+def _normalizar_acao(acao):
+    """Converte uma ação do combate para "atacar", "habilidade" ou ("item", nome | None)."""
+    if isinstance(acao, tuple):
+        _, item = acao
+        return ("item", None if item is None else getattr(item, "nome", str(item)))
+    if acao == "item":
+        return ("item", None)
+    return acao
+
+
+def _escrever_inteiro(partes, valor):
+    """Acrescenta um inteiro de qualquer tamanho e sinal (zigzag + LEB128)."""
+    valor = int(valor)
+    valor = valor * 2 if valor >= 0 else -valor * 2 - 1
+    dados = bytearray()
+    while valor >= 0x80:
+        dados.append(valor & 0x7F | 0x80)
+        valor >>= 7
+    dados.append(valor)
+    partes.append(bytes(dados))
+
+
+def _ler_inteiro(dados, posicao):
+    valor = deslocamento = 0
+    while True:
+        byte = dados[posicao]
+        posicao += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            break
+        deslocamento += 7
+    return (valor >> 1) ^ -(valor & 1), posicao
+
+
+def _escrever_texto(partes, texto):
+    dados = texto.encode("utf-8")
+    _escrever_inteiro(partes, len(dados))
+    partes.append(dados)
+
+
+def _ler_texto(dados, posicao):
+    tamanho, posicao = _ler_inteiro(dados, posicao)
+    fim = posicao + tamanho
+    return dados[posicao:fim].decode("utf-8"), fim
+
+
+class Replay:
+    """
+    Registro de uma missão: tudo o que é preciso para reexecutá-la e o
+    estado final que a reexecução deve reproduzir.
+    """
+
+    __slots__ = ("semente", "missao", "dificuldade", "inimigo", "recompensas",
+                 "modo", "inicial", "acoes", "final")
+
+    def __init__(self, semente, missao, dificuldade, inimigo, recompensas, modo, inicial, acoes, final):
+        """
+        Inicializa um replay.
+
+        Args:
+            semente (int): Semente usada na criação da missão
+            missao (str): Nome da missão
+            dificuldade (str): Dificuldade da missão
+            inimigo (str): Nome da classe do inimigo sorteado
+            recompensas (list): Nomes dos itens de recompensa
+            modo (str): Um dos MODOS
+            inicial (dict): Personagem no início, no formato de Personagem.to_dict()
+            acoes (list): Ação de cada turno ("atacar", "habilidade" ou ("item", nome | None))
+            final (dict): Estado final no formato de estado_final()
+        """
+        self.semente = semente
+        self.missao = missao
+        self.dificuldade = dificuldade
+        self.inimigo = inimigo
+        self.recompensas = list(recompensas)
+        self.modo = modo
+        self.inicial = inicial
+        self.acoes = [_normalizar_acao(acao) for acao in acoes]
+        self.final = final
+
+    @classmethod
+    def da_missao(cls, missao, inicial, personagem, resultado, modo="turnos"):
+        """
+        Monta o replay de uma missão já concluída.
+
+        Args:
+            missao (Missao): Missão criada com uma semente
+            inicial (dict): personagem.to_dict() tirado antes do combate
+            personagem: Personagem depois do combate
+            resultado (dict): Resultado retornado pelo combate
+            modo (str): "turnos" ou a política da missão automática
+
+        Returns:
+            Replay: Replay da missão
+        """
+        if missao.semente is None:
+            raise ValueError("A missão precisa ter sido criada com uma semente")
+        return cls(missao.semente, missao.nome, missao.dificuldade, type(missao.inimigo).__name__,
+                   missao.itens_recompensa, modo, inicial, resultado["acoes"],
+                   estado_final(personagem, resultado))
+
+    def codificar(self):
+        """
+        Codifica o replay em bytes.
+
+        Returns:
+            bytes: Registro binário do replay
+        """
+        nomes = []
+        indices = {}
+
+        def indice(nome):
+            if nome not in indices:
+                indices[nome] = len(nomes)
+                nomes.append(nome)
+            return indices[nome]
+
+        inicial = self.inicial
+        inventario = inicial.get("inventario", {})
+        if isinstance(inventario, list):
+            contagem = {}
+            for nome in inventario:
+                contagem[nome] = contagem.get(nome, 0) + 1
+            inventario = contagem
+
+        recompensas = [indice(nome) for nome in self.recompensas]
+        pilhas = [(indice(nome), quantidade) for nome, quantidade in inventario.items()]
+        acoes = []
+        for acao in self.acoes:
+            if acao == "atacar":
+                acoes.append(ACAO_ATACAR)
+            elif acao == "habilidade":
+                acoes.append(ACAO_HABILIDADE)
+            elif acao[1] is None:
+                acoes.append(ACAO_ITEM)
+            else:
+                acoes.append(ACAO_ITEM + 1 + indice(acao[1]))
+
+        partes = []
+        _escrever_inteiro(partes, self.semente)
+        partes.append(_MISSAO.pack(DIFICULDADES.index(self.dificuldade),
+                                   INIMIGOS.index(self.inimigo), MODOS.index(self.modo)))
+        _escrever_texto(partes, self.missao)
+        _escrever_inteiro(partes, len(nomes))
+        for nome in nomes:
+            _escrever_texto(partes, nome)
+        _escrever_inteiro(partes, len(recompensas))
+        for i in recompensas:
+            _escrever_inteiro(partes, i)
+
+        _escrever_texto(partes, inicial["nome"])
+        classe = inicial["classe"]
+        if classe in CLASSES:
+            partes.append(bytes((CLASSES.index(classe),)))
+        else:
+            partes.append(bytes((CLASSE_OUTRA,)))
+            _escrever_texto(partes, classe)
+        for campo in CAMPOS_PERSONAGEM:
+            _escrever_inteiro(partes, inicial[campo])
+        _escrever_inteiro(partes, len(pilhas))
+        for i, quantidade in pilhas:
+            _escrever_inteiro(partes, i)
+            _escrever_inteiro(partes, quantidade)
+
+        _escrever_inteiro(partes, len(acoes))
+        for codigo in acoes:
+            _escrever_inteiro(partes, codigo)
+
+        final = self.final
+        partes.append(bytes((bool(final["vitoria"]),)))
+        for campo in CAMPOS_FINAL:
+            _escrever_inteiro(partes, final[campo])
+        return b"".join(partes)
+
+    @classmethod
+    def decodificar(cls, dados):
+        """
+        Reconstrói um replay a partir dos bytes gerados por codificar().
+
+        Args:
+            dados (bytes): Registro binário do replay
+
+        Returns:
+            Replay: Replay decodificado
+        """
+        semente, posicao = _ler_inteiro(dados, 0)
+        dificuldade, inimigo, modo = _MISSAO.unpack_from(dados, posicao)
+        missao, posicao = _ler_texto(dados, posicao + _MISSAO.size)
+
+        nomes = []
+        quantidade, posicao = _ler_inteiro(dados, posicao)
+        for _ in range(quantidade):
+            nome, posicao = _ler_texto(dados, posicao)
+            nomes.append(nome)
+        quantidade, posicao = _ler_inteiro(dados, posicao)
+        recompensas = []
+        for _ in range(quantidade):
+            i, posicao = _ler_inteiro(dados, posicao)
+            recompensas.append(nomes[i])
+
+        nome, posicao = _ler_texto(dados, posicao)
+        codigo, posicao = dados[posicao], posicao + 1
+        if codigo == CLASSE_OUTRA:
+            classe, posicao = _ler_texto(dados, posicao)
+        else:
+            classe = CLASSES[codigo]
+        inicial = {"nome": nome, "classe": classe}
+        for campo in CAMPOS_PERSONAGEM:
+            inicial[campo], posicao = _ler_inteiro(dados, posicao)
+        quantidade, posicao = _ler_inteiro(dados, posicao)
+        inventario = {}
+        for _ in range(quantidade):
+            i, posicao = _ler_inteiro(dados, posicao)
+            inventario[nomes[i]], posicao = _ler_inteiro(dados, posicao)
+        inicial["inventario"] = inventario
+
+        quantidade, posicao = _ler_inteiro(dados, posicao)
+        codigos = []
+        for _ in range(quantidade):
+            codigo, posicao = _ler_inteiro(dados, posicao)
+            codigos.append(codigo)
+        acoes = []
+        for codigo in codigos:
+            if codigo == ACAO_ATACAR:
+                acoes.append("atacar")
+            elif codigo == ACAO_HABILIDADE:
+                acoes.append("habilidade")
+            elif codigo == ACAO_ITEM:
+                acoes.append(("item", None))
+            else:
+                acoes.append(("item", nomes[codigo - ACAO_ITEM - 1]))
+
+        final = {"vitoria": bool(dados[posicao])}
+        posicao += 1
+        for campo in CAMPOS_FINAL:
+            final[campo], posicao = _ler_inteiro(dados, posicao)
+
+        return cls(semente, missao, DIFICULDADES[dificuldade], INIMIGOS[inimigo], recompensas,
+                   MODOS[modo], inicial, acoes, final)
+
+
+def reproduzir(replay):
+    """
+    Reexecuta um replay sem saída no console e confere o resultado.
+    A missão é recriada com a semente gravada, que alimenta o gerador
+    próprio da missão (o gerador global do módulo random não é usado).
+
+    Args:
+        replay (Replay): Replay a ser reexecutado
+
+    Returns:
+        dict: "ok" (bool), "final" (estado obtido) e "divergencias" (lista do
+        que não bateu: "inimigo", "recompensas", "acoes" ou "estado final")
+    """
+    personagem = Repositorio.construir_personagem(replay.inicial)
+    missao = Missao(replay.missao, replay.dificuldade, semente=replay.semente)
+
+    divergencias = []
+    if type(missao.inimigo).__name__ != replay.inimigo:
+        divergencias.append("inimigo")
+    if missao.itens_recompensa != replay.recompensas:
+        divergencias.append("recompensas")
+
+    if replay.modo == "turnos":
+        acoes = iter(replay.acoes)
+        try:
+            resultado = missao.resolver(personagem, lambda personagem, inimigo: next(acoes, None))
+        except ValueError:
+            # As ações gravadas acabaram antes do fim do combate
+            resultado = None
+        if resultado is None or next(acoes, None) is not None:
+            divergencias.append("acoes")
+    else:
+        resultado = missao.resolver_automaticamente(personagem, politica=replay.modo)
+
+    final = estado_final(personagem, resultado) if resultado else None
+    if final != replay.final:
+        divergencias.append("estado final")
+    return {"ok": not divergencias, "final": final, "divergencias": divergencias}
+
+
+class ArquivoReplay:
+    """
+    Arquivo de replays: um cabeçalho seguido dos registros, cada um
+    prefixado pelo seu tamanho. O índice (arquivo .idx ao lado) guarda o
+    deslocamento de cada registro em 8 bytes, para acesso direto.
+    """
+
+    def __init__(self, caminho="replays.rpl"):
+        """
+        Inicializa o arquivo de replays (criado na primeira gravação).
+
+        Args:
+            caminho (str): Caminho do arquivo de replays
+        """
+        self.caminho = caminho
+        self.caminho_indice = caminho + ".idx"
+
+    def gravar(self, replay):
+        """
+        Acrescenta um replay ao arquivo.
+
+        Returns:
+            int: Índice do replay gravado
+        """
+        return self.gravar_varios([replay])
+
+    def gravar_varios(self, replays):
+        """
+        Acrescenta vários replays abrindo o arquivo uma única vez.
+
+        Returns:
+            int: Índice do primeiro replay gravado
+        """
+        # Codifica tudo antes de abrir: um replay que não pode ser gravado
+        # não deixa o arquivo pela metade
+        corpos = [replay.codificar() for replay in replays]
+        primeiro = len(self)
+        with open(self.caminho, "ab") as dados, open(self.caminho_indice, "ab") as indice:
+            if dados.tell() == 0:
+                dados.write(_CABECALHO.pack(MAGICO, VERSAO))
+            else:
+                self._verificar_cabecalho()
+            posicao = dados.tell()
+            for corpo in corpos:
+                dados.write(_TAMANHO.pack(len(corpo)))
+                dados.write(corpo)
+                indice.write(_OFFSET.pack(posicao))
+                posicao += _TAMANHO.size + len(corpo)
+        return primeiro
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.caminho_indice) // _OFFSET.size
+        except OSError:
+            return 0
+
+    def ler(self, indice):
+        """
+        Lê o replay de posição `indice` usando o índice de deslocamentos.
+
+        Args:
+            indice (int): Posição do replay no arquivo (0 é o primeiro)
+
+        Returns:
+            Replay: Replay lido
+        """
+        if not 0 <= indice < len(self):
+            raise IndexError(f"Replay {indice} não existe")
+        with open(self.caminho_indice, "rb") as f:
+            f.seek(indice * _OFFSET.size)
+            (posicao,) = _OFFSET.unpack(f.read(_OFFSET.size))
+        with open(self.caminho, "rb") as f:
+            f.seek(posicao)
+            (tamanho,) = _TAMANHO.unpack(f.read(_TAMANHO.size))
+            return Replay.decodificar(f.read(tamanho))
+
+    def _verificar_cabecalho(self, f=None):
+        """Confere o cabeçalho do arquivo (ValueError se for de outra versão)."""
+        if f is None:
+            with open(self.caminho, "rb") as f:
+                return self._verificar_cabecalho(f)
+        cabecalho = f.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size or _CABECALHO.unpack(cabecalho) != (MAGICO, VERSAO):
+            raise ValueError(f"{self.caminho} não é um arquivo de replays compatível")
+
+    def _registros(self):
+        """Percorre o arquivo em sequência, gerando (deslocamento, corpo) de cada registro."""
+        with open(self.caminho, "rb") as f:
+            self._verificar_cabecalho(f)
+            while True:
+                posicao = f.tell()
+                cabecalho = f.read(_TAMANHO.size)
+                if len(cabecalho) < _TAMANHO.size:
+                    return
+                (tamanho,) = _TAMANHO.unpack(cabecalho)
+                corpo = f.read(tamanho)
+                if len(corpo) < tamanho:
+                    return  # Registro incompleto (gravação interrompida)
+                yield posicao, corpo
+
+    def __iter__(self):
+        """Percorre todos os replays em sequência (sem usar o índice)."""
+        for _, corpo in self._registros():
+            yield Replay.decodificar(corpo)
+
+    def reconstruir_indice(self):
+        """
+        Recria o arquivo de índice a partir dos registros.
+
+        Returns:
+            int: Número de replays indexados
+        """
+        deslocamentos = [_OFFSET.pack(posicao) for posicao, _ in self._registros()]
+        gravar_atomicamente(self.caminho_indice, b"".join(deslocamentos))
+        return len(deslocamentos)
+
+
+def reproduzir_arquivo(caminho):
+    """
+    Reexecuta todos os replays de um arquivo (verificação de regressão).
+
+    Args:
+        caminho (str): Caminho do arquivo de replays
+
+    Returns:
+        dict: "total", "divergentes" (lista de (índice, divergências)) e "tempo" em segundos
+    """
+    inicio = time.perf_counter()
+    total = 0
+    divergentes = []
+    for i, replay in enumerate(ArquivoReplay(caminho)):
+        total += 1
+        verificacao = reproduzir(replay)
+        if not verificacao["ok"]:
+            divergentes.append((i, verificacao["divergencias"]))
+    return {"total": total, "divergentes": divergentes, "tempo": time.perf_counter() - inicio}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reexecuta os replays de um arquivo e aponta divergências.")
+    parser.add_argument("arquivo", help="arquivo de replays (.rpl)")
+    args = parser.parse_args()
+
+    relatorio = reproduzir_arquivo(args.arquivo)
+    tempo = relatorio["tempo"]
+    print(f"{relatorio['total']} replays reexecutados em {tempo:.2f}s "
+          f"({relatorio['total'] / tempo if tempo else 0:.0f} replays/s)")
+    for indice, divergencias in relatorio["divergentes"]:
+        print(f"  replay {indice}: {', '.join(divergencias)}")
+    print("Nenhuma divergência." if not relatorio["divergentes"]
+          else f"{len(relatorio['divergentes'])} replays divergentes.")
+    raise SystemExit(1 if relatorio["divergentes"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,98 @@
 """
 Módulo que implementa o sistema de persistência de dados.
-Salva e carrega o progresso do jogo em arquivos JSON.
+Salva e carrega o progresso do jogo em arquivos JSON ou no formato binário
+compacto de utils.save_binario.
 """
 
 import json
 import os
+import tempfile
 from models.personagem import Personagem
-from models.inventario import Item
+from models.inventario import Inventario
 from models.classes import Guerreiro, Mago, Arqueiro
+from utils.save_binario import codificar_save, decodificar_save, e_save_binario
+
+
+def gravar_atomicamente(caminho, conteudo):
+    """
+    Grava um arquivo de forma atômica: escreve em um arquivo temporário no
+    mesmo diretório e o substitui com os.replace. Um crash no meio da escrita
+    deixa o arquivo anterior intacto.
+    
+    Args:
+        caminho (str): Caminho do arquivo de destino
+        conteudo (bytes): Conteúdo a ser gravado
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    fd, temporario = tempfile.mkstemp(prefix=".tmp-", dir=diretorio)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
 
 
 class Repositorio:
     """
-    Classe responsável por salvar e carregar dados do jogo em formato JSON.
+    Classe responsável por salvar e carregar dados do jogo.
+    
+    O formato de gravação é escolhido na criação; na leitura o formato é
+    detectado pelo conteúdo do arquivo, de modo que saves JSON antigos
+    continuam sendo carregados por um repositório binário (e vice-versa).
     """
     
-    def __init__(self, arquivo_save="save.json"):
+    FORMATOS = ("json", "binario")
+    
+    def __init__(self, arquivo_save="save.json", formato="json", indice=None):
         """
         Inicializa o repositório.
         
         Args:
             arquivo_save (str): Nome do arquivo de save
+            formato (str): Formato de gravação: "json" ou "binario"
+            indice (IndiceSaves, optional): Índice do diretório do save,
+                atualizado a cada salvamento
         """
+        if formato not in self.FORMATOS:
+            raise ValueError(f"formato deve ser um de {self.FORMATOS}")
         self.arquivo_save = arquivo_save
+        self.formato = formato
+        self.indice = indice
+        # Dados gravados por último neste repositório
+        self._dados_salvos = None
+    
+    def _registrar_sincronizado(self, personagem, dados):
+        """Guarda os dados que correspondem ao arquivo em disco."""
+        personagem.marcar_limpo()
+        self._dados_salvos = dados
+    
+    def esta_sincronizado(self, personagem, dados=None):
+        """
+        Verifica se o arquivo de save já contém o estado atual do personagem.
+        
+        Args:
+            personagem: Instância do personagem
+            dados (dict, optional): personagem.to_dict(), se já calculado
+            
+        Returns:
+            bool: True se não há nada novo para salvar
+        """
+        if dados is None:
+            dados = personagem.to_dict()
+        return dados == self._dados_salvos and os.path.exists(self.arquivo_save)
     
     def salvar(self, personagem):
         """
-        Salva o estado do personagem em um arquivo JSON.
+        Salva o estado do personagem no formato do repositório.
+        Se nada mudou desde o último salvamento, a escrita é dispensada;
+        caso contrário o arquivo é substituído de forma atômica.
         
         Args:
             personagem: Instância do personagem a ser salva
@@ -36,18 +102,29 @@ class Repositorio:
         """
         try:
             dados = personagem.to_dict()
+            if self.esta_sincronizado(personagem, dados):
+                return True
             
-            with open(self.arquivo_save, 'w', encoding='utf-8') as f:
-                json.dump(dados, f, indent=2, ensure_ascii=False)
+            gravar_atomicamente(self.arquivo_save, self.codificar(dados))
             
-            return True
+            self._registrar_sincronizado(personagem, dados)
         except Exception as e:
             print(f"Erro ao salvar o jogo: {e}")
             return False
+        
+        if self.indice is not None:
+            # O save já está gravado: uma falha no índice só o deixa
+            # desatualizado, e ele é reconstruído na próxima consulta
+            try:
+                self.indice.atualizar(self.arquivo_save, dados)
+            except Exception as e:
+                print(f"Erro ao atualizar o índice de saves: {e}")
+        return True
     
     def carregar(self):
         """
-        Carrega o estado do personagem de um arquivo JSON.
+        Carrega o estado do personagem, em JSON ou binário (detectado pelo
+        cabeçalho do arquivo).
         
         Returns:
             Personagem: Instância do personagem carregada, ou None se houver erro
@@ -56,40 +133,84 @@ class Repositorio:
             if not os.path.exists(self.arquivo_save):
                 return None
             
-            with open(self.arquivo_save, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
-            # Cria o personagem baseado na classe
-            classe = dados.get("classe", "Guerreiro")
-            
-            if classe == "Guerreiro":
-                personagem = Guerreiro(dados["nome"])
-            elif classe == "Mago":
-                personagem = Mago(dados["nome"])
-            elif classe == "Arqueiro":
-                personagem = Arqueiro(dados["nome"])
-            else:
-                # Fallback para Personagem genérico
-                personagem = Personagem(dados["nome"], classe)
-            
-            # Restaura os atributos do dicionário
-            personagem.hp = dados.get("hp", personagem.hp)
-            personagem.hp_maximo = dados.get("hp_maximo", personagem.hp_maximo)
-            personagem.nivel = dados.get("nivel", 1)
-            personagem.xp = dados.get("xp", 0)
-            personagem.xp_proximo_nivel = dados.get("xp_proximo_nivel", 100)
-            # Converte inventário salvo (lista de nomes) para objetos Item
-            personagem.inventario = [Item(nome, "") for nome in dados.get("inventario", [])]
-            personagem.mana = dados.get("mana", personagem.mana_maxima)
-            personagem.mana_maxima = dados.get("mana_maxima", personagem.mana_maxima)
-            personagem.dano_base = dados.get("dano_base", personagem.dano_base)
-            personagem.defesa = dados.get("defesa", personagem.defesa)
+            with open(self.arquivo_save, 'rb') as f:
+                dados = self.decodificar(f.read())
             
+            personagem = self.construir_personagem(dados)
+            self._registrar_sincronizado(personagem, personagem.to_dict())
             return personagem
         except Exception as e:
             print(f"Erro ao carregar o jogo: {e}")
             return None
     
+    def codificar(self, dados):
+        """
+        Codifica os dados de um personagem no formato do repositório.
+        
+        Args:
+            dados (dict): Dicionário no formato de Personagem.to_dict()
+            
+        Returns:
+            bytes: Conteúdo do arquivo de save
+        """
+        if self.formato == "binario":
+            return codificar_save(dados)
+        return json.dumps(dados, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    @staticmethod
+    def decodificar(conteudo):
+        """
+        Decodifica um save em qualquer formato suportado.
+        
+        Args:
+            conteudo (bytes): Conteúdo do arquivo de save
+            
+        Returns:
+            dict: Dicionário no formato de Personagem.to_dict()
+        """
+        if e_save_binario(conteudo):
+            return decodificar_save(conteudo)
+        return json.loads(conteudo.decode('utf-8'))
+    
+    @staticmethod
+    def construir_personagem(dados):
+        """
+        Cria o personagem da classe correta a partir de um dicionário salvo.
+        
+        Args:
+            dados (dict): Dicionário no formato de Personagem.to_dict()
+            
+        Returns:
+            Personagem: Instância do personagem com os atributos restaurados
+        """
+        # Cria o personagem baseado na classe
+        classe = dados.get("classe", "Guerreiro")
+        
+        if classe == "Guerreiro":
+            personagem = Guerreiro(dados["nome"])
+        elif classe == "Mago":
+            personagem = Mago(dados["nome"])
+        elif classe == "Arqueiro":
+            personagem = Arqueiro(dados["nome"])
+        else:
+            # Fallback para Personagem genérico
+            personagem = Personagem(dados["nome"], classe)
+        
+        # Restaura os atributos do dicionário
+        personagem.hp = dados.get("hp", personagem.hp)
+        personagem.hp_maximo = dados.get("hp_maximo", personagem.hp_maximo)
+        personagem.nivel = dados.get("nivel", 1)
+        personagem.xp = dados.get("xp", 0)
+        personagem.xp_proximo_nivel = dados.get("xp_proximo_nivel", 100)
+        # Converte inventário salvo ({nome: quantidade} ou lista de nomes) para objetos Item
+        personagem.inventario = Inventario.from_dict(dados.get("inventario", {}))
+        personagem.mana = dados.get("mana", personagem.mana_maxima)
+        personagem.mana_maxima = dados.get("mana_maxima", personagem.mana_maxima)
+        personagem.dano_base = dados.get("dano_base", personagem.dano_base)
+        personagem.defesa = dados.get("defesa", personagem.defesa)
+        
+        return personagem
+    
     def existe_save(self):
         """
         Verifica se existe um arquivo de save.
@@ -0,0 +1,347 @@
+"""
+Módulo com o repositório em journal: em vez de regravar o save inteiro a
+cada salvamento, acrescenta ao arquivo apenas um registro com o que mudou
+(XP, subida de nível, HP, mana e itens), protegido por um CRC-32.
+
+Layout do arquivo:
+    cabeçalho   "RPGJ" e versão (1 byte)
+    registros   CRC-32, tamanho do conteúdo, tipo (1 byte) e conteúdo
+
+O primeiro registro é sempre um snapshot (o save binário de
+utils.save_binario) e os seguintes são deltas com os novos valores de cada
+grupo de campos. Um salvamento que muda vários grupos grava um único
+registro LOTE, cujo conteúdo são os deltas (tamanho, tipo e conteúdo de
+cada um, sem CRC próprio): o salvamento é aplicado por inteiro ou não é
+aplicado. Carregar lê o snapshot e reaplica os deltas na ordem. A cada
+`compactar_a_cada` deltas o arquivo é substituído (de forma atômica) por
+um único snapshot com o estado atual.
+
+Um registro incompleto ou com CRC inválido que não é seguido de nenhum
+registro íntegro (a escrita final interrompida, inclusive uma cauda
+preenchida com zeros) é descartado ao abrir o journal, e o arquivo é
+truncado no último registro íntegro antes de novos acréscimos. Se há um
+registro íntegro depois dele, não é uma escrita interrompida: o journal é
+tratado como corrompido e o arquivo não é alterado.
+"""
+
+import os
+import struct
+import zlib
+
+from utils.repositorio import Repositorio, gravar_atomicamente
+from utils.save_binario import codificar_save, decodificar_save
+
+
+MAGICO = b"RPGJ"
+# Versão 2: os deltas de um salvamento formam um único registro (LOTE)
+VERSAO = 2
+# Versões que ainda podem ser lidas (o próximo salvamento grava um snapshot)
+VERSOES_LEGIVEIS = (1, 2)
+
+_CABECALHO = struct.Struct("<4sB")
+# CRC-32 (do tamanho, do tipo e do conteúdo), tamanho do conteúdo, tipo
+_MOLDURA = struct.Struct("<IIB")
+_CRC = struct.Struct("<I")
+_TAMANHO_E_TIPO = struct.Struct("<IB")
+
+# Tipos de registro
+SNAPSHOT = 0
+XP = 1
+NIVEL = 2
+HP = 3
+MANA = 4
+ITEM = 5
+LOTE = 6
+
+# Deltas de campos numéricos: tipo -> (formato do conteúdo, campos)
+_GRUPOS = {
+    XP: (struct.Struct("<q"), ("xp",)),
+    NIVEL: (struct.Struct("<iqii"), ("nivel", "xp_proximo_nivel", "dano_base", "defesa")),
+    HP: (struct.Struct("<ii"), ("hp", "hp_maximo")),
+    MANA: (struct.Struct("<ii"), ("mana", "mana_maxima")),
+}
+# Quantidade do item, seguida do nome em UTF-8
+_ITEM = struct.Struct("<I")
+
+
+def _registro(tipo, conteudo):
+    """Monta um registro com a moldura e o CRC-32."""
+    corpo = _TAMANHO_E_TIPO.pack(len(conteudo), tipo) + conteudo
+    return _CRC.pack(zlib.crc32(corpo)) + corpo
+
+
+def _lote(deltas):
+    """Um único registro com os deltas (tipo, conteúdo) de um salvamento."""
+    if len(deltas) == 1:
+        return _registro(*deltas[0])
+    return _registro(LOTE, b"".join(_TAMANHO_E_TIPO.pack(len(conteudo), tipo) + conteudo
+                                    for tipo, conteudo in deltas))
+
+
+def _deltas(anterior, atual):
+    """
+    Deltas que levam o estado `anterior` ao `atual`.
+
+    Returns:
+        list: Pares (tipo, conteúdo), ou None se a mudança exige um snapshot
+    """
+    if anterior["nome"] != atual["nome"] or anterior["classe"] != atual["classe"]:
+        return None
+    deltas = []
+    for tipo, (formato, campos) in _GRUPOS.items():
+        if any(anterior[campo] != atual[campo] for campo in campos):
+            deltas.append((tipo, formato.pack(*(atual[campo] for campo in campos))))
+
+    inventario_anterior, inventario = anterior["inventario"], atual["inventario"]
+    if inventario_anterior != inventario:
+        for nome in inventario_anterior.keys() | inventario.keys():
+            quantidade = inventario.get(nome, 0)
+            if inventario_anterior.get(nome, 0) != quantidade:
+                deltas.append((ITEM, _ITEM.pack(quantidade) + nome.encode("utf-8")))
+    return deltas
+
+
+def _aplicar(estado, tipo, conteudo):
+    """Aplica um delta ao estado (dicionário no formato de Personagem.to_dict())."""
+    if tipo == ITEM:
+        (quantidade,) = _ITEM.unpack_from(conteudo)
+        nome = conteudo[_ITEM.size:].decode("utf-8")
+        if quantidade:
+            estado["inventario"][nome] = quantidade
+        else:
+            estado["inventario"].pop(nome, None)
+    elif tipo in _GRUPOS:
+        formato, campos = _GRUPOS[tipo]
+        estado.update(zip(campos, formato.unpack(conteudo)))
+    else:
+        raise ValueError(f"tipo de registro desconhecido: {tipo}")
+
+
+def _aplicar_lote(estado, conteudo):
+    """
+    Aplica os deltas de um registro LOTE.
+
+    Returns:
+        int: Número de deltas aplicados
+    """
+    posicao = quantidade = 0
+    while posicao < len(conteudo):
+        tamanho, tipo = _TAMANHO_E_TIPO.unpack_from(conteudo, posicao)
+        posicao += _TAMANHO_E_TIPO.size
+        _aplicar(estado, tipo, conteudo[posicao:posicao + tamanho])
+        posicao += tamanho
+        quantidade += 1
+    return quantidade
+
+
+def _registro_integro(conteudo, posicao):
+    """Verifica se há uma moldura com CRC válido exatamente em `posicao`."""
+    crc, tamanho, tipo = _MOLDURA.unpack_from(conteudo, posicao)
+    fim = posicao + _MOLDURA.size + tamanho
+    return fim <= len(conteudo) and tipo <= LOTE and zlib.crc32(conteudo[posicao + _CRC.size:fim]) == crc
+
+
+def _ha_registro_integro_depois(conteudo, posicao):
+    """
+    Procura, byte a byte, um registro íntegro a partir de `posicao`. Só é
+    chamada diante de um registro inválido, para separar uma escrita final
+    interrompida (nada íntegro depois) de um journal corrompido.
+    """
+    with memoryview(conteudo) as visao:
+        return any(_registro_integro(visao, inicio)
+                   for inicio in range(posicao, len(conteudo) - _MOLDURA.size + 1))
+
+
+def ler_journal(conteudo):
+    """
+    Reconstrói o estado gravado em um journal.
+
+    Args:
+        conteudo (bytes): Conteúdo do arquivo
+
+    Returns:
+        tuple: (estado, fim do último registro íntegro, deltas desde o snapshot)
+
+    Raises:
+        ValueError: Se o cabeçalho ou o snapshot inicial são inválidos, ou
+            se há um registro íntegro depois de um registro corrompido
+    """
+    if len(conteudo) < _CABECALHO.size:
+        raise ValueError("o conteúdo não é um journal de save")
+    magico, versao = _CABECALHO.unpack_from(conteudo)
+    if magico != MAGICO or versao not in VERSOES_LEGIVEIS:
+        raise ValueError("o conteúdo não é um journal de save")
+
+    estado = None
+    deltas = 0
+    posicao = _CABECALHO.size
+    visao = memoryview(conteudo)
+    while posicao + _MOLDURA.size <= len(conteudo):
+        if not _registro_integro(visao, posicao):
+            if _ha_registro_integro_depois(conteudo, posicao + 1):
+                raise ValueError(f"journal corrompido: registro inválido na posição {posicao}")
+            break  # escrita final interrompida
+        _, tamanho, tipo = _MOLDURA.unpack_from(conteudo, posicao)
+        fim = posicao + _MOLDURA.size + tamanho
+        registro = bytes(visao[posicao + _MOLDURA.size:fim])
+        if estado is None:
+            if tipo != SNAPSHOT:
+                raise ValueError("journal sem snapshot inicial")
+            estado = decodificar_save(registro)
+        elif tipo == LOTE:
+            deltas += _aplicar_lote(estado, registro)
+        else:
+            _aplicar(estado, tipo, registro)
+            deltas += 1
+        posicao = fim
+
+    if estado is None:
+        raise ValueError("journal sem snapshot inicial")
+    return estado, posicao, deltas
+
+
+class RepositorioJournal(Repositorio):
+    """
+    Repositório que grava o personagem como snapshot + deltas em um journal
+    (ver a docstring do módulo). Mantém a interface de Repositorio.
+    """
+
+    DURABILIDADES = ("flush", "fsync")
+
+    def __init__(self, arquivo_save="save.journal", compactar_a_cada=256, durabilidade="fsync"):
+        """
+        Inicializa o repositório.
+
+        Args:
+            arquivo_save (str): Nome do arquivo do journal
+            compactar_a_cada (int): Número de deltas que dispara a compactação
+            durabilidade (str): "flush" (cada acréscimo é entregue ao sistema
+                operacional) ou "fsync" (também sincronizado em disco)
+        """
+        if durabilidade not in self.DURABILIDADES:
+            raise ValueError(f"durabilidade deve ser uma de {self.DURABILIDADES}")
+        super().__init__(arquivo_save, formato="binario")
+        self.compactar_a_cada = compactar_a_cada
+        self.durabilidade = durabilidade
+        # Estado gravado no arquivo, fim do último registro íntegro e
+        # deltas desde o snapshot (None: ainda não lidos)
+        self._estado = None
+        self._fim = 0
+        self._deltas = 0
+        self._arquivo = None
+        # Bytes descartados de registros interrompidos ao abrir o journal
+        self.descartados = 0
+
+    def _abrir(self):
+        """Lê o journal (se ainda não lido) e descarta um final interrompido."""
+        if self._estado is not None or not os.path.exists(self.arquivo_save):
+            return
+        with open(self.arquivo_save, 'r+b') as f:
+            conteudo = f.read()
+            estado, fim, deltas = ler_journal(conteudo)
+            if fim < len(conteudo):
+                f.truncate(fim)
+                self.descartados += len(conteudo) - fim
+        if conteudo[len(MAGICO)] != VERSAO:
+            # Journal de uma versão anterior: o próximo salvamento o regrava
+            deltas = self.compactar_a_cada
+        self._estado, self._fim, self._deltas = estado, fim, deltas
+
+    def _anexar(self, deltas):
+        """Acrescenta os deltas de um salvamento ao final do journal, em um único registro."""
+        if self._arquivo is None:
+            self._arquivo = open(self.arquivo_save, 'ab', buffering=0)
+        dados = _lote(deltas)
+        self._arquivo.write(dados)
+        if self.durabilidade == "fsync":
+            os.fsync(self._arquivo.fileno())
+        self._fim += len(dados)
+        self._deltas += len(deltas)
+
+    def _gravar_snapshot(self, dados):
+        """Substitui o journal por um único snapshot."""
+        self.fechar()
+        conteudo = _CABECALHO.pack(MAGICO, VERSAO) + _registro(SNAPSHOT, codificar_save(dados))
+        gravar_atomicamente(self.arquivo_save, conteudo)
+        self._fim = len(conteudo)
+        self._deltas = 0
+
+    def salvar(self, personagem):
+        """
+        Salva o personagem acrescentando só o que mudou desde o último
+        salvamento; grava um snapshot no primeiro salvamento, quando nome ou
+        classe mudam e a cada `compactar_a_cada` deltas.
+
+        Args:
+            personagem: Instância do personagem a ser salva
+
+        Returns:
+            bool: True se salvou com sucesso, False caso contrário
+        """
+        try:
+            dados = personagem.to_dict()
+            if self.esta_sincronizado(personagem, dados):
+                return True
+
+            try:
+                self._abrir()
+            except ValueError as e:
+                # Journal ilegível: é substituído por um snapshot novo
+                print(f"Journal de save inválido, gravando um novo: {e}")
+            deltas = None
+            if self._estado is not None and self._deltas < self.compactar_a_cada:
+                deltas = _deltas(self._estado, dados)
+            if deltas is None:
+                self._gravar_snapshot(dados)
+            elif deltas:
+                self._anexar(deltas)
+
+            self._estado = dados
+            self._registrar_sincronizado(personagem, dados)
+            return True
+        except Exception as e:
+            # O arquivo pode ter ficado com um registro incompleto: relê na próxima vez
+            self.fechar()
+            self._estado = None
+            print(f"Erro ao salvar o jogo: {e}")
+            return False
+
+    def carregar(self):
+        """
+        Carrega o personagem a partir do snapshot e dos deltas do journal.
+
+        Returns:
+            Personagem: Instância do personagem carregada, ou None se houver erro
+        """
+        try:
+            if not os.path.exists(self.arquivo_save):
+                return None
+            self.fechar()
+            self._estado = None
+            self._abrir()
+            personagem = self.construir_personagem(self._estado)
+            self._registrar_sincronizado(personagem, personagem.to_dict())
+            return personagem
+        except Exception as e:
+            self._estado = None
+            print(f"Erro ao carregar o jogo: {e}")
+            return None
+
+    def compactar(self):
+        """
+        Substitui o journal por um snapshot do estado gravado.
+
+        Returns:
+            bool: True se havia um journal para compactar
+        """
+        self._abrir()
+        if self._estado is None:
+            return False
+        self._gravar_snapshot(self._estado)
+        return True
+
+    def fechar(self):
+        """Fecha o arquivo mantido aberto para os acréscimos."""
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
@@ -0,0 +1,240 @@
+"""
+Módulo que implementa a persistência de vários personagens em SQLite.
+Cada personagem ocupa um slot identificado pelo nome, com índices por
+classe e nível para que listagens e buscas continuem rápidas mesmo com
+dezenas de milhares de personagens salvos.
+"""
+
+import json
+import sqlite3
+import time
+
+from utils.repositorio import Repositorio
+
+
+class RepositorioSQLite:
+    """
+    Classe responsável por salvar e carregar vários personagens em um banco SQLite.
+    Mantém a mesma interface de Repositorio (salvar, carregar, existe_save).
+    """
+
+    # Colunas numéricas, na mesma ordem usada nas consultas
+    CAMPOS = ("nivel", "xp", "xp_proximo_nivel", "hp", "hp_maximo",
+              "mana", "mana_maxima", "dano_base", "defesa")
+
+    _SQL_CRIAR = """
+        CREATE TABLE IF NOT EXISTS personagens (
+            nome TEXT PRIMARY KEY,
+            classe TEXT NOT NULL,
+            nivel INTEGER NOT NULL,
+            xp INTEGER NOT NULL,
+            xp_proximo_nivel INTEGER NOT NULL,
+            hp INTEGER NOT NULL,
+            hp_maximo INTEGER NOT NULL,
+            mana INTEGER NOT NULL,
+            mana_maxima INTEGER NOT NULL,
+            dano_base INTEGER NOT NULL,
+            defesa INTEGER NOT NULL,
+            inventario TEXT NOT NULL,
+            atualizado_em REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_personagens_classe_nivel ON personagens (classe, nivel);
+        CREATE INDEX IF NOT EXISTS idx_personagens_nivel ON personagens (nivel);
+        CREATE INDEX IF NOT EXISTS idx_personagens_atualizado ON personagens (atualizado_em);
+    """
+
+    _SQL_SALVAR = """
+        INSERT INTO personagens (nome, classe, nivel, xp, xp_proximo_nivel, hp, hp_maximo,
+                                 mana, mana_maxima, dano_base, defesa, inventario, atualizado_em)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (nome) DO UPDATE SET
+            classe = excluded.classe, nivel = excluded.nivel, xp = excluded.xp,
+            xp_proximo_nivel = excluded.xp_proximo_nivel, hp = excluded.hp,
+            hp_maximo = excluded.hp_maximo, mana = excluded.mana,
+            mana_maxima = excluded.mana_maxima, dano_base = excluded.dano_base,
+            defesa = excluded.defesa, inventario = excluded.inventario,
+            atualizado_em = excluded.atualizado_em
+    """
+
+    _SQL_CARREGAR = ("SELECT nome, classe, " + ", ".join(CAMPOS) +
+                     ", inventario FROM personagens")
+
+    def __init__(self, arquivo_banco="saves.db"):
+        """
+        Inicializa o repositório, criando as tabelas se necessário.
+
+        Args:
+            arquivo_banco (str): Caminho do arquivo SQLite
+        """
+        self.arquivo_banco = arquivo_banco
+        self.conexao = sqlite3.connect(arquivo_banco)
+        self.conexao.execute("PRAGMA journal_mode = WAL")
+        self.conexao.execute("PRAGMA synchronous = NORMAL")
+        self.conexao.executescript(self._SQL_CRIAR)
+
+    def _parametros(self, personagem):
+        """Converte um personagem nos parâmetros da instrução de salvamento."""
+        dados = personagem.to_dict()
+        return (dados["nome"], dados["classe"], *(dados[campo] for campo in self.CAMPOS),
+                json.dumps(dados["inventario"], ensure_ascii=False), time.time())
+
+    def _construir(self, linha):
+        """Converte uma linha da tabela em um personagem."""
+        dados = dict(zip(("nome", "classe") + self.CAMPOS, linha))
+        dados["inventario"] = json.loads(linha[-1])
+        return Repositorio.construir_personagem(dados)
+
+    def salvar(self, personagem):
+        """
+        Salva (ou sobrescreve) o slot do personagem.
+
+        Args:
+            personagem: Instância do personagem a ser salva
+
+        Returns:
+            bool: True se salvou com sucesso, False caso contrário
+        """
+        try:
+            with self.conexao:
+                self.conexao.execute(self._SQL_SALVAR, self._parametros(personagem))
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar o jogo: {e}")
+            return False
+
+    def salvar_varios(self, personagens):
+        """
+        Salva vários personagens em uma única transação.
+
+        Args:
+            personagens (iterable): Personagens a serem salvos
+
+        Returns:
+            int: Quantidade de personagens salvos
+        """
+        parametros = [self._parametros(p) for p in personagens]
+        with self.conexao:
+            self.conexao.executemany(self._SQL_SALVAR, parametros)
+        return len(parametros)
+
+    def carregar(self, nome=None):
+        """
+        Carrega um personagem salvo.
+
+        Args:
+            nome (str, optional): Nome do personagem. Se None, carrega o salvo mais recentemente.
+
+        Returns:
+            Personagem: Instância do personagem carregada, ou None se não existir
+        """
+        try:
+            if nome is None:
+                linha = self.conexao.execute(
+                    self._SQL_CARREGAR + " ORDER BY atualizado_em DESC LIMIT 1").fetchone()
+            else:
+                linha = self.conexao.execute(self._SQL_CARREGAR + " WHERE nome = ?", (nome,)).fetchone()
+            return self._construir(linha) if linha else None
+        except Exception as e:
+            print(f"Erro ao carregar o jogo: {e}")
+            return None
+
+    def existe_save(self, nome=None):
+        """
+        Verifica se existe um save (de um personagem específico ou de qualquer um).
+
+        Args:
+            nome (str, optional): Nome do personagem
+
+        Returns:
+            bool: True se existe save, False caso contrário
+        """
+        if nome is None:
+            linha = self.conexao.execute("SELECT 1 FROM personagens LIMIT 1").fetchone()
+        else:
+            linha = self.conexao.execute("SELECT 1 FROM personagens WHERE nome = ?", (nome,)).fetchone()
+        return linha is not None
+
+    def _filtros(self, classe, nivel_min, nivel_max):
+        """Monta a cláusula WHERE e seus parâmetros para listagens e buscas."""
+        condicoes, parametros = [], []
+        if classe is not None:
+            condicoes.append("classe = ?")
+            parametros.append(classe)
+        if nivel_min is not None:
+            condicoes.append("nivel >= ?")
+            parametros.append(nivel_min)
+        if nivel_max is not None:
+            condicoes.append("nivel <= ?")
+            parametros.append(nivel_max)
+        where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+        return where, parametros
+
+    def listar(self, classe=None, nivel_min=None, nivel_max=None, ordem="nome", limite=None):
+        """
+        Lista o resumo dos slots salvos sem reconstruir os personagens.
+
+        Args:
+            classe (str, optional): Filtra pela classe
+            nivel_min (int, optional): Nível mínimo
+            nivel_max (int, optional): Nível máximo
+            ordem (str): "nome", "nivel" (decrescente) ou "recentes"
+            limite (int, optional): Número máximo de resultados
+
+        Returns:
+            list: Lista de dicionários com nome, classe e nivel
+        """
+        ordens = {"nome": "nome", "nivel": "nivel DESC, nome", "recentes": "atualizado_em DESC"}
+        if ordem not in ordens:
+            raise ValueError(f"ordem deve ser uma de {tuple(ordens)}")
+
+        where, parametros = self._filtros(classe, nivel_min, nivel_max)
+        sql = f"SELECT nome, classe, nivel FROM personagens{where} ORDER BY {ordens[ordem]}"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        return [{"nome": nome, "classe": classe_, "nivel": nivel}
+                for nome, classe_, nivel in self.conexao.execute(sql, parametros)]
+
+    def buscar(self, classe=None, nivel_min=None, nivel_max=None):
+        """
+        Carrega, um a um, os personagens que atendem aos filtros.
+
+        Args:
+            classe (str, optional): Filtra pela classe
+            nivel_min (int, optional): Nível mínimo
+            nivel_max (int, optional): Nível máximo
+
+        Yields:
+            Personagem: Personagens encontrados, em ordem de nome
+        """
+        where, parametros = self._filtros(classe, nivel_min, nivel_max)
+        for linha in self.conexao.execute(self._SQL_CARREGAR + where + " ORDER BY nome", parametros):
+            yield self._construir(linha)
+
+    def contar(self, classe=None, nivel_min=None, nivel_max=None):
+        """
+        Conta os slots que atendem aos filtros.
+
+        Returns:
+            int: Quantidade de personagens salvos
+        """
+        where, parametros = self._filtros(classe, nivel_min, nivel_max)
+        return self.conexao.execute(f"SELECT COUNT(*) FROM personagens{where}", parametros).fetchone()[0]
+
+    def excluir(self, nome):
+        """
+        Exclui o slot de um personagem.
+
+        Args:
+            nome (str): Nome do personagem
+
+        Returns:
+            bool: True se algum slot foi excluído
+        """
+        with self.conexao:
+            cursor = self.conexao.execute("DELETE FROM personagens WHERE nome = ?", (nome,))
+        return cursor.rowcount > 0
+
+    def fechar(self):
+        """Fecha a conexão com o banco."""
+        self.conexao.close()
@@ -0,0 +1,162 @@
+"""
+Módulo com o formato de roster em JSONL: um personagem por linha, no formato
+de Personagem.to_dict(), para importar e exportar milhares (ou milhões) de
+personagens de uma vez.
+
+A leitura é feita por geradores, uma linha por vez, e os personagens só são
+construídos quando pedidos: filtrar ou transformar um roster inteiro usa
+memória constante. A escrita agrupa as linhas em lotes, com um único arquivo
+aberto para todo o roster.
+"""
+
+import json
+import os
+import tempfile
+
+from utils.repositorio import Repositorio
+
+
+# Linhas acumuladas antes de cada escrita no arquivo
+LOTE_PADRAO = 1000
+_BUFFER = 1 << 20
+
+
+def _filtro(classe, nivel_min, nivel_max):
+    """Monta a função de filtro sobre os dicionários do roster (ou None)."""
+    if classe is None and nivel_min is None and nivel_max is None:
+        return None
+
+    def aceita(dados):
+        nivel = dados.get("nivel", 1)
+        return ((classe is None or dados.get("classe", "Guerreiro") == classe)
+                and (nivel_min is None or nivel >= nivel_min)
+                and (nivel_max is None or nivel <= nivel_max))
+
+    return aceita
+
+
+def ler_dados_roster(caminho, classe=None, nivel_min=None, nivel_max=None):
+    """
+    Lê os dicionários de um roster, uma linha por vez, sem construir os
+    personagens. Linhas em branco são ignoradas.
+
+    Args:
+        caminho (str): Arquivo JSONL do roster
+        classe (str, optional): Filtra pela classe
+        nivel_min (int, optional): Nível mínimo
+        nivel_max (int, optional): Nível máximo
+
+    Yields:
+        dict: Dados de cada personagem, na ordem do arquivo
+
+    Raises:
+        ValueError: Se alguma linha não é um JSON válido
+    """
+    aceita = _filtro(classe, nivel_min, nivel_max)
+    with open(caminho, 'r', encoding='utf-8', buffering=_BUFFER) as f:
+        for numero, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except ValueError as e:
+                raise ValueError(f"{caminho}, linha {numero}: {e}") from None
+            if aceita is None or aceita(dados):
+                yield dados
+
+
+def ler_roster(caminho, classe=None, nivel_min=None, nivel_max=None):
+    """
+    Lê os personagens de um roster, construindo cada um só quando pedido.
+    Os filtros são aplicados antes da construção.
+
+    Args:
+        caminho (str): Arquivo JSONL do roster
+        classe (str, optional): Filtra pela classe
+        nivel_min (int, optional): Nível mínimo
+        nivel_max (int, optional): Nível máximo
+
+    Yields:
+        Personagem: Guerreiro, Mago, Arqueiro ou Personagem, conforme a classe salva
+    """
+    for dados in ler_dados_roster(caminho, classe, nivel_min, nivel_max):
+        yield Repositorio.construir_personagem(dados)
+
+
+def _linhas(personagens):
+    """Converte personagens (ou seus dicionários) em linhas JSONL."""
+    codificar = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for personagem in personagens:
+        dados = personagem if isinstance(personagem, dict) else personagem.to_dict()
+        yield codificar(dados) + "\n"
+
+
+def _escrever_em_lotes(f, personagens, lote):
+    """Escreve as linhas em lotes de `lote` linhas e retorna quantas foram escritas."""
+    total = 0
+    pendentes = []
+    for linha in _linhas(personagens):
+        pendentes.append(linha)
+        if len(pendentes) >= lote:
+            f.write("".join(pendentes))
+            total += len(pendentes)
+            pendentes.clear()
+    if pendentes:
+        f.write("".join(pendentes))
+        total += len(pendentes)
+    return total
+
+
+def escrever_roster(caminho, personagens, lote=LOTE_PADRAO):
+    """
+    Grava um roster a partir de personagens (ou de dicionários no formato de
+    Personagem.to_dict()), que podem vir de um gerador.
+
+    As linhas vão para um arquivo temporário no mesmo diretório, que só
+    substitui o destino no final (como em gravar_atomicamente). Assim um
+    roster pode ser reescrito a partir dele mesmo, por exemplo:
+    escrever_roster(caminho, (f(p) for p in ler_roster(caminho))).
+
+    Args:
+        caminho (str): Arquivo JSONL de destino
+        personagens (iterable): Personagens ou dicionários a serem gravados
+        lote (int): Linhas acumuladas antes de cada escrita
+
+    Returns:
+        int: Quantidade de personagens gravados
+    """
+    if lote < 1:
+        raise ValueError("o lote deve ser >= 1")
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    fd, temporario = tempfile.mkstemp(prefix=".tmp-", dir=diretorio)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=_BUFFER) as f:
+            total = _escrever_em_lotes(f, personagens, lote)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+    return total
+
+
+def anexar_roster(caminho, personagens, lote=LOTE_PADRAO):
+    """
+    Acrescenta personagens ao final de um roster (criando-o se necessário).
+
+    Args:
+        caminho (str): Arquivo JSONL do roster
+        personagens (iterable): Personagens ou dicionários a serem gravados
+        lote (int): Linhas acumuladas antes de cada escrita
+
+    Returns:
+        int: Quantidade de personagens gravados
+    """
+    if lote < 1:
+        raise ValueError("o lote deve ser >= 1")
+    with open(caminho, 'a', encoding='utf-8', buffering=_BUFFER) as f:
+        return _escrever_em_lotes(f, personagens, lote)
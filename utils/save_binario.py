@@ -0,0 +1,127 @@
+"""
+Módulo com o formato binário de save: uma alternativa compacta ao JSON para
+os dados de Personagem.to_dict().
+
+Layout (little-endian):
+    cabeçalho e campos  "RPGS", versão (1 byte), índices do nome e da classe
+                        na tabela de textos, nível, XP, XP para o próximo
+                        nível, HP, HP máximo, mana, mana máxima, dano base,
+                        defesa, tamanho da tabela de textos e número de pilhas
+    inventário          para cada pilha, o índice do nome do item na tabela
+                        de textos e a quantidade
+    tabela de textos    os textos em UTF-8, separados por um byte nulo
+
+A parte fixa é lida com um único unpack e a tabela de textos com um único
+decode, para que a leitura não dependa de laços em Python.
+
+Um arquivo é reconhecido pelo cabeçalho (ver e_save_binario), o que permite
+ao Repositorio carregar tanto saves binários quanto os antigos em JSON.
+"""
+
+import struct
+
+
+MAGICO = b"RPGS"
+VERSAO = 1
+
+# mágico, versão, nome, classe (índices na tabela de textos), nivel, xp,
+# xp_proximo_nivel, hp, hp_maximo, mana, mana_maxima, dano_base, defesa,
+# tamanho da tabela de textos, número de pilhas
+_FIXO = struct.Struct("<4sBHHiqqiiiiiiIH")
+# índice do nome do item, quantidade
+_PILHA = struct.Struct("<HI")
+_SEPARADOR = "\0"
+
+
+def e_save_binario(conteudo):
+    """Verifica, pelo cabeçalho, se o conteúdo é um save binário."""
+    return conteudo[:len(MAGICO)] == MAGICO
+
+
+def codificar_save(dados):
+    """
+    Codifica os dados de um personagem no formato binário.
+
+    Args:
+        dados (dict): Dicionário no formato de Personagem.to_dict()
+
+    Returns:
+        bytes: Save binário
+
+    Raises:
+        ValueError: Se algum valor não cabe nos campos do formato
+    """
+    textos = []
+    indices = {}
+
+    def indice(texto):
+        if texto not in indices:
+            if _SEPARADOR in texto:
+                raise ValueError(f"texto com byte nulo não pode ser salvo: {texto!r}")
+            indices[texto] = len(textos)
+            textos.append(texto)
+        return indices[texto]
+
+    inventario = dados.get("inventario", {})
+    if isinstance(inventario, list):
+        contagem = {}
+        for nome in inventario:
+            contagem[nome] = contagem.get(nome, 0) + 1
+        inventario = contagem
+
+    try:
+        nome, classe = indice(dados["nome"]), indice(dados["classe"])
+        pilhas = b"".join([_PILHA.pack(indice(item), quantidade) for item, quantidade in inventario.items()])
+        tabela = _SEPARADOR.join(textos).encode("utf-8")
+        fixo = _FIXO.pack(
+            MAGICO, VERSAO, nome, classe, dados["nivel"], dados["xp"], dados["xp_proximo_nivel"],
+            dados["hp"], dados["hp_maximo"], dados["mana"], dados["mana_maxima"],
+            dados["dano_base"], dados["defesa"], len(tabela), len(inventario))
+    except struct.error as e:
+        raise ValueError(f"valor fora dos limites do save binário: {e}") from None
+    return fixo + pilhas + tabela
+
+
+def decodificar_save(conteudo):
+    """
+    Decodifica um save binário.
+
+    Args:
+        conteudo (bytes): Save gerado por codificar_save()
+
+    Returns:
+        dict: Dicionário no formato de Personagem.to_dict()
+
+    Raises:
+        ValueError: Se o conteúdo não é um save binário válido
+    """
+    try:
+        (magico, versao, nome, classe, nivel, xp, xp_proximo_nivel, hp, hp_maximo, mana,
+         mana_maxima, dano_base, defesa, tamanho_tabela, quantidade) = _FIXO.unpack_from(conteudo, 0)
+        if magico != MAGICO:
+            raise ValueError("o conteúdo não é um save binário")
+        if versao != VERSAO:
+            raise ValueError(f"versão de save binário não suportada: {versao}")
+
+        inicio_tabela = _FIXO.size + quantidade * _PILHA.size
+        if len(conteudo) != inicio_tabela + tamanho_tabela:
+            raise ValueError("tamanho do save binário não confere")
+        textos = bytes(conteudo[inicio_tabela:]).decode("utf-8").split(_SEPARADOR)
+        inventario = {textos[i]: qtd for i, qtd in _PILHA.iter_unpack(conteudo[_FIXO.size:inicio_tabela])}
+
+        return {
+            "nome": textos[nome],
+            "classe": textos[classe],
+            "hp": hp,
+            "hp_maximo": hp_maximo,
+            "nivel": nivel,
+            "xp": xp,
+            "xp_proximo_nivel": xp_proximo_nivel,
+            "inventario": inventario,
+            "mana": mana,
+            "mana_maxima": mana_maxima,
+            "dano_base": dano_base,
+            "defesa": defesa
+        }
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"save binário corrompido: {e}") from None
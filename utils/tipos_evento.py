@@ -0,0 +1,53 @@
+"""
+Módulo com os tipos de evento do jogo e a sua forma em texto: o que o
+Combate emite e o que utils.eventos grava. Não depende de nenhum outro
+módulo, para que o motor de combate possa importá-lo sem custo.
+"""
+
+
+# Tipos de evento: ator, alvo e quantidade de cada um
+RELOGIO = 0      # quantidade: time.time_ns() no instante do campo tempo
+MENSAGEM = 1     # texto livre (registrar), guardado fora da tabela de nomes
+INICIO = 2       # ator: missão, alvo: inimigo
+ATAQUE = 3       # ator: quem ataca, quantidade: dano
+HABILIDADE = 4   # ator: personagem, quantidade: dano
+VITORIA = 5      # ator: personagem, alvo: inimigo
+DERROTA = 6      # ator: personagem, alvo: inimigo
+RECOMPENSA = 7   # alvo: itens separados por vírgula, quantidade: XP
+
+# Flags
+CRITICO = 1
+INIMIGO = 2      # golpe do inimigo (ATAQUE)
+
+
+def formatar_evento(tipo, turno, ator, quantidade=0, alvo="", flags=0):
+    """
+    Monta a linha de texto de um evento (a mesma do jogo.log).
+
+    Args:
+        tipo (int): Tipo do evento
+        turno (int): Turno do combate
+        ator (str): Nome do ator
+        quantidade (int): Dano ou XP
+        alvo (str): Nome do alvo
+        flags (int): CRITICO e INIMIGO
+
+    Returns:
+        str: Mensagem sem o timestamp
+    """
+    if tipo == ATAQUE:
+        return f"Turno {turno}: {ator} causou {quantidade} de dano{' (crítico)' if flags & CRITICO else ''}"
+    if tipo == HABILIDADE:
+        return (f"Turno {turno}: {ator} usou habilidade especial causando {quantidade} de dano"
+                f"{' (crítico)' if flags & CRITICO else ''}")
+    if tipo == INICIO:
+        return f"Iniciou missão: {ator} contra {alvo}"
+    if tipo == VITORIA:
+        return f"Missão concluída: {ator} venceu {alvo}"
+    if tipo == RECOMPENSA:
+        return f"XP ganho: {quantidade}, Itens: {alvo}"
+    if tipo == DERROTA:
+        return f"Missão falhou: {ator} foi derrotado por {alvo}"
+    if tipo == MENSAGEM:
+        return ator
+    raise ValueError(f"tipo de evento desconhecido: {tipo}")